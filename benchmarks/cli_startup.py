@@ -0,0 +1,79 @@
+"""
+Startup check of the headless CLI (`main.py run`).
+
+Usage (from the repository root):
+    python -m benchmarks.cli_startup [file.limb] [--runs 7] [--budget-ms 100]
+
+The program is run with closed stdin under `python -X importtime`. The check fails (exit code 1) if the run
+imports a module reserved for another command (DEFERRED_MODULES) or if the best launch exceeds the budget.
+"""
+
+from benchmarks.execution import median
+
+import subprocess
+import argparse
+import time
+import sys
+
+
+DEFAULT_FILE = "templates/calc.limb"
+DEFERRED_MODULES = (  # Imported only by the command using them (see `cli`).
+    "modules.execution.compiler",
+    "modules.execution.build_cache",
+    "modules.memory_file",
+    "concurrent.futures",
+    "multiprocessing",
+    "modules.ui",
+    "keyboard",
+)
+
+
+def run_command(path: str) -> list[str]:
+    return [sys.executable, "main.py", "run", path]
+
+
+def imported_modules(path: str) -> set[str]:
+    """ Modules imported by the run (parsed from the `-X importtime` report). """
+    command = [sys.executable, "-X", "importtime", *run_command(path)[1:]]
+    process = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    modules = set()
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            modules.add(line.rsplit("|", 1)[1].strip())
+
+    return modules
+
+
+def launch_times(path: str, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run(run_command(path), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start_time)
+
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Limbo CLI startup check.")
+    parser.add_argument("file", nargs="?", default=DEFAULT_FILE, help=".limb file to run")
+    parser.add_argument("--runs", type=int, default=7, help="measured launches")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="limit of the best launch in milliseconds")
+    args = parser.parse_args()
+
+    modules = imported_modules(args.file)
+    unexpected = [name for name in DEFERRED_MODULES if name in modules]
+    times = launch_times(args.file, args.runs)
+    best_ms = min(times) * 1000
+
+    print(f"{args.file}: best {best_ms:.1f} ms, median {median(times) * 1000:.1f} ms ({args.runs} runs, budget {args.budget_ms:.0f} ms)")
+    for name in unexpected:
+        print(f"  imported at startup: {name}")
+
+    if unexpected or best_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
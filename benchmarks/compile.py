@@ -0,0 +1,121 @@
+"""
+Compile benchmark comparing the output formats of the compiler.
+
+Usage (from the repository root):
+    python -m benchmarks.compile [files.limb ...] [--runs 5] [--formats pyz,nuitka] [--no-cache] [--output bench_compile.json]
+
+For every program and output format reports the build time, artifact size and cold-start time
+(median of runs, time from the process spawn to the first output line) of the artifact run with
+the scripted inputs of benchmarks.execution. Native binaries are built only if nuitka is installed,
+`--no-cache` removes the cached binaries before their build (nuitka's own caches are kept).
+"""
+
+from benchmarks.execution import BENCH_CASES, load_case, load_program, measure_process, median
+from modules.execution import build_cache
+from modules.execution import compiler
+
+import contextlib
+import subprocess
+import argparse
+import platform
+import shutil
+import time
+import json
+import sys
+import os
+
+
+DEFAULT_FORMATS = ["pyz", "nuitka"]
+
+
+def build_artifact(program: tuple, name: str, output_format: str, **options) -> tuple[str | None, float]:
+    """ Build program in the output format (options are passed to the Compiler). Returns (artifactPath, buildSeconds), path is None if the build failed. """
+    start_node, nodes = program
+    program_compiler = compiler.Compiler(name, start_node, nodes, output_format=output_format, **options)
+
+    start_time = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            artifact_path = program_compiler.build()
+    except (subprocess.CalledProcessError, OSError):
+        artifact_path = None
+
+    build_time = time.perf_counter() - start_time
+    if artifact_path is None or not os.path.exists(artifact_path):
+        return None, build_time
+    return artifact_path, build_time
+
+
+def bench_case(path: str, formats: list[str], runs: int, no_cache: bool) -> dict:
+    case = load_case(path)
+    program = load_program(path)
+    name = "bench_" + os.path.basename(path).removesuffix(".limb")
+    stdin_data = "".join(line + "\n" for line in case["inputs"])
+    result = {"file": path, "formats": {}}
+    print(f"\n{path}:")
+
+    for output_format in formats:
+        if output_format == "nuitka" and shutil.which(build_cache.nuitka_command()[0]) is None:
+            result["formats"][output_format] = {"skipped": "nuitka is not installed"}
+            print(f"  {output_format:<8} skipped")
+            continue
+
+        if no_cache:
+            shutil.rmtree(build_cache.BuildCache().builds_dir, ignore_errors=True)
+
+        artifact_path, build_time = build_artifact(program, name, output_format)
+        if artifact_path is None:
+            result["formats"][output_format] = {"skipped": "build failed", "build_s": build_time}
+            print(f"  {output_format:<8} build failed")
+            continue
+
+        command = [sys.executable, artifact_path] if output_format == "pyz" else [artifact_path]
+        format_runs = [measure_process(command, stdin_data, case["max_outputs"]) for _ in range(runs)]
+        size = os.path.getsize(artifact_path)
+        os.remove(artifact_path)
+
+        result["formats"][output_format] = summary = {
+            "build_s": build_time,
+            "size_bytes": size,
+            "cold_start_s": median([run["startup_s"] for run in format_runs]),
+            "total_s": median([run["total_s"] for run in format_runs]),
+            "runs": format_runs,
+        }
+        print(
+            f"  {output_format:<8} build {summary['build_s']:8.2f} s   size {size / 1024:10.1f} KB   "
+            f"cold start {summary['cold_start_s'] * 1000:8.1f} ms   total {summary['total_s']:7.3f} s"
+        )
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Limbo compile benchmark.")
+    parser.add_argument("files", nargs="*", default=list(BENCH_CASES), help=".limb files to benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="cold-start runs per format")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help=f"comma separated formats: {','.join(compiler.OUTPUT_FORMATS)}")
+    parser.add_argument("--no-cache", action="store_true", help="remove the cached nuitka binaries before the builds")
+    parser.add_argument("--output", default="bench_compile.json", help="JSON results file")
+    args = parser.parse_args()
+
+    formats = [output_format.strip() for output_format in args.formats.split(",") if output_format.strip()]
+    for output_format in formats:
+        if output_format not in compiler.OUTPUT_FORMATS:
+            parser.error(f"unknown format: {output_format}")
+
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "cases": [bench_case(path, formats, args.runs, args.no_cache) for path in args.files],
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Execution benchmark comparing the interpreter, the generated build target and the compiled binary.
+
+Usage (from the repository root):
+    python -m benchmarks.execution [files.limb ...] [--runs 5] [--modes interpreter,target,registry,binary] [--output bench.json]
+
+Every program is executed in a separate process with scripted stand-ins for the interaction nodes
+(runtime_io.ScriptedIO), so it runs unattended. Inputs for the templates are defined in BENCH_CASES,
+other files may provide `<file>.inputs` (one input per line). Programs that never end are stopped
+after `max_outputs` lines.
+
+Modes:
+    interpreter  - NodeRunner (JIT).
+    plan         - NodeRunner with the JIT disabled (plan interpreter).
+    target       - generated `_compile_*.py` build target of the direct backend (program's generated code).
+    registry     - build target of the registry backend executed with the generic injected executor.
+    binary       - nuitka binary (skipped if nuitka is not installed).
+
+Reported per mode (median of runs): startup (time to the first output line), total time,
+node executions per second (node executions / time after the startup) and peak RSS of the program
+(it's VmHWM, reported by the child itself or sampled by the parent for the binaries; Linux only).
+Mode is reported as failed if any run exits with an error or writes no output.
+"""
+
+from modules.execution.exit_codes import ExitCode
+from modules import runtime_io
+
+import subprocess
+import threading
+import argparse
+import platform
+import tempfile
+import shutil
+import atexit
+import runpy
+import json
+import time
+import sys
+import os
+
+
+DEFAULT_MODES = ["interpreter", "target", "registry", "binary"]
+ALL_MODES = ["interpreter", "plan", "target", "registry", "binary"]
+
+BENCH_CASES = {
+    "templates/calc.limb": {
+        "inputs": ["+", "2", "3", "-", "7.5", "4", "*", "6", "5", "/", "9", "3", "?"] * 400 + ["exit"],
+        "max_outputs": None,
+    },
+    "templates/inf_inc.limb": {
+        "inputs": [],
+        "max_outputs": 20_000,
+    },
+}
+
+RESULT_PREFIX = "LIMBO_BENCH "
+RSS_SAMPLE_INTERVAL = 0.005  # Seconds between the parent's VmHWM samples of the programs not reporting it.
+MIN_RUN_TIME = 1e-3  # Runs executing shorter after the startup don't report the throughput.
+ACCEPTED_EXIT_CODES = {code % 256 for code in (ExitCode.OK, ExitCode.INPUT_CLOSED, ExitCode.MANUAL_TERMINATION)}
+
+
+def load_case(path: str) -> dict:
+    case = BENCH_CASES.get(path.replace("\\", "/"))
+    if case is not None:
+        return {"file": path, **case}
+
+    inputs = []
+    if os.path.exists(path + ".inputs"):
+        with open(path + ".inputs") as file:
+            inputs = file.read().splitlines()
+
+    return {"file": path, "inputs": inputs, "max_outputs": None}
+
+
+def load_program(path: str) -> tuple:
+    """ Import .limb file. Returns (startNode, nodes). """
+    from modules import cli
+
+    program = cli.load_program(path)
+    if program is None:
+        raise SystemExit(f"Failed to import: {path}")
+
+    return program
+
+
+def read_peak_rss(pid: int | str = "self") -> int | None:
+    """ Peak resident memory of the process in KB (VmHWM of it's own address space), None without the /proc. """
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    return None
+
+
+# Child processes.
+
+def report_peak_rss() -> None:
+    """
+    Write the peak RSS as the last line of the child. The parent's `ru_maxrss` of the child can't be used,
+    as it includes the parent's own high-water mark inherited across the fork and exec.
+    """
+    sys.stdout.write(RESULT_PREFIX + json.dumps({"peak_rss_kb": read_peak_rss()}) + "\n")
+    sys.stdout.flush()
+
+def child_interpreter(case: dict, use_jit: bool) -> int:
+    from modules.execution import interpreter
+
+    start_node, nodes = load_program(case["file"])
+    runtime_io.ProgramIO.current = runtime_io.ScriptedIO(case["inputs"], case["max_outputs"], echo=sys.stdout)
+    return interpreter.NodeRunner(start_node, nodes, use_jit=use_jit, interactive=False).run()
+
+
+def child_count(case: dict) -> int:
+    """ Run program with the profiler and report total number of node executions. """
+    from modules.execution import interpreter
+
+    start_node, nodes = load_program(case["file"])
+    runtime_io.ProgramIO.current = runtime_io.ScriptedIO(case["inputs"], case["max_outputs"])
+
+    profile_path = os.path.join(tempfile.gettempdir(), "limbo_bench_count.speedscope.json")
+    runner = interpreter.NodeRunner(start_node, nodes, profile_path=profile_path, interactive=False)
+    runner.run()
+
+    executions = sum(stats.calls for stats in runner.dbg_session.stats.values())
+    print(RESULT_PREFIX + json.dumps({"executions": executions}), flush=True)
+    return ExitCode.OK
+
+
+def child_target(case: dict, target_path: str) -> None:
+    runtime_io.ProgramIO.current = runtime_io.ScriptedIO(case["inputs"], case["max_outputs"], echo=sys.stdout)
+    runpy.run_path(target_path, run_name="__main__")
+
+
+def run_child() -> None:
+    mode, case_path = sys.argv[2], sys.argv[3]
+    with open(case_path) as file:
+        case = json.load(file)
+
+    if mode == "count":
+        sys.exit(child_count(case))
+
+    atexit.register(report_peak_rss)
+    if mode in ("interpreter", "plan"):
+        sys.exit(child_interpreter(case, use_jit=mode == "interpreter"))
+    if mode in ("target", "registry"):
+        child_target(case, sys.argv[4])
+
+
+# Parent process.
+
+def sample_peak_rss(pid: int, samples: list[int], stop: threading.Event) -> None:
+    """ Poll the VmHWM of the process which doesn't report it (it only grows, so the last sample is the peak). """
+    while not stop.wait(RSS_SAMPLE_INTERVAL):
+        peak_rss_kb = read_peak_rss(pid)
+        if peak_rss_kb is None:
+            return
+        samples.append(peak_rss_kb)
+
+
+def measure_process(command: list[str], stdin_data: str | None = None, max_outputs: int | None = None) -> dict:
+    """ Run process, measure time to the first output line, total time and peak RSS. """
+    spawn_time = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE if stdin_data is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True
+    )
+
+    rss_samples: list[int] = []
+    stop_sampling = threading.Event()
+    threading.Thread(target=sample_peak_rss, args=(process.pid, rss_samples, stop_sampling), daemon=True).start()
+
+    if stdin_data is not None:
+        process.stdin.write(stdin_data)
+        process.stdin.close()
+
+    first_output_time = None
+    reported_rss_kb = None
+    stopped = False
+    lines = 0
+
+    for line in process.stdout:
+        if line.startswith(RESULT_PREFIX):
+            reported_rss_kb = json.loads(line.removeprefix(RESULT_PREFIX)).get("peak_rss_kb")
+            continue
+
+        if first_output_time is None:
+            first_output_time = time.perf_counter()
+
+        lines += 1
+        if max_outputs is not None and lines >= max_outputs:
+            peak_rss_kb = read_peak_rss(process.pid)
+            if peak_rss_kb is not None:
+                rss_samples.append(peak_rss_kb)
+
+            process.kill()
+            stopped = True
+            break
+
+    process.wait()
+    stop_sampling.set()
+
+    total_time = time.perf_counter() - spawn_time
+    startup_time = (first_output_time or time.perf_counter()) - spawn_time
+
+    return {
+        "total_s": total_time,
+        "startup_s": startup_time,
+        "peak_rss_kb": reported_rss_kb if reported_rss_kb is not None else max(rss_samples, default=None),
+        "outputs": lines,
+        "exit_code": process.returncode,
+        "stopped": stopped,  # Killed after `max_outputs` lines.
+    }
+
+
+def count_executions(case_path: str) -> int:
+    process = subprocess.run(
+        [sys.executable, "-W", "ignore", "-m", "benchmarks.execution", "--child", "count", case_path],
+        capture_output=True, text=True
+    )
+
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line.removeprefix(RESULT_PREFIX))["executions"]
+
+    raise RuntimeError(f"Couldn't count node executions: {process.stderr.strip()}")
+
+
+def build_program(case: dict, with_binary: bool) -> tuple[str, str, str | None, "object"]:
+    """ Generate build targets of both backends (and the binary). Returns (targetPath, registryTargetPath, binaryPath, compiler). """
+    from modules.execution import compiler
+
+    start_node, nodes = load_program(case["file"])
+    name = "bench_" + os.path.basename(case["file"]).removesuffix(".limb")
+    program_compiler = compiler.Compiler(name, start_node, nodes)
+    registry_compiler = compiler.Compiler(name + "_registry", start_node, nodes, backend="registry")
+
+    target_path = program_compiler.write_build_target()
+    registry_path = registry_compiler.write_build_target()
+    binary_path = None
+
+    if with_binary:
+        try:
+            binary_path = program_compiler.compile_to_exe()
+        except (subprocess.CalledProcessError, OSError):
+            binary_path = None
+
+        if binary_path is not None and not os.path.exists(binary_path):
+            binary_path = None
+
+    return os.path.abspath(target_path), os.path.abspath(registry_path), binary_path, program_compiler
+
+
+def median(values: list[float]) -> float:
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+def run_failed(run: dict) -> bool:
+    """ Run which wrote no output or exited with an error (the program didn't run, like a missing build target). """
+    if run["outputs"] == 0:
+        return True
+    return not run["stopped"] and run["exit_code"] % 256 not in ACCEPTED_EXIT_CODES
+
+
+def summarize(runs: list[dict], executions: int) -> dict:
+    failed = [run for run in runs if run_failed(run)]
+    if failed:
+        exit_codes = ", ".join(str(run["exit_code"]) for run in failed)
+        return {"failed": f"{len(failed)} of {len(runs)} runs, exit codes: {exit_codes}", "runs": runs}
+
+    total = median([run["total_s"] for run in runs])
+    startup = median([run["startup_s"] for run in runs])
+    rss = [run["peak_rss_kb"] for run in runs if run["peak_rss_kb"] is not None]
+
+    return {
+        "startup_s": startup,
+        "total_s": total,
+        "exec_per_s": executions / (total - startup) if total - startup > MIN_RUN_TIME else None,
+        "peak_rss_kb": max(rss) if rss else None,
+        "runs": runs,
+    }
+
+
+def bench_case(path: str, modes: list[str], runs: int) -> dict:
+    case = load_case(path)
+    result = {"file": path, "modes": {}}
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as case_file:
+        json.dump(case, case_file)
+
+    try:
+        result["executions"] = executions = count_executions(case_file.name)
+        print(f"\n{path}: {executions} node executions per run")
+
+        needs_build = "target" in modes or "registry" in modes or "binary" in modes
+        has_nuitka = shutil.which("nuitka") is not None
+        target_path = registry_path = binary_path = program_compiler = None
+
+        if needs_build:
+            target_path, registry_path, binary_path, program_compiler = build_program(case, "binary" in modes and has_nuitka)
+
+        for mode in modes:
+            if mode == "binary" and binary_path is None:
+                result["modes"][mode] = {"skipped": "nuitka is not installed" if not has_nuitka else "build failed"}
+                print(f"  {mode:<12} skipped")
+                continue
+
+            if mode == "binary":
+                stdin_data = "".join(line + "\n" for line in case["inputs"])
+                command, max_outputs = [binary_path], case["max_outputs"]
+            else:
+                stdin_data, max_outputs = None, None
+                command = [sys.executable, "-W", "ignore", "-m", "benchmarks.execution", "--child", mode, case_file.name]
+                if mode == "target":
+                    command.append(target_path)
+                elif mode == "registry":
+                    command.append(registry_path)
+
+            mode_runs = [measure_process(command, stdin_data, max_outputs) for _ in range(runs)]
+            result["modes"][mode] = summary = summarize(mode_runs, executions)
+            if "failed" in summary:
+                print(f"  {mode:<12} failed ({summary['failed']})")
+                continue
+
+            rss = f"{summary['peak_rss_kb'] / 1024:.1f} MB" if summary["peak_rss_kb"] else "n/a"
+            throughput = f"{summary['exec_per_s']:12,.0f}" if summary["exec_per_s"] is not None else f"{'n/a':>12}"
+            print(
+                f"  {mode:<12} startup {summary['startup_s'] * 1000:8.1f} ms   total {summary['total_s']:7.3f} s   "
+                f"{throughput} exec/s   peak RSS {rss}"
+            )
+
+        if program_compiler is not None:
+            program_compiler.cleanup()
+
+    finally:
+        os.remove(case_file.name)
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Limbo execution benchmark.")
+    parser.add_argument("files", nargs="*", default=list(BENCH_CASES), help=".limb files to benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="runs per mode")
+    parser.add_argument("--modes", default=",".join(DEFAULT_MODES), help=f"comma separated modes: {','.join(ALL_MODES)}")
+    parser.add_argument("--output", default="bench_execution.json", help="JSON results file")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in ALL_MODES:
+            parser.error(f"unknown mode: {mode}")
+
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "cases": [bench_case(path, modes, args.runs) for path in args.files],
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        run_child()
+    else:
+        main()
@@ -0,0 +1,178 @@
+"""
+Memory benchmark of the runtime representations over a synthetic graph.
+
+Usage (from the repository root):
+    python -m benchmarks.memory [--nodes 50000] [--output bench_memory.json]
+
+The graph is a flow chain of blocks (5 nodes each):
+    Get Number -> Add -> Multiply -> Number-Text -> Output
+where every Output continues the flow to the next block's Output (Get Number reads the memory,
+so nothing is folded). Outputs are discarded.
+
+Reported (traced by tracemalloc):
+    model        - nodes created by the factories and connected.
+    walker       - RuntimeNodes (debug / profile runs) with their registers.
+    plan         - ExecutionPlan (plan interpreter).
+    walker run / plan run - peak memory allocated on top of the representation while the program
+                   runs (second run, after the warm-up) and the time per node execution.
+"""
+
+from modules.execution import runtime
+from modules.execution import plan
+from modules.nodes import factory
+from modules.nodes import source
+from modules import runtime_io
+from modules import std_nodes
+from modules import measure
+from modules import helpers
+
+import tracemalloc
+import argparse
+import platform
+import json
+import time
+import gc
+
+
+BLOCK = ["Get Number", "Add", "Multiply", "Number-Text", "Output"]
+WORKSPACE_ID = "bench:memory"
+
+
+class NullIO(runtime_io.ProgramIO):
+    """ Discards the outputs. """
+
+    def write_line(self, text: str) -> None:
+        pass
+
+
+def build_graph(nodes_count: int) -> tuple:
+    """ Returns (startNode, nodes). """
+    factories = {}
+    for node_factory in factory.factories_register.values():
+        factories.setdefault(node_factory.title, node_factory)
+
+    def spawn(title: str):
+        instance = factories[title].build_instance(WORKSPACE_ID)
+        instance.position = measure.Position(0, 0)
+        return instance
+
+    start_node = spawn(std_nodes.START_FACTORY.title)
+    nodes = [start_node]
+    flow_end = start_node.flow.output_src
+
+    for _ in range(max(1, (nodes_count - 1) // len(BLOCK))):
+        get_number, add, multiply, to_text, output = [spawn(title) for title in BLOCK]
+        nodes += [get_number, add, multiply, to_text, output]
+
+        get_number.get_input_src("key").set_constant("counter")
+        get_number.get_input_src("default").set_constant("1")
+        source.connect_sources(get_number.outputs[0], add.inputs[0])
+        add.inputs[1].set_constant("1")
+        source.connect_sources(add.outputs[0], multiply.inputs[0])
+        multiply.inputs[1].set_constant("2")
+        source.connect_sources(multiply.outputs[0], to_text.inputs[0])
+        source.connect_sources(to_text.outputs[0], output.inputs[0])
+
+        source.connect_sources(flow_end, output.flow.input_src)
+        flow_end = output.flow.output_src
+
+    return start_node, nodes
+
+
+def traced(build) -> tuple[object, int]:
+    """ Returns (builtObject, tracedBytes) - memory still allocated after the build. """
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    gc.collect()
+    return built, tracemalloc.get_traced_memory()[0] - before
+
+
+def build_walker(start_node, raw_nodes) -> runtime.RuntimeNode:
+    registers = runtime.RuntimeRegisters(len(raw_nodes))
+    runtime_nodes = {raw_node.node_id: runtime.RuntimeNode(raw_node, slot, registers) for slot, raw_node in enumerate(raw_nodes)}
+
+    for rt_node in runtime_nodes.values():
+        rt_node.initialize(runtime_nodes)
+
+    return runtime_nodes[start_node.node_id]
+
+
+def run_walker(entry_node: runtime.RuntimeNode) -> None:
+    registers = entry_node.registers
+    rt_node = entry_node
+
+    while rt_node:
+        rt_node.execute()
+        if registers.shared_slots:
+            registers.end_step()
+        rt_node = rt_node.flow_next
+
+
+def run_plan(execution_plan: plan.ExecutionPlan) -> None:
+    execute = execution_plan.execute
+    slot = execution_plan.entry
+
+    while slot != plan.NO_SLOT:
+        slot = execute(slot)
+
+
+def measure_run(run, executions: int) -> dict:
+    run()  # Warm-up.
+    gc.collect()
+
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    run()
+    total_time = time.perf_counter() - start_time
+    peak = tracemalloc.get_traced_memory()[1] - before
+
+    return {"peak_bytes": peak, "total_s": total_time, "ns_per_execution": total_time / executions * 1e9}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Limbo runtime memory benchmark.")
+    parser.add_argument("--nodes", type=int, default=50_000, help="number of nodes in the synthetic graph")
+    parser.add_argument("--output", default="bench_memory.json", help="JSON results file")
+    args = parser.parse_args()
+
+    runtime_io.ProgramIO.current = NullIO()
+    helpers.MemoryJar.new_jar()
+    tracemalloc.start()
+
+    (start_node, nodes), model_bytes = traced(lambda: build_graph(args.nodes))
+    entry_node, walker_bytes = traced(lambda: build_walker(start_node, nodes))
+    execution_plan, plan_bytes = traced(lambda: plan.ExecutionPlan(start_node, nodes))
+
+    executions = len(nodes)  # Every node is executed once per run.
+    walker_run = measure_run(lambda: run_walker(entry_node), executions)
+    plan_run = measure_run(lambda: run_plan(execution_plan), executions)
+    tracemalloc.stop()
+
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "nodes": len(nodes),
+        "model_bytes": model_bytes,
+        "walker_bytes": walker_bytes,
+        "plan_bytes": plan_bytes,
+        "walker_run": walker_run,
+        "plan_run": plan_run,
+    }
+
+    print(f"Synthetic graph: {len(nodes)} nodes\n")
+    print(f"  model        {model_bytes / 2**20:8.2f} MB   {model_bytes / len(nodes):7.0f} B/node")
+    print(f"  walker       {walker_bytes / 2**20:8.2f} MB   {walker_bytes / len(nodes):7.0f} B/node")
+    print(f"  plan         {plan_bytes / 2**20:8.2f} MB   {plan_bytes / len(nodes):7.0f} B/node")
+    for name, run in (("walker run", walker_run), ("plan run", plan_run)):
+        print(f"  {name:<12} {run['peak_bytes'] / 2**10:8.1f} KB peak   {run['ns_per_execution']:7.0f} ns/execution")
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Startup benchmark of the compiled programs comparing the builds with and without the compiler's StartupOptions.
+
+Usage (from the repository root):
+    python -m benchmarks.startup [files.limb ...] [--runs 5] [--formats nuitka,pyz] [--output bench_startup.json]
+
+Startup is the time from the process spawn to the first output line (the first executed Output node)
+of the artifact run with the scripted inputs of benchmarks.execution. Cold launch is the first launch
+of the built artifact (the onefile extraction directory is removed before every cold run), warm launches
+follow a priming launch. The baseline is built with `StartupOptions.baseline()` (eager imports, every
+imported module bundled, extraction on every launch), the improvement is reported per template and format.
+"""
+
+from benchmarks.execution import BENCH_CASES, load_case, load_program, measure_process, median
+from benchmarks.compile import DEFAULT_FORMATS, build_artifact
+from modules.execution import build_cache
+from modules.execution import compiler
+
+import argparse
+import platform
+import tempfile
+import shutil
+import time
+import json
+import sys
+import os
+
+
+VARIANTS = ("baseline", "optimized")
+
+
+def startup_options(variant: str, extraction_dir: str) -> compiler.StartupOptions:
+    if variant == "baseline":
+        return compiler.StartupOptions.baseline()
+    return compiler.StartupOptions(extraction_dir="{TEMP}/" + os.path.basename(extraction_dir))  # Nuitka's path spec.
+
+
+def launch_times(command: list[str], case: dict, runs: int, extraction_dir: str) -> dict:
+    """ Median startup of the cold and warm launches. """
+    stdin_data = "".join(line + "\n" for line in case["inputs"])
+    cold_runs = []
+
+    for _ in range(runs):
+        shutil.rmtree(extraction_dir, ignore_errors=True)
+        cold_runs.append(measure_process(command, stdin_data, case["max_outputs"])["startup_s"])
+
+    measure_process(command, stdin_data, case["max_outputs"])  # Priming launch (extracts the cached onefile).
+    warm_runs = [measure_process(command, stdin_data, case["max_outputs"])["startup_s"] for _ in range(runs)]
+
+    return {"cold_s": median(cold_runs), "warm_s": median(warm_runs), "cold_runs": cold_runs, "warm_runs": warm_runs}
+
+
+def improvement(baseline: float, optimized: float) -> float:
+    """ Relative reduction of the startup (0.25 is 25% faster). """
+    return (baseline - optimized) / baseline if baseline > 0 else 0.0
+
+
+def bench_variant(program: tuple, case: dict, output_format: str, variant: str, runs: int) -> dict:
+    name = f"startup_{os.path.basename(case['file']).removesuffix('.limb')}_{variant}"
+    extraction_dir = tempfile.mkdtemp(prefix="limbo_startup_")
+
+    try:
+        artifact_path, build_time = build_artifact(program, name, output_format, startup=startup_options(variant, extraction_dir))
+        if artifact_path is None:
+            return {"skipped": "build failed", "build_s": build_time}
+
+        command = [sys.executable, artifact_path] if output_format == "pyz" else [artifact_path]
+        times = launch_times(command, case, runs, extraction_dir)
+        size = os.path.getsize(artifact_path)
+        os.remove(artifact_path)
+
+    finally:
+        shutil.rmtree(extraction_dir, ignore_errors=True)
+
+    return {"build_s": build_time, "size_bytes": size, **times}
+
+
+def bench_case(path: str, formats: list[str], runs: int) -> dict:
+    case = load_case(path)
+    program = load_program(path)
+    result = {"file": path, "formats": {}}
+    print(f"\n{path}:")
+
+    for output_format in formats:
+        if output_format == "nuitka" and shutil.which(build_cache.nuitka_command()[0]) is None:
+            result["formats"][output_format] = {"skipped": "nuitka is not installed"}
+            print(f"  {output_format:<8} skipped")
+            continue
+
+        format_result = result["formats"][output_format] = {}
+        for variant in VARIANTS:
+            summary = format_result[variant] = bench_variant(program, case, output_format, variant, runs)
+            if "skipped" in summary:
+                print(f"  {output_format:<8} {variant:<10} {summary['skipped']}")
+                continue
+
+            print(
+                f"  {output_format:<8} {variant:<10} cold {summary['cold_s'] * 1000:8.1f} ms   "
+                f"warm {summary['warm_s'] * 1000:8.1f} ms   size {summary['size_bytes'] / 1024:10.1f} KB"
+            )
+
+        baseline, optimized = format_result["baseline"], format_result["optimized"]
+        if "skipped" not in baseline and "skipped" not in optimized:
+            format_result["improvement"] = {
+                "cold": improvement(baseline["cold_s"], optimized["cold_s"]),
+                "warm": improvement(baseline["warm_s"], optimized["warm_s"]),
+            }
+            print(f"  {output_format:<8} improvement cold {format_result['improvement']['cold']:7.1%}   warm {format_result['improvement']['warm']:7.1%}")
+
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Limbo compiled programs' startup benchmark.")
+    parser.add_argument("files", nargs="*", default=list(BENCH_CASES), help=".limb files to benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="cold and warm launches per build")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help=f"comma separated formats: {','.join(compiler.OUTPUT_FORMATS)}")
+    parser.add_argument("--output", default="bench_startup.json", help="JSON results file")
+    args = parser.parse_args()
+
+    formats = [output_format.strip() for output_format in args.formats.split(",") if output_format.strip()]
+    for output_format in formats:
+        if output_format not in compiler.OUTPUT_FORMATS:
+            parser.error(f"unknown format: {output_format}")
+
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "cases": [bench_case(path, formats, args.runs) for path in args.files],
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,36 @@
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2] in (["run"], ["batch"], ["trace"], ["compile"]):
+    from modules import cli  # Headless mode, skips the TUI modules.
+    sys.exit(cli.main(sys.argv[1:]))
+
+
 from modules.status_bar import status_bar
 from modules.side_bar import side_bar
+from modules.nodes.collection import NodesCollections
+from modules import runtime_io
 from modules import std_nodes
 from modules import workspace
 from modules import viewport
 from modules import terminal
-from modules import helpers
 from modules import measure
 from modules import style
 from modules import ui
 
 import traceback
+import colorama
 import keyboard
 import time
-import sys
     
     
+colorama.init()
+terminal.start_size_listener()
 terminal.hide_cursor()
+runtime_io.ProgramIO.current = terminal.TerminalIO()
 
 default_workspace = workspace.Workspace("")
 VIEWPORT = viewport.ViewportComponent(default_workspace)
+side_bar.set_collections(NodesCollections)
 side_bar.set_workspace_id(default_workspace.id)
 
 # Import state file.
@@ -177,6 +189,10 @@ def main() -> None:
             if keyboard.is_pressed("f2"):
                 VIEWPORT.compile_program()
                 
+            # Profile program.
+            if keyboard.is_pressed("f3"):
+                VIEWPORT.profile_program()
+                
             # Debug program.
             if keyboard.is_pressed("f12"):
                 VIEWPORT.run_program(debug=True)
@@ -220,13 +236,13 @@ if __name__ == "__main__":
 
     except KeyboardInterrupt:
         terminal.clear_screen()
-        helpers.flush_system_keyboard_buffer_win()
+        runtime_io.flush_system_keyboard_buffer_win()
         terminal.show_cursor()
         exit(0)
         
     except Exception as internal_error:
         # terminal.clear_screen()
-        helpers.flush_system_keyboard_buffer_win()
+        runtime_io.flush_system_keyboard_buffer_win()
         terminal.show_cursor()
         
         print(style.tcolor(" INTERNAL ERROR! ", color=style.AnsiFGColor.WHITE, bg_color=style.AnsiBGColor.RED))
@@ -0,0 +1,318 @@
+"""
+Headless command line interface:
+    python main.py run program.limb [--no-jit] [--no-prompts] [--max-restarts N] [--trace FILE] [--memory-file FILE] [LIMITS]
+    python main.py batch program.limb records.txt [--workers N] [--chunk-size N] [--separator SEP] [LIMITS]
+    python main.py trace FILE [--last N]
+    python main.py compile program.limb [--format pyz|nuitka] [--backend direct|registry] [--max-restarts N] [--memory-file FILE] [--no-server] [LIMITS]
+
+Only the format, nodes and execution modules are imported (no TUI, no keyboard hooks),
+so programs can be run without a terminal (cron jobs, pipelines). Modules of a single command
+(compiler, trace viewer, process pool, memory file) are imported by that command. The Input and Output
+nodes use plain stdin/stdout, errors are written to the stderr.
+Process exits with the program's exit code (negative codes are reported modulo 256).
+
+Batch mode executes the program once for every record (line) of the input file.
+Record's fields (split by the separator) are consumed by the Input nodes in order.
+Outputs are written in the records order, the throughput summary is written to the stderr.
+
+Run with `--trace` records the execution trace (debug mode) into the file, view it with the `trace` command.
+Run with `--memory-file` keeps the program's memory in the file, next run of the program resumes it.
+
+Compile writes the program (next to the working directory's compilation directory) as a pyz zipapp,
+built almost instantly, or as a native binary built by nuitka (see `compiler.Compiler`).
+Compiled program started with `--serve [PATH]` stays resident and answers the JSON requests (see `server`),
+programs compiled with `--no-server` are built without it.
+
+Watchdog LIMITS: [--max-executions N] [--timeout SECONDS] [--max-pull-depth N]
+Program exceeding a limit is terminated with the limit's exit code and the hottest nodes are reported.
+"""
+
+from modules.execution.build_targets import OUTPUT_FORMATS, BACKENDS
+from modules.execution.watchdog import WatchdogLimits
+from modules.execution.exit_codes import ExitCode
+from modules.execution import interpreter
+from modules.execution import analysis
+from modules.messages import messages
+from modules.nodes import node
+from modules import runtime_io
+from modules import std_nodes
+from modules import helpers
+from modules import format
+from modules import style
+
+import argparse
+import time
+import sys
+import os
+
+
+def load_program(path: str) -> tuple[node.Node, list[node.Node]] | None:
+    """ Import program from .limb file. Returns (startNode, nodes) or None if it can't be run (error is reported). """
+    if not os.path.isfile(path):
+        messages.error(f"Couldn't import state from file: {path} (file not found)")
+        return None
+
+    workspace_id = f"cli:{os.path.abspath(path)}"
+    nodes, _ = format.LimbFormat.import_state(path, workspace_id)
+    if nodes is None:
+        return None
+
+    start_nodes = std_nodes.START_FACTORY.instances.get(workspace_id)
+    if not start_nodes:
+        messages.error(f"Missing {style.node(std_nodes.START_FACTORY)} node!")
+        return None
+
+    undefined_input = analysis.undefined_required_input(analysis.reachable_nodes(start_nodes[0], nodes))
+    if undefined_input is not None:
+        messages.error(f"Undefined required value: {style.source(undefined_input)}")
+        return None
+
+    return start_nodes[0], nodes
+
+
+def run_command(args: argparse.Namespace) -> int:
+    program = load_program(args.file)
+    if program is None:
+        return ExitCode.ERROR
+
+    start_node, nodes = program
+    runtime_io.ProgramIO.current = runtime_io.ProgramIO(prompts=not args.no_prompts)
+
+    if args.memory_file is not None:
+        from modules import memory_file
+        try:
+            memory_file.MemoryFile(args.memory_file).close()
+        except (OSError, ValueError) as error:
+            messages.error(f"Couldn't open the memory file: {error}")
+            return ExitCode.ERROR
+
+        helpers.MemoryJar.persistent_path = args.memory_file
+
+    runner = interpreter.NodeRunner(
+        start_node,
+        nodes,
+        max_restarts=args.max_restarts,
+        use_jit=not args.no_jit,
+        interactive=False,
+        trace_path=args.trace,
+        limits=watchdog_limits(args)
+    )
+    return runner.run()
+
+
+def watchdog_limits(args: argparse.Namespace) -> WatchdogLimits:
+    return WatchdogLimits(args.max_executions, args.timeout, args.max_pull_depth)
+
+
+def trace_command(args: argparse.Namespace) -> int:
+    from modules.execution import debug
+    from modules.execution import trace
+
+    try:
+        trace_file = trace.read_trace(args.file)
+    except (OSError, ValueError) as error:
+        messages.error(f"Couldn't read trace: {error}")
+        return ExitCode.ERROR
+
+    if args.last is not None and len(trace_file.events) > args.last:
+        trace_file.dropped = len(trace_file.events) - args.last
+        trace_file.events = trace_file.events[trace_file.dropped:]
+
+    for line in debug.TraceViewer(trace_file).render():
+        sys.stdout.write(line + "\n")
+
+    return ExitCode.OK
+
+
+class BatchProgram:
+    """
+    Program imported and planned once per process and executed for each record.
+    Workers forked from the parent inherit it's instance, others (spawned) import the program again.
+    """
+    current: "BatchProgram | None" = None
+
+    def __init__(self, path: str, use_jit: bool, max_restarts: int | None, separator: str, limits: WatchdogLimits | None = None) -> None:
+        self.path = path
+        self.use_jit = use_jit
+        self.max_restarts = max_restarts
+        self.separator = separator
+        self.limits = limits
+        self.runner = None
+
+        program = load_program(path)
+        if program is not None:
+            start_node, nodes = program
+            self.runner = interpreter.NodeRunner(start_node, nodes, max_restarts=max_restarts, use_jit=use_jit, interactive=False, limits=limits)
+
+    def settings(self) -> tuple:
+        return (self.path, self.use_jit, self.max_restarts, self.separator, self.limits)
+
+    def run_record(self, record: str) -> tuple[int, list[str]]:
+        """ Execute program with a fresh memory jar. Returns (exitCode, outputLines). """
+        program_io = runtime_io.ScriptedIO(record.split(self.separator) if record else [])
+        runtime_io.ProgramIO.current = program_io
+
+        helpers.MemoryJar.new_jar()
+        self.runner.reset_values()
+        exit_code = self.runner.run()
+
+        return exit_code, program_io.outputs
+
+
+def init_batch_worker(settings: tuple) -> None:
+    if BatchProgram.current is None:
+        BatchProgram.current = BatchProgram(*settings)
+
+
+def run_batch_record(record: str) -> tuple[int, list[str]]:
+    return BatchProgram.current.run_record(record)
+
+
+def read_records(path: str) -> list[str]:
+    if path == "-":
+        return [line.rstrip("\r\n") for line in sys.stdin]
+
+    with open(path) as file:
+        return [line.rstrip("\r\n") for line in file]
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    BatchProgram.current = program = BatchProgram(args.file, not args.no_jit, args.max_restarts, args.separator, watchdog_limits(args))
+    if program.runner is None:
+        return ExitCode.ERROR
+
+    if args.records != "-" and not os.path.isfile(args.records):
+        messages.error(f"Couldn't read records from file: {args.records} (file not found)")
+        return ExitCode.ERROR
+
+    records = read_records(args.records)
+    workers = args.workers or os.cpu_count() or 1
+    chunk_size = args.chunk_size or max(1, min(256, len(records) // (workers * 4)))
+    exit_codes: dict[int, int] = {}
+
+    start_time = time.perf_counter()
+
+    if workers == 1:
+        results = map(run_batch_record, records)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(workers, initializer=init_batch_worker, initargs=(program.settings(),))
+        results = executor.map(run_batch_record, records, chunksize=chunk_size)
+
+    try:
+        for exit_code, outputs in results:
+            exit_codes[exit_code] = exit_codes.get(exit_code, 0) + 1
+            for line in outputs:
+                sys.stdout.write(line + "\n")
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    sys.stdout.flush()
+    total_time = time.perf_counter() - start_time
+    throughput = len(records) / total_time if total_time else 0.0
+
+    codes_info = ", ".join(f"{code}: {count}" for code, count in sorted(exit_codes.items()))
+    print(
+        f"Batch: {len(records)} records in {total_time:.3f}s ({throughput:,.1f} records/s) "
+        f"using {workers} workers, chunk size {chunk_size}. Exit codes: {codes_info or '-'}",
+        file=sys.stderr
+    )
+
+    failed = any(code < 0 for code in exit_codes)
+    return ExitCode.ERROR if failed else ExitCode.OK
+
+
+def compile_command(args: argparse.Namespace) -> int:
+    from modules.execution import compiler
+    import subprocess
+
+    program = load_program(args.file)
+    if program is None:
+        return ExitCode.ERROR
+
+    start_node, nodes = program
+    program_compiler = compiler.Compiler(
+        os.path.basename(args.file),
+        start_node,
+        nodes,
+        max_restarts=args.max_restarts,
+        limits=watchdog_limits(args),
+        memory_file=args.memory_file,
+        backend=args.backend,
+        output_format=args.format,
+        server=not args.no_server
+    )
+
+    try:
+        output_path = program_compiler.build()
+    except (subprocess.CalledProcessError, OSError) as error:
+        messages.error(f"Compilation failed: {error}")
+        return ExitCode.ERROR
+
+    print(f"\nCompiled {style.highlight(args.file)} to: {style.highlight(output_path)}")
+    return ExitCode.OK
+
+
+def add_limits_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--max-executions", type=int, default=None, metavar="N", help="terminate program after N node executions")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS", help="terminate program after the wall-clock time")
+    parser.add_argument("--max-pull-depth", type=int, default=None, metavar="N", help="terminate program when data pulls nest deeper than N")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="limbo", description="Run Limbo programs without the TUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="execute program using stdin/stdout")
+    run_parser.add_argument("file", help="path to the .limb file")
+    run_parser.add_argument("--no-jit", action="store_true", help="use the plan interpreter instead of the JIT")
+    run_parser.add_argument("--no-prompts", action="store_true", help="don't write Input node prompts to the stdout")
+    run_parser.add_argument("--max-restarts", type=int, default=None, help="terminate program after N restarts")
+    run_parser.add_argument("--trace", default=None, metavar="FILE", help="record execution trace (debug mode) into the file")
+    run_parser.add_argument("--memory-file", default=None, metavar="FILE", help="keep program's memory in the file (resumed by the next run)")
+    add_limits_arguments(run_parser)
+    run_parser.set_defaults(handler=run_command)
+
+    batch_parser = commands.add_parser("batch", help="execute program for each record of the input file in parallel")
+    batch_parser.add_argument("file", help="path to the .limb file")
+    batch_parser.add_argument("records", help="records file (one record per line), - for stdin")
+    batch_parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    batch_parser.add_argument("--chunk-size", type=int, default=None, help="records sent to a worker at once")
+    batch_parser.add_argument("--separator", default="\t", help="separator of record's fields (default: tab)")
+    batch_parser.add_argument("--no-jit", action="store_true", help="use the plan interpreter instead of the JIT")
+    batch_parser.add_argument("--max-restarts", type=int, default=None, help="terminate program after N restarts")
+    add_limits_arguments(batch_parser)
+    batch_parser.set_defaults(handler=batch_command)
+
+    trace_parser = commands.add_parser("trace", help="display execution trace recorded with run --trace")
+    trace_parser.add_argument("file", help="path to the trace file")
+    trace_parser.add_argument("--last", type=int, default=None, help="display only the last N events")
+    trace_parser.set_defaults(handler=trace_command)
+
+    compile_parser = commands.add_parser("compile", help="compile program into a pyz zipapp or a native binary")
+    compile_parser.add_argument("file", help="path to the .limb file")
+    compile_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="pyz", help="output format (default: pyz)")
+    compile_parser.add_argument("--backend", choices=BACKENDS, default="direct", help="build target's code generation (default: direct)")
+    compile_parser.add_argument("--max-restarts", type=int, default=None, help="terminate program after N restarts")
+    compile_parser.add_argument("--memory-file", default=None, metavar="FILE", help="keep program's memory in the file (resumed by the next run)")
+    compile_parser.add_argument("--no-server", action="store_true", help="build without the resident --serve mode (smaller bundle)")
+    add_limits_arguments(compile_parser)
+    compile_parser.set_defaults(handler=compile_command)
+
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    args = build_parser().parse_args(argv)
+    if not sys.stderr.isatty():  # Messages written into a file or a pipe stay plain text.
+        style.disable_colors()
+
+    try:
+        return args.handler(args)
+
+    except BrokenPipeError:  # Output closed by the reader (like `| head`).
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return ExitCode.MANUAL_TERMINATION
@@ -0,0 +1,140 @@
+from modules.nodes import source
+from modules.nodes import node
+from modules import types
+
+from typing import Any
+
+
+MEMORY_KEY = "key"  # Input of the memory nodes, constant keys are resolved to the MemoryJar slots.
+MEMORY_SLOT = "slot"  # Input holding the resolved slot, passed to the factory's `slot_handler`.
+
+
+def fold_constants(raw_nodes: list[node.Node]) -> dict[tuple[str, str], Any]:
+    """
+    Evaluate nodes of pure factories that (transitively) depend only on constant values.
+    Returns folded output values in format: {(nodeID, outputName): value}.
+
+    Nodes are never folded if their factory is not marked as pure (Input, Memory, interaction nodes)
+    or if the evaluation fails - the error will be raised at runtime instead.
+    """
+    folded: dict[tuple[str, str], Any] = {}
+    visited: dict[str, bool] = {}
+
+    def try_fold(raw_node: node.Node) -> bool:
+        if raw_node.node_id in visited:
+            return visited[raw_node.node_id]
+
+        visited[raw_node.node_id] = False  # Guards against the wire cycles.
+        if raw_node.factory is None or not raw_node.factory.pure:
+            return False
+
+        ins = {}
+        for raw_input in raw_node.inputs:
+            if raw_input.data_type == types.FLOW:
+                continue
+
+            output_source = raw_input.source
+            if output_source is None:
+                if raw_input.constant_value is not None:
+                    ins[raw_input.name] = raw_input.constant_value
+                elif raw_input.required:
+                    return False
+                continue
+
+            if not try_fold(output_source.node):
+                return False
+
+            folded_key = (output_source.node.node_id, output_source.name)
+            if folded_key not in folded:
+                return False
+
+            ins[raw_input.name] = folded[folded_key]
+
+        try:
+            output = raw_node.handler(ins)
+        except Exception:
+            return False
+
+        if not isinstance(output, dict):
+            return False
+
+        for output_name, value in output.items():
+            if value is not None:
+                folded[(raw_node.node_id, output_name)] = value
+
+        visited[raw_node.node_id] = True
+        return True
+
+    for raw_node in raw_nodes:
+        try_fold(raw_node)
+
+    return folded
+
+
+def folded_input_value(raw_input: source.NodeInput, folded: dict[tuple[str, str], Any]) -> Any:
+    """ Returns folded value for input's wire source or None if source is not folded. """
+    if raw_input.source is None:
+        return None
+    return folded.get((raw_input.source.node.node_id, raw_input.source.name))
+
+
+def constant_memory_key(raw_node: node.Node, folded: dict[tuple[str, str], Any]) -> str | None:
+    """ Returns memory key of the node if it can be resolved to the MemoryJar slot (constant or folded key). """
+    if raw_node.factory is None or raw_node.factory.slot_handler is None:
+        return None
+
+    key_input = next((raw_input for raw_input in raw_node.inputs if raw_input.name == MEMORY_KEY), None)
+    if key_input is None:
+        return None
+
+    key = key_input.constant_value if key_input.constant_value is not None else folded_input_value(key_input, folded)
+    return key if isinstance(key, str) else None
+
+
+def reachable_nodes(start_node: node.Node, raw_nodes: list[node.Node]) -> list[node.Node]:
+    """
+    Returns nodes (in the original order) reachable in flow from the Start node, together with
+    their transitive data dependencies. Other nodes (not connected scratch nodes) are never executed.
+
+    Flow continues to the flow output's target and to the first target of every output
+    (branches and the implicit flow of nodes without a flow output).
+    """
+    flow_visited: set[str] = set()
+    required: set[str] = set()
+    to_visit = [start_node]
+    to_pull: list[node.Node] = []
+
+    while to_visit:
+        raw_node = to_visit.pop()
+        if raw_node.node_id in flow_visited:
+            continue
+
+        flow_visited.add(raw_node.node_id)
+        to_pull.append(raw_node)
+
+        if raw_node.flow.enable_output and raw_node.flow.output_src.target is not None:
+            to_visit.append(raw_node.flow.output_src.target.node)
+
+        for raw_output in raw_node.outputs:
+            if raw_output.target is not None:
+                to_visit.append(raw_output.target.node)
+
+    while to_pull:
+        raw_node = to_pull.pop()
+        if raw_node.node_id in required:
+            continue
+
+        required.add(raw_node.node_id)
+        for raw_input in raw_node.inputs:
+            if raw_input.data_type != types.FLOW and raw_input.source is not None:
+                to_pull.append(raw_input.source.node)
+
+    return [raw_node for raw_node in raw_nodes if raw_node.node_id in required]
+
+
+def undefined_required_input(raw_nodes: list[node.Node]) -> source.NodeInput | None:
+    """ Returns first required input that has neither a constant value nor a wire connected. """
+    for raw_node in raw_nodes:
+        for raw_input in raw_node.inputs:
+            if raw_input.required and raw_input.constant_value is None and raw_input.source is None:
+                return raw_input
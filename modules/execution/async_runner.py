@@ -0,0 +1,223 @@
+from modules.execution.watchdog import WatchdogLimits, LimitExceeded
+from modules.execution.exit_codes import ExitCode
+from modules.execution import interpreter
+from modules.execution import plan
+from modules.nodes import node
+from modules import runtime_io
+from modules import helpers
+from modules import thunks
+
+from functools import partial
+from typing import Any
+import asyncio
+import inspect
+
+
+YIELD_INTERVAL = 1024  # Synchronous flow steps after which the runner yields to the event loop.
+
+
+class AsyncNodeRunner(interpreter.NodeRunner):
+    """
+    Executes the ExecutionPlan as a coroutine (`await runner.run()`), so one event loop can drive many programs.
+
+    Handlers may be coroutine functions, I/O nodes use the factory's `async_handler` awaiting the
+    ProgramIO (see `ProgramIO.read_line_async()`). Nodes which may await (coroutine handler or a data
+    source that may await) are executed by the async path, others by the plan's synchronous `execute()`.
+    Lazy inputs wired to the nodes which may await are pulled before the handler is called
+    (loop node's lazy inputs, re-pulled by every iteration, can't await).
+
+    Every runner has it's own `program_io` and memory jar, installed as the current ones whenever it resumes,
+    so coroutine handlers have to get them before their first await. Runs are never interactive, use no JIT and no debug session.
+    """
+
+    def __init__(
+        self,
+        start_node: node.Node,
+        raw_nodes: list[node.Node],
+        program_io: runtime_io.ProgramIO | None = None,
+        max_restarts: int | None = None,
+        limits: WatchdogLimits | None = None
+    ) -> None:
+        super().__init__(start_node, raw_nodes, max_restarts=max_restarts, use_jit=False, interactive=False, limits=limits)
+        self.program_io = program_io or runtime_io.ProgramIO.get_current()
+        self.jar = helpers.MemoryJar()
+        self.handlers = [raw_node.factory.async_handler or handler for raw_node, handler in zip(self.plan.nodes, self.plan.handlers)]
+        self.awaiting = self.awaiting_slots()
+
+    def awaiting_slots(self) -> list[bool]:
+        """ Flags of the nodes which may await (coroutine handler or a data source which may await). """
+        awaiting = [inspect.iscoroutinefunction(handler) for handler in self.handlers]
+
+        changed = True
+        while changed:
+            changed = False
+            for slot, sources in enumerate(zip(self.plan.pulls, self.plan.lazy_pulls)):
+                if awaiting[slot]:
+                    continue
+
+                if any(awaiting[src_slot] for pulls in sources for _, src_slot, _, _ in pulls):
+                    awaiting[slot] = changed = True
+
+        return awaiting
+
+    def install(self) -> None:
+        """ Make runner's I/O and memory jar the current ones. """
+        runtime_io.ProgramIO.current = self.program_io
+        helpers.MemoryJar.current = self.jar
+
+    async def run(self) -> int:
+        """ Execute program until it exits (restarts included). """
+        run_count = 0
+        if self.watchdog is not None:
+            self.watchdog.start()
+
+        while True:
+            run_count += 1
+            self.install()
+
+            exit_code = await self.run_once()
+            if exit_code not in (ExitCode.RESTART, ExitCode.RESTART_SAVE_MEMORY):
+                return self.finish(exit_code)
+
+            if self.max_restarts is not None and run_count > self.max_restarts:
+                self.error_dump(None, f"Program has been restarted over {self.max_restarts} times. Automatically terminated infinite loop.")
+                return self.finish(ExitCode.INF_RECURSION)
+
+            if exit_code == ExitCode.RESTART:
+                self.jar.clear()
+
+            self.reset_values()
+
+    async def run_once(self) -> int:
+        """ Execute program from the entry node once. Returns exit code (restart codes included). """
+        execute = self.plan.execute
+        end_step = self.plan.end_step
+        shared_slots = self.plan.shared_slots
+        awaiting = self.awaiting
+        watchdog = self.watchdog
+        loops = self.plan.loops
+        slot = self.plan.entry
+        steps = 0
+
+        try:
+            while True:
+                while slot != plan.NO_SLOT:
+                    if watchdog is not None:  # Countdown shared with the pulls counted by the `enter()`.
+                        watchdog.budget -= 1
+                        if watchdog.budget < 0:
+                            watchdog.budget = watchdog.check(watchdog.budget)
+                        watchdog.counts[slot] += 1
+
+                    if awaiting[slot]:
+                        slot = await self.execute(slot)
+                    else:
+                        slot = execute(slot)
+                        steps += 1
+                        if steps >= YIELD_INTERVAL:  # Don't starve other programs of the loop.
+                            steps = 0
+                            await asyncio.sleep(0)
+                            self.install()
+
+                    if shared_slots:
+                        end_step()
+
+                if not loops:
+                    break
+
+                slot = loops[-1][0]  # Flow of the loop's body ended.
+                if watchdog is not None:
+                    watchdog.budget -= 1
+                    if watchdog.budget < 0:
+                        watchdog.budget = watchdog.check(watchdog.budget)
+                    watchdog.counts[slot] += 1
+
+                slot = self.plan.next_iteration()
+                steps += 1
+
+        except (EOFError, RuntimeError, KeyboardInterrupt, LimitExceeded) as interruption:
+            return self.interruption_exit_code(interruption, self.plan.nodes[slot])
+
+        finally:
+            if watchdog is not None:
+                watchdog.pause(watchdog.budget)
+
+        return ExitCode.OK
+
+    async def call(self, slot: int) -> Any:
+        """ Pull node's inputs and call (await) it's handler. Returns raw handler's output. """
+        execution_plan = self.plan
+        ins = execution_plan.inputs[slot]
+
+        for name, src_slot, src_name, reader in execution_plan.pulls[slot]:
+            ins[name] = await self.pull(src_slot, src_name, reader)
+
+        is_loop = execution_plan.loop_nodes[slot]
+        for name, src_slot, src_name, reader in execution_plan.lazy_pulls[slot]:
+            if not self.awaiting[src_slot]:
+                thunk = thunks.LoopInput if is_loop else thunks.Thunk
+                ins[name] = thunk(partial(execution_plan.pull, src_slot, src_name, reader))
+            elif is_loop:
+                raise RuntimeError(f"Input: <{name}> of the loop node can't await the I/O.")
+            else:  # Synchronous handler can't await the thunk.
+                ins[name] = await self.pull(src_slot, src_name, reader)
+
+        output = self.handlers[slot](ins)
+        if inspect.isawaitable(output):
+            output = await output
+            self.install()
+
+        return output
+
+    async def pull(self, slot: int, src_name: str, reader: int) -> Any:
+        """ Async version of the `ExecutionPlan.pull()`. """
+        execution_plan = self.plan
+        if not self.awaiting[slot] or execution_plan.unread[slot] & reader or execution_plan.shared[slot] is not plan.NO_VALUE:
+            return execution_plan.pull(slot, src_name, reader)  # Doesn't await or the value is ready.
+
+        if self.watchdog is None:
+            output = await self.call(slot)
+        else:
+            self.watchdog.enter(slot)
+            try:
+                output = await self.call(slot)
+            finally:
+                self.watchdog.leave()
+
+        if execution_plan.flow_nodes[slot] or isinstance(output, str):
+            return None
+
+        value = output.get(src_name) if output else None
+        if execution_plan.readers[slot] > 1:
+            execution_plan.shared[slot] = value
+            execution_plan.shared_slots.append(slot)
+        return value
+
+    async def execute(self, slot: int) -> int:
+        """ Async version of the `ExecutionPlan.execute()`. """
+        execution_plan = self.plan
+        output = await self.call(slot)
+
+        if execution_plan.loop_nodes[slot]:
+            execution_plan.loops.append((slot, iter(output)))
+            output = execution_plan.iterate()
+
+        if execution_plan.flow_nodes[slot]:
+            next_flow = execution_plan.next_flow[slot]
+            if output is None:
+                return next_flow
+            return execution_plan.branches[slot].get(output, next_flow)
+
+        if isinstance(output, str):  # Next flow pointer name.
+            return execution_plan.branches[slot].get(output, plan.NO_SLOT)
+
+        readers = execution_plan.readers[slot]
+        if readers:
+            execution_plan.values[slot] = output.get(execution_plan.output_names[slot], plan.MISSING) if output else plan.MISSING
+            execution_plan.unread[slot] = readers
+        return execution_plan.next_flow[slot]
+
+
+async def run_instances(start_node: node.Node, raw_nodes: list[node.Node], programs_io: list[runtime_io.ProgramIO], **options) -> list[int]:
+    """ Run a program's instance for each ProgramIO concurrently. Returns their exit codes. """
+    runners = [AsyncNodeRunner(start_node, raw_nodes, program_io, **options) for program_io in programs_io]
+    return await asyncio.gather(*(runner.run() for runner in runners))
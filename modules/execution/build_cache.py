@@ -0,0 +1,103 @@
+from typing import Iterable
+import subprocess
+import platform
+import hashlib
+import shutil
+import glob
+import sys
+import os
+
+
+CACHE_DIR = "./__build_cache/"
+MAX_BUILDS = 16  # Cached binaries kept, least recently used are removed.
+
+
+def nuitka_command() -> list[str]:
+    """ Command running nuitka (it's script if installed, otherwise the module of the current interpreter). """
+    script = shutil.which("nuitka")
+    return [script] if script is not None else [sys.executable, "-m", "nuitka"]
+
+
+class BuildCache:
+    """
+    Content-addressed cache of the compiled binaries.
+
+    Build key is the hash of the toolchain (python, nuitka, platform), build options, generated source
+    and sources of the Limbo's modules (handlers and the runtime bundled into the binary), so any change
+    of them is a cache miss. Binaries are stored in `builds/<key>/`.
+
+    Misses are built in a persistent per-program `work/` directory with NUITKA_CACHE_DIR set to the cache,
+    so nuitka reuses it's intermediate C sources and the compiled objects (ccache) of the previous builds.
+    """
+
+    TOOLCHAIN: str | None = None  # Toolchain's description, read once per process.
+
+    def __init__(self, root: str = CACHE_DIR) -> None:
+        self.root = root
+        self.builds_dir = os.path.join(root, "builds")
+        self.work_dir = os.path.join(root, "work")
+        self.nuitka_dir = os.path.join(root, "nuitka")
+
+    @classmethod
+    def toolchain(cls) -> str:
+        if cls.TOOLCHAIN is None:
+            try:
+                result = subprocess.run([*nuitka_command(), "--version"], capture_output=True, text=True)
+                nuitka_version = result.stdout.strip() or "unavailable"
+            except OSError:
+                nuitka_version = "unavailable"
+
+            cls.TOOLCHAIN = f"python {sys.version}\nplatform {platform.platform()}\nnuitka {nuitka_version}"
+        return cls.TOOLCHAIN
+
+    def build_key(self, source: str, options: Iterable[str], modules_dir: str = "./modules") -> str:
+        """ Hash of everything the binary is built from. """
+        digest = hashlib.sha256()
+        for part in (self.toolchain(), "\n".join(options), source):
+            digest.update(part.encode())
+            digest.update(b"\0")
+
+        for path in sorted(glob.glob(os.path.join(modules_dir, "**", "*.py"), recursive=True)):
+            digest.update(path.replace("\\", "/").encode())
+            with open(path, "rb") as file:
+                digest.update(file.read())
+
+        return digest.hexdigest()
+
+    def lookup(self, key: str, file_name: str) -> str | None:
+        """ Returns path to the cached binary if there is one. """
+        path = os.path.join(self.builds_dir, key, file_name)
+        if not os.path.exists(path):
+            return None
+
+        os.utime(os.path.join(self.builds_dir, key))  # Recently used.
+        return path
+
+    def store(self, key: str, binary_path: str) -> str:
+        """ Copy the built binary into the cache. Returns it's cached path. """
+        entry_dir = os.path.join(self.builds_dir, key)
+        os.makedirs(entry_dir, exist_ok=True)
+        cached_path = os.path.join(entry_dir, os.path.basename(binary_path))
+        shutil.copy2(binary_path, cached_path)
+
+        self.prune()
+        return cached_path
+
+    def program_work_dir(self, name: str) -> str:
+        """ Persistent nuitka's output directory of the program (keeps it's `.build` directory between builds). """
+        path = os.path.join(self.work_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def environment(self) -> dict[str, str]:
+        """ Environment of the nuitka's process. """
+        os.makedirs(self.nuitka_dir, exist_ok=True)
+        return {**os.environ, "NUITKA_CACHE_DIR": os.path.abspath(self.nuitka_dir)}
+
+    def prune(self) -> None:
+        """ Remove least recently used binaries over MAX_BUILDS. """
+        entries = [os.path.join(self.builds_dir, key) for key in os.listdir(self.builds_dir)]
+        entries.sort(key=os.path.getmtime, reverse=True)
+
+        for entry in entries[MAX_BUILDS:]:
+            shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,2 @@
+BACKENDS = ("direct", "registry")
+OUTPUT_FORMATS = ("nuitka", "pyz")  # Builder method of each format is in the `compiler.FORMAT_BUILDERS`.
@@ -1,103 +1,242 @@
+from modules.execution.build_targets import OUTPUT_FORMATS, BACKENDS
+from modules.execution import build_cache
+from modules.execution import frontend
+from modules.execution import analysis
+from modules.execution import watchdog
+from modules.execution import plan
+from modules.execution import jit
 from modules.nodes.node import Node
-from modules import terminal
 from modules import types
 from modules import style
-from modules import ui
 
-from typing import Callable
+from dataclasses import dataclass
+from typing import Callable, Any
 import subprocess
-import inspect
+import py_compile
+import zipfile
 import shutil
 import time
-import ast
+import math
 import os
 
 
-def get_python_command():
-    commands = ["python3", "py", "py3"]
+MAX_FOLDED_VECTOR = 4096  # Larger folded vectors are computed by the program instead of being embedded in it.
+FORMAT_BUILDERS = {"nuitka": "compile_to_exe", "pyz": "compile_to_pyz"}  # Output format (see build_targets.OUTPUT_FORMATS): it's builder method.
+EXTRACTION_DIR = "{CACHE_DIR}/limbo"  # Cached onefile extraction (nuitka's path spec), every build has it's own directory.
+CORE_MODULES = ("modules.helpers", "modules.thunks", "modules.runtime_io", "modules.execution.exit_codes")  # Imported by every program on start (never lazily).
+SERVER_MODULE = "modules.execution.server"  # Imported by the injected runners in the `--serve` mode.
+WATCHDOG_MODULE = "modules.execution.watchdog"  # Imported by the direct backend's driver of the programs with limits.
 
-    for cmd in commands:
-        try:
-            result = subprocess.run([cmd, "--version"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return cmd
-
-        except FileNotFoundError:
-            continue
-
-    raise EnvironmentError("No suitable Python command found. Ensure Python is installed and accessible.")
-
-
-def get_function_body(func: Callable) -> str:
-    """ Returns function's code as a string. """
-    return inspect.getsource(func).split("\n", 1)[1]
+class SourceExpression(str):
+    """ Register value written into the build target as python expression (not as the string). """
 
+    def __repr__(self) -> str:
+        return str(self)
 
-def get_input_param_name(func: Callable) -> str | None:
-    """ Get function's first argument if any. """
-    source = inspect.getsource(func).strip()
-    parsed = ast.parse(source)
-    body = parsed.body[0]
 
-    args_list = [str(arg.arg) for arg in body.args.args]
-    if not args_list:
-        return None
+@dataclass
+class StartupOptions:
+    """ Options cutting the startup of the compiled program. """
+    lazy_imports: bool = True  # Modules imported by the handlers are executed on their first use (see `helpers.lazy_import()`).
+    minimal_bundle: bool = True  # Bundle only the Limbo's modules imported on start (no UI modules deferred into functions).
+    extraction_dir: str | None = EXTRACTION_DIR  # Onefile binary extracts once into this directory (None on every launch).
 
-    return args_list[0]
+    @classmethod
+    def baseline(cls) -> "StartupOptions":
+        return cls(lazy_imports=False, minimal_bundle=False, extraction_dir=None)
 
 
-SKIP_IMPORTS = [
-    "from modules.nodes.source import NodeInput, NodeOutput",
-    "from modules.nodes.collection import NodesCollections",
-    "from modules.nodes.factory import NodeFactory",
-    "from modules.nodes.node import FlowControl",
-    "from modules import types"
-]
+def is_vector(value: Any) -> bool:
+    return types.is_vector(value)
 
-def get_imports(func: Callable) -> set[str]:
-    """ Check provided node's handler function module and gather all imports. """
 
-    module_path = func.__module__.replace(".", "/") + ".py"
-    import_lines = []
+def register_constant(value: Any) -> Any:
+    """ Constant value in form written into the register (vectors are rebuilt from their float64 buffer). """
+    if is_vector(value):
+        buffer = value.astype("<f8").tobytes()
+        return SourceExpression(f"numpy.frombuffer(bytes.fromhex('{buffer.hex()}'), dtype='<f8')")
 
-    with open(module_path, "r") as mod_file:
-        for line in mod_file.readlines():
-            line = line.removesuffix("\n")
+    if isinstance(value, float) and not math.isfinite(value):
+        return SourceExpression(f"float('{value}')")
 
-            if line.startswith("import") or line.startswith("from") and line not in SKIP_IMPORTS:
-                import_lines.append(line)
-
-    return set(import_lines)
+    return value
 
 
 class Compiler:
-    """ Compile Limbo Nodes into executable. """
-
-    def __init__(self, name: str, start_node: Node, all_nodes: list[Node]) -> None:
+    """
+    Compile Limbo Nodes into executable.
+
+    Backends of the build target:
+        direct    - program's code generated for the graph by the `jit.JitProgram` (handlers called with inlined
+                    inputs, flow as basic blocks with a jump table), run by the injected `direct.py`.
+        registry  - register of the nodes walked by the generic injected `executor.py`.
+    Direct backend falls back to the registry when the graph can't be lowered into code.
+
+    Output formats (see OUTPUT_FORMATS):
+        nuitka    - standalone native binary (slow build, cached by the `build_cache.BuildCache`).
+        pyz       - byte-compiled zipapp of the build target and the Limbo's modules it imports (built in
+                    a fraction of a second, runs with the same Python version and the installed requirements).
+    Startup of both is cut by the StartupOptions (`StartupOptions.baseline()` disables them).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        start_node: Node,
+        all_nodes: list[Node],
+        max_restarts: int | None = None,
+        limits: watchdog.WatchdogLimits | None = None,
+        memory_file: str | None = None,
+        backend: str = "direct",
+        output_format: str = "nuitka",
+        startup: StartupOptions | None = None,
+        server: bool = True
+    ) -> None:
+        """
+        Compiled program with the `memory_file` keeps it's memory in the file (see `memory_file.PersistentMemoryJar`).
+        With the `server` it can be started resident with `--serve` (see `server.ProgramServer`).
+        """
         self.name = name.removesuffix(".limb")
         self.start_node = start_node
-        self.all_nodes = all_nodes
+        self.limits = limits
+        self.all_nodes = analysis.reachable_nodes(start_node, all_nodes)
+        self.pruned_count = len(all_nodes) - len(self.all_nodes)
+        self.max_restarts = max_restarts
+        self.memory_file = memory_file
+        self.backend = backend
+        self.output_format = output_format
+        self.startup = startup if startup is not None else StartupOptions()
+        self.server = server
+        self.runtime_modules: list[str] = [SERVER_MODULE] if server else []  # Modules the injected runners import on demand.
+        self.lazy_modules: list[str] = []  # Modules imported lazily by the build target's header.
+        self.folded = analysis.fold_constants(self.all_nodes)
+        self.memory_keys = {node.node_id: analysis.constant_memory_key(node, self.folded) for node in self.all_nodes}
+        self.key_slots: dict[str, int] = {}  # Constant memory keys, resolved by the program at start in this order.
+
+        self.__compilation_dir_path = "./__compilation/"
+        self.__build_target_path = self.__compilation_dir_path + f"_compile_{self.name}.py"
+        self.__dependencies: dict[str, None] = {}  # Import statements and definitions used by the handlers (ordered).
+
+    def run(self) -> str:
+        """ Compile program displaying the progress in the UI. Returns path to the executable. """
+        from modules import terminal
+        from modules import ui
 
         ui.SCREEN_BUSY = True
 
         start_time = time.time_ns()
         terminal.clear_screen()
-        print(f"Started compilation process for: {style.highlight(name + ".exe")}")
+        print(f"Started compilation process for: {style.highlight(self.output_name())}")
 
-        self.__compilation_dir_path = "./__compilation/"
-        if not os.path.exists(self.__compilation_dir_path):
-            os.mkdir(self.__compilation_dir_path)
-            
-        self.__build_target_path = self.__compilation_dir_path + f"_compile_{name}.py"
-        self.__dependecies_imports = set()
+        exe_path = self.build()
+        total_time = (time.time_ns() - start_time) / 1e9
 
+        print(f"\n\nCompiled {style.highlight(self.name)} to: {style.highlight(exe_path)} in {style.highlight(f'{total_time}s')}\n\n")
+        print(f"Press {style.key('enter')} to continue...")
+        terminal.wait_for_enter()
+        
+        ui.SCREEN_BUSY = False
+        return exe_path
+
+    def build(self) -> str:
+        """ Write the build target and build it in the compiler's output format. Returns path to the output file. """
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {self.output_format}")
+
+        self.write_build_target()
+        try:
+            return getattr(self, FORMAT_BUILDERS[self.output_format])()
+        finally:
+            self.cleanup()
+
+    def output_name(self) -> str:
+        if self.output_format == "pyz":
+            return f"{self.name}.pyz"
+        return f"{self.name}.exe" if os.name == "nt" else f"{self.name}.bin"
+
+    def generate_build_target(self) -> str:
+        """ Generate python source of the program using the compiler's backend. """
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown compiler backend: {self.backend}")
+
+        if self.backend == "direct":
+            try:
+                return self.generate_direct_target()
+            except (jit.JitUnsupported, SyntaxError, RecursionError, MemoryError) as error:
+                print(f"\nDirect code generation failed ({error}), using the registry executor.")
+
+        return self.generate_registry_target()
+
+    def generate_registry_target(self) -> str:
+        """ Generate python source of the program (handlers, register and the injected executor). """
         defined_fns = self.define_functions()
+        instances_register = self.build_instances_register()
         build_target_content = ""
-        build_target_content += self.include_dependencies(defined_fns) + "\n"
+        build_target_content += self.include_dependencies() + "\n"
         build_target_content += defined_fns + "\n"
-        build_target_content += self.build_instances_register() + "\n"
+        build_target_content += instances_register + "\n"
         build_target_content += self.set_entry_node() + "\n"
+        build_target_content += self.set_memory_keys() + "\n"
+        build_target_content += self.set_memory_file() + "\n"
+        build_target_content += self.set_restart_budget() + "\n"
+        build_target_content += self.set_watchdog() + "\n"
+        build_target_content += self.set_server() + "\n"
         build_target_content += self.inject_executor()
+        return build_target_content
+
+    def generate_direct_target(self) -> str:
+        """ Generate python source of the program (handlers, program's code and the injected driver). """
+        program = self.generate_program()
+        defined_fns = self.define_functions()
+        nodes = [(node.title, node.node_id) for node in program.plan.nodes]
+        handlers = ", ".join(self.handler_of(node)[0] for node in program.plan.nodes)
+        constants = "CONSTANTS = " + str([self.source_constant(value) for value in program.constants])
+
+        build_target_content = ""
+        build_target_content += self.include_dependencies() + "\n"
+        build_target_content += defined_fns + "\n"
+        build_target_content += f"HANDLERS = [{handlers}]\n"
+        build_target_content += constants + "\n"
+        build_target_content += f"NODES = {nodes!r}\n"
+        build_target_content += f"BLOCK_CALLS = {program.block_calls!r}\n"
+        build_target_content += self.set_memory_keys() + "\n"
+        build_target_content += self.set_memory_file() + "\n"
+        build_target_content += self.set_restart_budget() + "\n"
+        build_target_content += self.set_watchdog() + "\n"
+        build_target_content += self.set_server() + "\n\n"
+        build_target_content += program.source + "\n"
+        build_target_content += self.inject_driver()
+
+        if self.watchdog_enabled():
+            self.runtime_modules.append(WATCHDOG_MODULE)
+        return build_target_content
+
+    def generate_program(self) -> jit.JitProgram:
+        """ Generate program's code from it's ExecutionPlan. Raises JitUnsupported if the graph can't be lowered. """
+        execution_plan = plan.ExecutionPlan(self.start_node, self.all_nodes)
+        for slot, node in enumerate(execution_plan.nodes):  # Slots of the program's own MEMORY_KEYS.
+            memory_key = self.memory_keys[node.node_id]
+            if memory_key is not None:
+                execution_plan.inputs[slot][analysis.MEMORY_SLOT] = self.key_slots.setdefault(memory_key, len(self.key_slots))
+
+        program_watchdog = None
+        if self.limits is not None and self.limits.enabled():
+            program_watchdog = watchdog.Watchdog(self.limits, len(execution_plan.nodes))
+
+        program = jit.JitProgram(execution_plan, program_watchdog)
+        for value in program.constants:
+            if is_vector(value) and value.size > MAX_FOLDED_VECTOR:
+                raise jit.JitUnsupported(f"Folded vector of {value.size} values is too large to embed")
+
+        print(f"\nGenerated {style.highlight(str(len(program.source.splitlines())))} lines of the program's code")
+        return program
+
+    def write_build_target(self) -> str:
+        """ Save generated program into the compilation directory. Returns path to the build target. """
+        if not os.path.exists(self.__compilation_dir_path):
+            os.mkdir(self.__compilation_dir_path)
+
+        build_target_content = self.generate_build_target()
 
         if os.path.exists(self.__build_target_path):
             os.remove(self.__build_target_path)
@@ -105,47 +244,40 @@ class Compiler:
         with open(self.__build_target_path, "a+") as file:
             file.write(build_target_content)
 
-        exe_path = self.compile_to_exe()
-        total_time = (time.time_ns() - start_time) / 1e9
-        self.cleanup()
-
-        print(f"\n\nCompiled {style.highlight(name)} to: {style.highlight(exe_path)} in {style.highlight(f'{total_time}s')}\n\n")
-        print(f"Press {style.key('enter')} to continue...")
-        terminal.wait_for_enter()
-        
-        ui.SCREEN_BUSY = False
+        return self.__build_target_path
 
     def fn_name(self, node: Node) -> str:
         return f'f_{node.factory.title.replace(" ", "_").replace("-", "_").replace("/", "_")}'
 
+    def handler_of(self, node: Node) -> tuple[str, Callable]:
+        """ Returns (functionName, handler) used by the node (memory nodes with constant key use the slot handler). """
+        if self.memory_keys[node.node_id] is not None:
+            return (self.fn_name(node) + "_slot", node.factory.slot_handler)
+        return (self.fn_name(node), node.handler)
+
     def define_functions(self) -> str:
         """ Define mapped functions with code from nodes' handlers. Includes FN_REG. """
         print("\nNodes definition:")
+        if self.pruned_count:
+            print(f"  - pruned {style.highlight(str(self.pruned_count))} nodes unreachable from the Start")
         
-        defined_factories = []
+        defined_functions = []
         fn_reg = "{"
         content = ""
 
         for node in self.all_nodes:
-            if node.factory.factory_id in defined_factories:
+            func_name, handler = self.handler_of(node)
+            if func_name in defined_functions:
                 continue
 
-            func_name = self.fn_name(node)
-            fn_content = get_function_body(node.handler)
-            if not fn_content:
-                fn_content = "\treturn None"
-
-            if node.handler.__name__ == "<lambda>":
-                input_arg = "*_"
-            else:
-                input_arg = get_input_param_name(node.handler)
-                self.__dependecies_imports = self.__dependecies_imports.union(get_imports(node.handler))
+            handler_source = frontend.ModuleSource.handler(handler)
+            handler_source.module.dependencies(handler_source.names, self.__dependencies)
 
-            definition = f"def {func_name}({input_arg}):  # {node.title}\n"
-            definition += fn_content + "\n\n"
+            definition = f"def {func_name}({handler_source.arguments}):  # {node.title}\n"
+            definition += handler_source.body + "\n\n"
 
             content += definition
-            defined_factories.append(node.factory.factory_id)
+            defined_functions.append(func_name)
             fn_reg += f'"{func_name}": {func_name}, '
             print(f"  - defined: {style.node(node)}")
 
@@ -154,20 +286,34 @@ class Compiler:
 
         return content
 
-    def include_dependencies(self, defined_fns_code: str) -> str:
-        """ Return all required import statemets. """
+    def include_dependencies(self) -> str:
+        """ Return import statements (and module definitions) read by the handlers and constants. """
         content = ""
-        used_deps = 0
+        self.lazy_modules = []
 
-        for dependency_import in self.__dependecies_imports:
-            dependency_target = dependency_import.strip().split(" ")[-1] + "."
-            if dependency_target in defined_fns_code:
-                content += dependency_import + "\n"
-                used_deps += 1
+        for dependency in self.__dependencies:
+            target = None
+            if self.startup.lazy_imports and dependency.startswith(("import ", "from ")):
+                target = frontend.lazy_import_target(dependency)
 
-        print(f"\nIncluded {style.highlight(str(used_deps))} dependencies.")
+            if target is None or target[1] in CORE_MODULES:
+                content += dependency + "\n"
+            else:
+                content += f"{target[0]} = lazy_import({target[1]!r})\n"
+                self.lazy_modules.append(target[1])
+
+        if self.lazy_modules:
+            content = "from modules.helpers import lazy_import\n" + content
+
+        print(f"\nIncluded {style.highlight(str(len(self.__dependencies)))} dependencies ({len(self.lazy_modules)} imported lazily).")
         return content
 
+    def source_constant(self, value: Any) -> Any:
+        """ Constant in form written into the build target (see `register_constant()`), adds it's dependencies. """
+        if is_vector(value):
+            self.__dependencies.setdefault("import numpy")
+        return register_constant(value)
+
     def build_instances_register(self) -> str:
         """
         Build register of all instances and their sources.
@@ -175,58 +321,98 @@ class Compiler:
         Register format:
         {
             'node_id': {
+                'title': 'Node title',                                (used by the watchdog's report)
                 'handler': 'f_FactoryTitle',                          (key for FN_REG)
                 'inputs': [
-                    (inputName, targetNodeID, targetOutputSrcName),   <- Other node wire.
-                    (inputName, constantValue, None)                  <- Constant value.
+                    (inputName, targetNodeID, targetOutputSrcName, readerBit, lazy),   <- Other node wire.
+                    (inputName, constantValue, None, 0, False)                         <- Constant value.
+                    ('slot', keySlot, None, 0, False)                                  <- Memory node's constant key slot (see MEMORY_KEYS).
                 ],
-                'outputs': [(outputName, targetNodeID, targetInputSrcName)],
+                'outputs': [(outputName, targetNodeID, targetInputSrcName)],  (one entry per target)
+                'readers': readersMask,                               (one bit per target of the data output)
+                'loop': indexOutputName / None,                       (set for loop nodes, handler returns iterator of index values)
                 'flow-output': targetNodeID / None,
                 '__next-flow': targetNodeID / None,                   (by default set to flow-output or first output,
                                                                        can be modified by handler's response,
                                                                        exit if still None after handler call)
                 '__default-next-flow': targetNodeID / None            (same as __next-flow but immutable, used at state reset)
-                '__h_return': valReturnedByHandler / None
+                '__h_return': valReturnedByHandler / None             (kept until read by every reader)
+                '__unread': readersMask                               (readers that haven't read the __h_return yet)
+                '__loop_return': {indexOutputName: index} / None      (loop's current index, readable by any reader)
             }
         }
         """
         print("\nBuild instances register:")
 
         register = {}
+        registered = {node.node_id for node in self.all_nodes}
+        folded = self.folded
+        if folded:
+            print(f"  - folded {style.highlight(str(len(folded)))} constant values")
 
         for node in self.all_nodes:
             node_data = {
-                'handler': self.fn_name(node),
+                'title': node.title,
+                'handler': self.handler_of(node)[0],
                 'inputs': [],
                 'outputs': [],
+                'readers': 0,
+                'loop': None,
                 'flow-output': None,
                 '__default-next-flow': None,
                 '__next-flow': None,
-                '__h_return': None
+                '__h_return': None,
+                '__unread': 0,
+                '__loop_return': None
             }
 
-            if node.flow.enable_output and node.flow.output_src.target is not None:
+            if node.flow.enable_output and node.flow.output_src.target is not None and node.flow.output_src.target.node.node_id in registered:
                 flow_target = node.flow.output_src.target.node.node_id
                 node_data['flow-output'] = node_data['__next-flow'] = node_data['__default-next-flow'] = flow_target
                 
             for src_in in node.inputs:
+                folded_value = analysis.folded_input_value(src_in, folded)
+                if is_vector(folded_value) and folded_value.size > MAX_FOLDED_VECTOR:
+                    folded_value = None
+
                 if src_in.constant_value is not None:
                     node_data['inputs'].append(
-                        (src_in.name, src_in.constant_value, None)
+                        (src_in.name, self.source_constant(src_in.constant_value), None, 0, False)
+                    )
+
+                elif folded_value is not None:
+                    node_data['inputs'].append(
+                        (src_in.name, self.source_constant(folded_value), None, 0, False)
                     )
                 
                 elif src_in.source is not None and src_in.data_type != types.FLOW:
+                    reader_index = next(index for index, target in enumerate(src_in.source.targets) if target is src_in)
                     node_data['inputs'].append(
-                        (src_in.name, src_in.source.node.node_id, src_in.source.name)
+                        (src_in.name, src_in.source.node.node_id, src_in.source.name, 1 << reader_index, src_in.lazy)
                     )
 
+            memory_key = self.memory_keys[node.node_id]
+            if memory_key is not None:
+                key_slot = self.key_slots.setdefault(memory_key, len(self.key_slots))
+                node_data['inputs'].append(
+                    (analysis.MEMORY_SLOT, key_slot, None, 0, False)
+                )
+
             for src_out in node.outputs:
-                if src_out.target is not None:
+                for target in src_out.targets:
+                    if target.node.node_id not in registered:  # Pruned.
+                        continue
+
                     node_data['outputs'].append(
-                        (src_out.name, src_out.target.node.node_id, src_out.target.name)
+                        (src_out.name, target.node.node_id, target.name)
                     )
 
-            if node_data["__next-flow"] is None and node_data['outputs']:
+                if src_out.data_type != types.FLOW:
+                    node_data['readers'] = (1 << len(src_out.targets)) - 1
+                    if node.factory.loop:
+                        node_data['loop'] = src_out.name
+
+            if node_data["__next-flow"] is None and node_data['outputs'] and node_data['loop'] is None:
                 node_data['__default-next-flow'] = node_data["__next-flow"] = node_data['outputs'][0][1] or None
 
             register[node.node_id] = node_data
@@ -238,34 +424,135 @@ class Compiler:
         print(f"\nSet entry node to: {style.node(self.start_node)}::{self.start_node.node_id}")
         return f'ENTRY_ID = "{self.start_node.node_id}"'
 
+    def set_memory_keys(self) -> str:
+        if self.key_slots:
+            print(f"Resolved {style.highlight(str(len(self.key_slots)))} constant memory keys")
+        return f"MEMORY_KEYS = {list(self.key_slots)!r}"
+
+    def set_memory_file(self) -> str:
+        if self.memory_file is not None:
+            print(f"Set persistent memory file to: {style.highlight(self.memory_file)}")
+        return f"MEMORY_FILE = {self.memory_file!r}"
+
+    def set_restart_budget(self) -> str:
+        if self.max_restarts is not None:
+            print(f"Set restart budget to: {style.highlight(str(self.max_restarts))}")
+        return f"MAX_RESTARTS = {self.max_restarts}"
+
+    def watchdog_enabled(self) -> bool:
+        return self.limits is not None and self.limits.enabled()
+
+    def set_watchdog(self) -> str:
+        if not self.watchdog_enabled():
+            return "WATCHDOG = None"
+
+        print(f"Set watchdog limits to: {style.highlight(str(self.limits))}")
+        return f"WATCHDOG = {self.limits.as_tuple()!r}"
+
+    def set_server(self) -> str:
+        return f"SERVER = {self.server}"
+
     def inject_executor(self) -> str:
         with open("./modules/execution/injected/executor.py") as file:
             return file.read()
 
+    def inject_driver(self) -> str:
+        with open("./modules/execution/injected/direct.py") as file:
+            return file.read()
+
+    def program_source(self, build_source: str) -> str:
+        """ Build target's source with the imports of the modules it imports at runtime (on demand, lazily). """
+        roots = [*self.runtime_modules, *self.lazy_modules]
+        if self.memory_file is not None:
+            roots.append("modules.memory_file")
+        return build_source + "".join(f"\nimport {name}" for name in roots)
+
+    def bundled_modules(self, build_source: str) -> dict[str, str]:
+        """ Limbo's modules bundled with the program {moduleName: path} (see `StartupOptions.minimal_bundle`). """
+        return frontend.local_dependencies(self.program_source(build_source), ".", top_level_only=self.startup.minimal_bundle)
+
+    def nuitka_options(self, build_source: str) -> list[str]:
+        """ Options of the nuitka build (`<key>` in them is replaced by the build key). """
+        options = ["--standalone", "--onefile", f"--output-filename={self.output_name()}"]
+        options += [f"--include-module={name}" for name in self.lazy_modules]
+
+        if self.startup.minimal_bundle:  # Modules imported only by the code the program never runs are left out.
+            all_modules = frontend.local_dependencies(self.program_source(build_source), ".")
+            options += [f"--nofollow-import-to={name}" for name in sorted(set(all_modules) - set(self.bundled_modules(build_source)))]
+
+        if self.startup.extraction_dir is not None:
+            options += [f"--onefile-tempdir-spec={self.startup.extraction_dir}/{self.name}_<key>", "--onefile-cache-mode=cached"]
+
+        return options
+
     def compile_to_exe(self) -> str:
-        """ Call nuitka compiler. Returns absolute path to the executable. """
-        print(f"\nCompile using {style.highlight('nuitka')}:\n")
-
-        output_exe = f"{self.name}.exe"
-        command = [
-            "nuitka",
-            "--standalone", "--onefile",
-            self.__build_target_path,
-            f"--output-filename={output_exe}",
-            f"--output-dir={self.__compilation_dir_path}"
-        ]
-
-        subprocess.run(command, check=True, shell=True)
-        
-        target_exe_path = f"{self.__compilation_dir_path}../"
-        if os.path.exists(target_exe_path + output_exe):
-            os.rename(target_exe_path + output_exe, target_exe_path + output_exe + f".old_{int(time.time())}")
-        
-        if not os.path.exists(f"{self.__compilation_dir_path}{output_exe}"):
-            return "<FAIL - No file>"
-        
-        shutil.move(f"{self.__compilation_dir_path}{output_exe}", target_exe_path)
-        return os.path.abspath(f"{self.__compilation_dir_path}../{output_exe}")
+        """ Call nuitka compiler (or reuse the cached binary of the same build). Returns absolute path to the executable. """
+        output_exe = self.output_name()
+        with open(self.__build_target_path) as file:
+            build_source = file.read()
+
+        start_time = time.perf_counter()
+        cache = build_cache.BuildCache()
+        options = self.nuitka_options(build_source)
+        build_key = cache.build_key(build_source, options)
+        options = [option.replace("<key>", build_key[:16]) for option in options]  # Extraction directory of the build.
+        built_path = cache.lookup(build_key, output_exe)
+
+        if built_path is not None:
+            print(f"\nBuild cache {style.highlight('hit')} ({build_key[:12]}), reused the binary in {time.perf_counter() - start_time:.2f}s")
+        else:
+            print(f"\nBuild cache {style.highlight('miss')} ({build_key[:12]}), compile using {style.highlight('nuitka')}:\n")
+
+            work_dir = cache.program_work_dir(self.name)
+            command = [*build_cache.nuitka_command(), *options, os.path.abspath(self.__build_target_path), f"--output-dir={work_dir}"]
+            subprocess.run(command, check=True, env=cache.environment())
+
+            if not os.path.exists(os.path.join(work_dir, output_exe)):
+                return "<FAIL - No file>"
+
+            built_path = cache.store(build_key, os.path.join(work_dir, output_exe))
+            print(f"\nBuilt and cached the binary in {time.perf_counter() - start_time:.2f}s")
+
+        return self.publish(built_path)
+
+    def compile_to_pyz(self) -> str:
+        """ Byte-compile the build target and the Limbo's modules it imports into a zipapp. Returns absolute path to it. """
+        print(f"\nBuild {style.highlight('pyz')} zipapp:")
+        start_time = time.perf_counter()
+
+        with open(self.__build_target_path) as file:
+            modules = self.bundled_modules(file.read())
+        packages = {name.rsplit(".", depth)[0] for name in modules for depth in range(1, name.count(".") + 1)}
+
+        pyz_path = self.__compilation_dir_path + self.output_name()
+        pyc_path = self.__compilation_dir_path + "_module.pyc"
+
+        with open(pyz_path, "wb") as file:
+            file.write(b"#!/usr/bin/env python3\n")
+
+            with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+                for name, path in {"__main__": self.__build_target_path, **modules}.items():
+                    module_path = name.replace(".", "/")
+                    invalidation_mode = py_compile.PycInvalidationMode.UNCHECKED_HASH
+                    py_compile.compile(path, pyc_path, module_path + ".py", doraise=True, invalidation_mode=invalidation_mode)
+                    archive.write(pyc_path, module_path + ".pyc")
+
+                for package in sorted(packages):
+                    archive.writestr(package.replace(".", "/") + "/__init__.py", "")
+
+        os.chmod(pyz_path, 0o755)
+        print(f"  - bundled {style.highlight(str(len(modules)))} modules in {time.perf_counter() - start_time:.2f}s")
+        return self.publish(pyz_path)
+
+    def publish(self, built_path: str) -> str:
+        """ Copy the built file next to the compilation directory (previous one is renamed). Returns absolute path to it. """
+        output_name = self.output_name()
+        target_path = f"{self.__compilation_dir_path}../"
+        if os.path.exists(target_path + output_name):
+            os.rename(target_path + output_name, target_path + output_name + f".old_{int(time.time())}")
+
+        shutil.copy2(built_path, target_path + output_name)
+        return os.path.abspath(target_path + output_name)
 
     def cleanup(self) -> None:
         """ Remove all used files except the EXE. """
@@ -1,59 +1,125 @@
+from modules.execution.trace import EventKind, TraceBuffer, TraceFile
 from modules.chars import ROUNDED_LINE
+from modules.execution import trace
 from modules import style
 from modules import types
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Generator, Any
 
 if TYPE_CHECKING:
     from modules.execution.runtime import RuntimeNode, RuntimeSourcePtr
 
 
-DBG_PREFIX = f"  {style.DIM}dbg) {style.RESET }"
+DATATYPES = {datatype.name: datatype for datatype in (types.TEXT, types.NUMBER, types.BOOLEAN, types.FLOW, types.VECTOR) if datatype is not None}
 
 
 class DebugSession:
-    def __init__(self) -> None:
-        self.indent = 0
-        
-    def write_msg(self, msg: str) -> str:
-        msg = DBG_PREFIX + f"{style.DIM}{ROUNDED_LINE.vt}{style.RESET} " * self.indent + msg
-        print(msg)
-        
+    """
+    Records the execution steps into the TraceBuffer (binary events, no formatting or I/O while running).
+    Recorded trace is displayed by the TraceViewer after the program ends.
+    """
+
+    def __init__(self, capacity: int = trace.DEFAULT_CAPACITY, spill_path: str | None = None) -> None:
+        self.trace = TraceBuffer(capacity, spill_path)
+
+    def node_index(self, rt_node: "RuntimeNode") -> int:
+        index = self.trace.node_indexes.get(rt_node.node_model.node_id)
+        if index is None:
+            index = self.trace.add_node(rt_node.node_model.node_id, style.node(rt_node.node_model))
+        return index
+
+    def write_msg(self, msg: str) -> None:
+        self.trace.record(EventKind.MESSAGE, payload=(msg,))
+
     def begin_execution(self, rt_node: "RuntimeNode") -> None:
-        message = style.tcolor(ROUNDED_LINE.nw + 3 * ROUNDED_LINE.hz + "(", styles=[style.AnsiStyle.DIM]) 
-        message += style.tcolor("Begin execution: ", styles=[style.AnsiStyle.ITALIC]) + style.node(rt_node.node_model) 
-        message += style.tcolor(") ...", styles=[style.AnsiStyle.DIM]) 
-        self.write_msg("")
-        self.write_msg(message)
-        self.indent += 1
+        self.trace.record(EventKind.BEGIN, self.node_index(rt_node))
 
     def request_value(self, name: str, pointer: "RuntimeSourcePtr") -> None:
-        message = f"Awaiting response from: {style.node(pointer.rt_node.node_model)}/{style.UNDERLINE}{pointer.src_name}{style.RESET} "
-        message += f"to set: {style.highlight(name)}"
-        self.write_msg(message)
-        
+        self.trace.record(EventKind.REQUEST, self.node_index(pointer.rt_node), (name, pointer.src_name))
+
     def received_value(self, name: str, value: Any, datatype: types.DataType) -> None:
-        message = f"{style.highlight(name)} = `{style.tcolor(str(value), datatype.color)}`  {style.DIM}(response received){style.RESET}"
-        self.write_msg(message)
-        
+        self.trace.record(EventKind.RECEIVED, payload=(name, value, datatype.name))
+
     def use_constant(self, name: str, value: Any, datatype: types.DataType) -> None:
-        message = f"{style.highlight(name)} = `{style.tcolor(str(value), datatype.color)}`  {style.DIM}(constant){style.RESET}"
-        self.write_msg(message)
-        
+        self.trace.record(EventKind.CONSTANT, payload=(name, value, datatype.name))
+
     def point_next_node(self, next: "RuntimeNode | None") -> None:
-        if next is not None:
-            message = f"Next -> {style.node(next.node_model)}"
-        else:
-            message = "Next -> (no next)"
-        self.write_msg(message)
-        
+        self.trace.record(EventKind.NEXT, self.node_index(next) if next is not None else trace.NO_REF)
+
     def node_output(self, values: dict) -> None:
-        message = f"Output -> `{style.highlight(str(values))}`"
-        self.write_msg(message)
-        
+        self.trace.record(EventKind.OUTPUT, payload=(values,))
+
     def end_execution(self) -> None:
-        message = f"{style.DIM}{ROUNDED_LINE.sw}{3 * ROUNDED_LINE.hz} finished"
-        self.indent -= 1
-        self.write_msg(message)
-        self.write_msg("")
-        
\ No newline at end of file
+        self.trace.record(EventKind.END)
+
+    def unwind(self) -> None:
+        """ Mark executions interrupted by an exception. """
+        self.trace.record(EventKind.UNWIND)
+
+    def close(self) -> None:
+        self.trace.close()
+
+
+class TraceViewer:
+    """ Pretty printer of the recorded (or spilled) execution trace. """
+
+    def __init__(self, recorded: TraceBuffer | TraceFile) -> None:
+        self.trace = recorded
+        self.indent = 0
+
+    def format_msg(self, msg: str) -> str:
+        return f"  {style.DIM}dbg) {style.RESET}" + f"{style.DIM}{ROUNDED_LINE.vt}{style.RESET} " * self.indent + msg
+
+    def value_info(self, payload: tuple, source_info: str) -> str:
+        name, value, datatype_name = payload
+        datatype = DATATYPES.get(datatype_name)
+        value = style.tcolor(str(value), datatype.color) if datatype is not None else str(value)
+        return f"{style.highlight(name)} = `{value}`  {style.DIM}({source_info}){style.RESET}"
+
+    def render_event(self, node_index: int, kind: int, value_ref: int) -> Generator[str, None, None]:
+        node_label = self.trace.node_label(node_index)
+        payload = self.trace.payload(value_ref)
+
+        if kind == EventKind.MESSAGE:
+            yield self.format_msg(payload[0] if payload else "")
+
+        elif kind == EventKind.BEGIN:
+            message = style.tcolor(ROUNDED_LINE.nw + 3 * ROUNDED_LINE.hz + "(", styles=[style.AnsiStyle.DIM])
+            message += style.tcolor("Begin execution: ", styles=[style.AnsiStyle.ITALIC]) + node_label
+            message += style.tcolor(") ...", styles=[style.AnsiStyle.DIM])
+            yield self.format_msg("")
+            yield self.format_msg(message)
+            self.indent += 1
+
+        elif kind == EventKind.REQUEST:
+            name, src_name = payload
+            yield self.format_msg(f"Awaiting response from: {node_label}/{style.UNDERLINE}{src_name}{style.RESET} to set: {style.highlight(name)}")
+
+        elif kind == EventKind.RECEIVED:
+            yield self.format_msg(self.value_info(payload, "response received"))
+
+        elif kind == EventKind.CONSTANT:
+            yield self.format_msg(self.value_info(payload, "constant"))
+
+        elif kind == EventKind.NEXT:
+            yield self.format_msg(f"Next -> {node_label}" if node_label is not None else "Next -> (no next)")
+
+        elif kind == EventKind.OUTPUT:
+            yield self.format_msg(f"Output -> `{style.highlight(str(payload[0]))}`")
+
+        elif kind == EventKind.END:
+            self.indent = max(0, self.indent - 1)
+            yield self.format_msg(f"{style.DIM}{ROUNDED_LINE.sw}{3 * ROUNDED_LINE.hz} finished")
+            yield self.format_msg("")
+
+        elif kind == EventKind.UNWIND:
+            self.indent = 0
+            yield self.format_msg(f"{style.DIM}(execution interrupted){style.RESET}")
+
+    def render(self) -> Generator[str, None, None]:
+        self.indent = 0
+        if self.trace.dropped:
+            yield self.format_msg(f"{style.DIM}... {self.trace.dropped} earlier events dropped{style.RESET}")
+
+        for node_index, kind, value_ref, _ in self.trace.iter_events():
+            yield from self.render_event(node_index, kind, value_ref)
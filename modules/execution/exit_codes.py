@@ -3,9 +3,13 @@ from enum import IntEnum
 
 class ExitCode(IntEnum):
     OK = 0
+    INPUT_CLOSED = 1
     ERROR = -1
     INF_RECURSION = -2
     MANUAL_TERMINATION = -3
+    EXECUTIONS_LIMIT = -4
+    TIMEOUT = -5
+    PULL_DEPTH_LIMIT = -6
     
     RESTART = 10
     RESTART_SAVE_MEMORY = 11
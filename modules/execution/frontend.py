@@ -0,0 +1,275 @@
+from importlib.util import resolve_name
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable
+import builtins
+import inspect
+import copy
+import ast
+import sys
+import os
+
+
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+def free_names(tree: ast.AST, annotations: bool = True) -> set[str]:
+    """ Names read by the code and not bound in it (function's scopes are merged), builtins excluded. """
+    loaded, bound = set(), set()
+
+    for node in walk(tree, annotations):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else bound).add(node.id)
+
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node is not tree:
+            bound.add(node.name)
+
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            bound.update(bound_name(alias) for alias in node.names)
+
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+
+    return loaded - bound - BUILTIN_NAMES
+
+
+def walk(tree: ast.AST, annotations: bool = True):
+    """ `ast.walk()` which can skip the annotations (not evaluated in the compiled handlers). """
+    to_visit = [tree]
+    while to_visit:
+        node = to_visit.pop()
+        yield node
+
+        for field, value in ast.iter_fields(node):
+            if not annotations and field in ("annotation", "returns"):
+                continue
+            if isinstance(value, ast.AST):
+                to_visit.append(value)
+            elif isinstance(value, list):
+                to_visit.extend(item for item in value if isinstance(item, ast.AST))
+
+
+def without_annotations(arguments: ast.arguments) -> ast.arguments:
+    arguments = copy.deepcopy(arguments)
+    for argument in arguments.posonlyargs + arguments.args + arguments.kwonlyargs + [arguments.vararg, arguments.kwarg]:
+        if argument is not None:
+            argument.annotation = None
+    return arguments
+
+
+def bound_name(alias: ast.alias) -> str:
+    """ Name bound by the imported alias (`import a.b` binds `a`). """
+    return alias.asname or alias.name.split(".")[0]
+
+
+def is_type_checking(statement: ast.stmt) -> bool:
+    """ `if TYPE_CHECKING:` block (it's imports are never executed). """
+    test = statement.test if isinstance(statement, ast.If) else None
+    return isinstance(test, ast.Name) and test.id == "TYPE_CHECKING" or isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+
+
+def lazy_import_call(statement: ast.stmt) -> str | None:
+    """ Name of the module bound by the `name = lazy_import("module")` statement (see `helpers.lazy_import()`). """
+    if not isinstance(statement, ast.Assign) or len(statement.targets) != 1 or not isinstance(statement.value, ast.Call):
+        return None
+
+    func, args = statement.value.func, statement.value.args
+    func_name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+    if func_name != "lazy_import" or len(args) != 1 or not isinstance(args[0], ast.Constant) or not isinstance(args[0].value, str):
+        return None
+    return args[0].value
+
+
+def top_level_statements(body: list[ast.stmt]):
+    """ Module's statements, including the ones nested in the top-level `if` / `try` blocks (except TYPE_CHECKING). """
+    for statement in body:
+        yield statement
+        if isinstance(statement, (ast.If, ast.Try)) and not is_type_checking(statement):
+            for block in (statement.body, statement.orelse, getattr(statement, "finalbody", []), *(handler.body for handler in getattr(statement, "handlers", []))):
+                yield from top_level_statements(block)
+
+
+@dataclass(frozen=True, slots=True)
+class HandlerSource:
+    arguments: str  # Source of the parameters list.
+    body: str  # Indented statements of the function's body.
+    names: frozenset[str]  # Global names read by the handler.
+    module: "ModuleSource"
+
+
+class ModuleSource:
+    """
+    Module of the node handlers parsed once (see `ModuleSource.of()`).
+
+    Top-level imports are split into single name statements and indexed (with other definitions) by the bound name,
+    so the build target includes only the imports and definitions the handlers actually read.
+    """
+
+    parsed: dict[str, "ModuleSource"] = {}
+    handlers: dict[object, HandlerSource] = {}  # Extracted handlers by their code object.
+
+    def __init__(self, module_name: str) -> None:
+        self.name = module_name
+        self.path = inspect.getsourcefile(sys.modules[module_name])
+        package = sys.modules[module_name].__package__ or ""
+
+        with open(self.path) as file:
+            self.source = file.read()
+        self.lines = self.source.splitlines()
+        self.tree = ast.parse(self.source, self.path)
+
+        self.imports: dict[str, str] = {}  # {boundName: importStatement}
+        self.definitions: dict[str, ast.stmt] = {}  # {name: topLevelDefinition}
+
+        for statement in top_level_statements(self.tree.body):
+            if isinstance(statement, ast.Import):
+                for alias in statement.names:
+                    self.imports[bound_name(alias)] = f"import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+
+            elif isinstance(statement, ast.ImportFrom) and statement.module != "__future__":
+                source_module = resolve_name("." * statement.level + (statement.module or ""), package) if statement.level else statement.module
+                for alias in statement.names:
+                    self.imports[bound_name(alias)] = f"from {source_module} import {alias.name}" + (f" as {alias.asname}" if alias.asname else "")
+
+            elif lazy_import_call(statement) is not None and isinstance(statement.targets[0], ast.Name):  # Import for the compiler.
+                name, module = statement.targets[0].id, lazy_import_call(statement)
+                self.imports[name] = f"import {module}" + (f" as {name}" if name != module else "")
+
+            elif isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.definitions[statement.name] = statement
+
+            elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+                targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        self.definitions[target.id] = statement
+
+    @classmethod
+    def of(cls, func: Callable) -> "ModuleSource":
+        module_source = cls.parsed.get(func.__module__)
+        if module_source is None:
+            module_source = cls.parsed[func.__module__] = cls(func.__module__)
+        return module_source
+
+    @classmethod
+    def handler(cls, func: Callable) -> HandlerSource:
+        """ Extract handler's source (cached). """
+        handler_source = cls.handlers.get(func.__code__)
+        if handler_source is None:
+            handler_source = cls.handlers[func.__code__] = cls.of(func).extract(func)
+        return handler_source
+
+    def segment(self, node: ast.AST) -> str:
+        first_line = min([node.lineno, *(decorator.lineno for decorator in getattr(node, "decorator_list", []))])
+        return "\n".join(self.lines[first_line - 1:node.end_lineno])
+
+    def find_function(self, func: Callable) -> ast.FunctionDef | ast.AsyncFunctionDef | ast.Lambda:
+        line = func.__code__.co_firstlineno
+        for node in ast.walk(self.tree):
+            if func.__name__ == "<lambda>":
+                if isinstance(node, ast.Lambda) and node.lineno == line:
+                    return node
+
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == func.__name__:
+                if line in (node.lineno, *(decorator.lineno for decorator in node.decorator_list)):
+                    return node
+
+        raise ValueError(f"Couldn't find the source of handler: {func.__qualname__} in {self.path}")
+
+    def extract(self, func: Callable) -> HandlerSource:
+        """ Handler's source without the annotations (handlers are renamed and defined by the compiler). """
+        node = self.find_function(func)
+        arguments = ast.unparse(without_annotations(node.args))
+        names = frozenset(free_names(node, annotations=False))
+
+        if isinstance(node, ast.Lambda):
+            return HandlerSource(arguments, f"    return {ast.get_source_segment(self.source, node.body)}", names, self)
+
+        if node.body[0].lineno == node.lineno:  # One line function.
+            return HandlerSource(arguments, "    " + "; ".join(ast.get_source_segment(self.source, statement) for statement in node.body), names, self)
+
+        body = "\n".join(self.lines[node.body[0].lineno - 1:node.end_lineno])
+        return HandlerSource(arguments, body, names, self)
+
+    def dependencies(self, names: frozenset[str], resolved: dict[str, None] | None = None, visiting: set[str] | None = None) -> dict[str, None]:
+        """ Import statements and definitions (ordered as a dict) the names depend on, their dependencies first. """
+        resolved = {} if resolved is None else resolved
+        visiting = set() if visiting is None else visiting
+
+        for name in sorted(names):
+            if name in self.imports:
+                resolved.setdefault(self.imports[name])
+                continue
+
+            definition = self.definitions.get(name)
+            if definition is None or name in visiting:
+                continue
+
+            visiting.add(name)
+            self.dependencies(frozenset(free_names(definition)), resolved, visiting)
+            resolved.setdefault(self.segment(definition))
+
+        return resolved
+
+
+def lazy_import_target(statement: str) -> tuple[str, str] | None:
+    """ (boundName, moduleName) of the single name import statement binding a module, None if it binds other object. """
+    node = ast.parse(statement).body[0]
+    alias = node.names[0]
+
+    if isinstance(node, ast.Import):
+        if "." in alias.name and alias.asname is None:  # Binds the top-level package.
+            return None
+        return bound_name(alias), alias.name
+
+    imported = getattr(sys.modules.get(node.module or ""), alias.name, None) if not node.level else None
+    if not isinstance(imported, ModuleType):
+        return None
+    return bound_name(alias), imported.__name__
+
+
+def imported_modules(tree: ast.AST, module_name: str = "__main__", package: str = "", top_level_only: bool = False) -> set[str]:
+    """ Absolute names of the modules imported by the code (function level imports included unless `top_level_only`). """
+    imported = set()
+
+    nodes = top_level_statements(tree.body) if top_level_only else ast.walk(tree)
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+
+        elif isinstance(node, ast.ImportFrom):
+            base = resolve_name("." * node.level + (node.module or ""), package) if node.level else node.module
+            imported.add(base)
+            imported.update(f"{base}.{alias.name}" for alias in node.names)  # Imported name may be a submodule.
+
+    imported.discard(module_name)
+    return imported
+
+
+def local_dependencies(source: str, root: str, package_name: str = "modules", top_level_only: bool = False) -> dict[str, str]:
+    """
+    Modules of the package (in the `root` directory) the source depends on, directly or not. Returns {moduleName: path}.
+    With `top_level_only` the imports deferred into functions are not followed (modules imported whenever the code runs).
+    """
+    found: dict[str, str] = {}
+    to_scan = [("__main__", "", ast.parse(source))]
+
+    while to_scan:
+        module_name, package, tree = to_scan.pop()
+
+        for name in imported_modules(tree, module_name, package, top_level_only):
+            if name in found or name.split(".")[0] != package_name:
+                continue
+
+            path = os.path.join(root, *name.split(".")) + ".py"
+            if not os.path.isfile(path):  # Package (or imported name).
+                continue
+
+            found[name] = path
+            with open(path) as file:
+                to_scan.append((name, name.rpartition(".")[0], ast.parse(file.read(), path)))
+
+    return found
@@ -0,0 +1,129 @@
+"""
+Code below is injected into the direct backend's build file after the generated program function
+(`__jit_program`, see `jit.JitProgram`) and is responsible for running it (restarts, memory, watchdog).
+"""
+
+from modules.execution.exit_codes import ExitCode
+from modules.thunks import LoopInput, Thunk
+from modules import helpers
+
+from sys import exit, argv
+from os import environ
+import sys
+import os
+
+
+HANDLERS: list  # Handler of every node, by the node's slot.
+CONSTANTS: list  # Constants of the program used by it's code (`K`).
+NODES: list[tuple[str, str]]  # (title, nodeID) by the node's slot (used by the watchdog's report).
+BLOCK_CALLS: dict[int, list[int]]  # Slots of the handlers called by the code block (see `JitProgram.block_calls`).
+MEMORY_KEYS: list[str]  # Constant memory keys, their MemoryJar slots are allocated in this order.
+MEMORY_FILE: str | None  # Persistent memory file (overridden by the LIMBO_MEMORY_FILE environment variable).
+MAX_RESTARTS: int | None
+WATCHDOG: tuple[int | None, float | None, int | None] | None  # (maxExecutions, timeoutSeconds, maxPullDepth)
+SERVER: bool  # Program can be started resident with `--serve` (it's module is bundled only then).
+
+__BLOCK_COUNTS = [0] * len(NODES) * 2
+LimitExceeded = ()  # Nothing to catch without the watchdog (imported by `__start_watchdog()` of the programs with limits).
+
+
+def __print_hottest(watchdog: "Watchdog") -> None:
+    for leader, calls in BLOCK_CALLS.items():
+        for slot in calls:
+            watchdog.counts[slot] += __BLOCK_COUNTS[leader]
+
+    print("\nHottest nodes (executions):")
+    for slot, executions in watchdog.hottest():
+        title, node_id = NODES[slot]
+        print(f"{executions:>12}  {title}::{node_id}")
+
+def __run_once(watchdog: "Watchdog | None") -> int:
+    try:
+        __jit_program(HANDLERS, CONSTANTS, watchdog, __BLOCK_COUNTS)
+        return ExitCode.OK
+
+    except EOFError as exit_code:
+        return int(exit_code.args[0])
+
+    except RecursionError:
+        print("\nERROR: Infinite recurrsion occured.")
+        return ExitCode.INF_RECURSION
+
+    except RuntimeError as error:
+        print(f"\nERROR: {error}")
+        return ExitCode.ERROR
+
+    except LimitExceeded as limit:
+        print(f"\nERROR: {limit}")
+        __print_hottest(watchdog)
+        return limit.exit_code
+
+    except KeyboardInterrupt:
+        print("\nExecution manually terminated.")
+        return ExitCode.MANUAL_TERMINATION
+
+def __exit(exit_code: int):
+    helpers.MemoryJar.get_current().close()
+    return exit(exit_code)
+
+def __start_watchdog() -> "Watchdog":
+    global LimitExceeded
+    from modules.execution.watchdog import Watchdog, WatchdogLimits, LimitExceeded
+
+    watchdog = Watchdog(WatchdogLimits(*WATCHDOG), len(NODES))
+    watchdog.start()
+    __BLOCK_COUNTS[:] = [0] * len(__BLOCK_COUNTS)
+    return watchdog
+
+def __run_program() -> int:
+    """ Execute program until it exits (restarts included). Returns the exit code. """
+    run_count = 0
+    watchdog = __start_watchdog() if WATCHDOG is not None else None
+
+    while True:
+        run_count += 1
+        exit_code = __run_once(watchdog)
+
+        if exit_code not in (ExitCode.RESTART, ExitCode.RESTART_SAVE_MEMORY):
+            return exit_code
+
+        if MAX_RESTARTS is not None and run_count > MAX_RESTARTS:
+            print(f"\nERROR: Program has been restarted over {MAX_RESTARTS} times.")
+            return ExitCode.INF_RECURSION
+
+        if exit_code == ExitCode.RESTART:
+            helpers.MemoryJar.get_current().clear()
+
+def __run():
+    for key in MEMORY_KEYS:
+        helpers.MemoryJar.resolve_key(key)
+
+    helpers.MemoryJar.persistent_path = environ.get("LIMBO_MEMORY_FILE", MEMORY_FILE)
+    if any(arg.startswith("--serve") for arg in argv[1:]):  # Server is imported only by it's mode (startup).
+        if not SERVER:
+            print("\nERROR: Program has been compiled without the --serve mode.")
+            return exit(ExitCode.ERROR)
+
+        from modules.execution import server
+        serve, socket_path = server.serve_address(argv[1:])
+        if serve:  # Resident, every request runs the program with a fresh memory jar.
+            program_server = server.ProgramServer(__run_program, server.SHARED_MEMORY_OPTION in argv)
+            return __exit(program_server.serve(socket_path))
+
+    try:
+        helpers.MemoryJar.new_jar()
+    except (OSError, ValueError, ImportError) as error:
+        print(f"\nERROR: Couldn't open the memory file: {error}")
+        return exit(ExitCode.ERROR)
+
+    return __exit(__run_program())
+
+def __main():
+    try:
+        __run()
+
+    except BrokenPipeError:  # Output closed by the reader (like `| head`).
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        __exit(ExitCode.MANUAL_TERMINATION)
+
+__main()
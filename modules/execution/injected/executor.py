@@ -5,92 +5,270 @@ and is responsible for handling (preparing, executing) parsed nodes.
 
 from modules.execution.exit_codes import ExitCode
 from modules import helpers
+from modules import thunks
 
-from sys import exit
+from functools import partial
+from time import perf_counter
+from sys import exit, argv
+from os import environ
+import sys
+import os
 
 
 NODES_REG: dict
 FN_REG: dict
 ENTRY_ID: str
+MEMORY_KEYS: list[str]  # Constant memory keys, their MemoryJar slots are allocated in this order.
+MEMORY_FILE: str | None  # Persistent memory file (overridden by the LIMBO_MEMORY_FILE environment variable).
+MAX_RESTARTS: int | None
+WATCHDOG: tuple[int | None, float | None, int | None] | None  # (maxExecutions, timeoutSeconds, maxPullDepth)
+SERVER: bool  # Program can be started resident with `--serve` (it's module is bundled only then).
+
+__STEP_RETURNS = {}  # Returns of the pulled nodes with many readers, shared until the end of the flow step.
+__LOOPS = []  # Running loops (loopNodeID, indexIterator), innermost last.
+__LOOP_END = object()
+__WATCH = {"executions": 0, "depth": 0, "deadline": None, "counts": {}}  # Watchdog's state.
+__CHECK_INTERVAL = 4096  # Executions between the deadline checks.
+
+
+class __LimitExceeded(Exception):
+    def __init__(self, exit_code: int, message: str) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
     
     
-def __prep_inputs(inputs: list[tuple[str, str, str | None]]) -> dict:
+def __read_return(node_id: str, reader: int) -> dict | None:
+    """ Output values of the node for the reader. Evaluates the node if there are none left for it. """
+    target_data = NODES_REG.get(node_id)
+    if target_data["loop"] is not None:
+        return target_data["__loop_return"]
+
+    target_return = target_data["__h_return"]
+    if target_return is not None and target_data["__unread"] & reader:
+        target_data["__unread"] ^= reader
+        if not target_data["__unread"]:
+            target_data["__h_return"] = None
+        return target_return
+
+    target_return = __STEP_RETURNS.get(node_id)
+    if target_return is None:
+        __WATCH["depth"] += 1
+        try:
+            target_return = __execute(node_id, pulled=True)
+        finally:
+            __WATCH["depth"] -= 1
+        if target_return is not None and target_data["readers"] > 1:
+            __STEP_RETURNS[node_id] = target_return
+
+    return target_return
+
+def __pull_lazy(node_id: str, src_name: str, reader: int):
+    """ Value of the lazy input, pulled when the handler reads it. """
+    target_return = __read_return(node_id, reader)
+    return target_return.get(src_name) if target_return is not None else None
+
+def __prep_inputs(inputs: list[tuple[str, str, str | None, int, bool]], is_loop: bool = False) -> dict:
     values = {}
     
-    for name, node_or_const, src_name in inputs:
+    for name, node_or_const, src_name, reader, lazy in inputs:
         if src_name is None:
             values[name] = node_or_const
             continue
+
+        if lazy:  # Loop node re-pulls it's lazy inputs on every read.
+            thunk = thunks.LoopInput if is_loop else thunks.Thunk
+            values[name] = thunk(partial(__pull_lazy, node_or_const, src_name, reader))
+            continue
         
-        target_return = NODES_REG.get(node_or_const)["__h_return"]
-        if target_return is None:
-            __execute(node_or_const)
-            target_return = NODES_REG.get(node_or_const)["__h_return"]
-            
+        target_return = __read_return(node_or_const, reader)
         if target_return is None:
             continue
             
-        NODES_REG.get(node_or_const)["__h_return"] = None
         for ret_key, ret_val in target_return.items():
             if ret_key == src_name:
                 values[name] = ret_val
 
     return values
 
+def __watch(node_id: str, pulled: bool) -> None:
+    """ Count node's execution and check the WATCHDOG limits (the clock is read every __CHECK_INTERVAL executions). """
+    max_executions, timeout, max_pull_depth = WATCHDOG
+    counts = __WATCH["counts"]
+    counts[node_id] = counts.get(node_id, 0) + 1
+    __WATCH["executions"] += 1
+    executions = __WATCH["executions"]
+
+    if max_executions is not None and executions > max_executions:
+        raise __LimitExceeded(ExitCode.EXECUTIONS_LIMIT, f"Program exceeded the limit of {max_executions} node executions.")
+
+    if pulled and max_pull_depth is not None and __WATCH["depth"] > max_pull_depth:
+        raise __LimitExceeded(ExitCode.PULL_DEPTH_LIMIT, f"Program exceeded the limit of {max_pull_depth} nested data pulls.")
+
+    if timeout is not None and executions % __CHECK_INTERVAL == 0 and perf_counter() > __WATCH["deadline"]:
+        raise __LimitExceeded(ExitCode.TIMEOUT, f"Program exceeded the time limit of {timeout}s.")
+
+def __print_hottest(count: int = 5) -> None:
+    counts = __WATCH["counts"]
+    print("\nHottest nodes (executions):")
+    for node_id in sorted(counts, key=counts.get, reverse=True)[:count]:
+        print(f"{counts[node_id]:>12}  {NODES_REG[node_id]['title']}::{node_id}")
+
+def __iterate() -> str | None:
+    """ Advance the innermost loop. Returns ID of the next node (loop's body or the node after the loop). """
+    node_id, iterator = __LOOPS[-1]
+    node_data = NODES_REG.get(node_id)
+    branch = "body"
+
+    index = next(iterator, __LOOP_END)
+    if index is __LOOP_END:
+        __LOOPS.pop()
+        branch = "done"
+    else:
+        node_data["__loop_return"] = {node_data["loop"]: index}
+
+    for out_name, out_target, _ in node_data.get('outputs'):
+        if out_name == branch:
+            return out_target
+    return None
+
+def __next_iteration() -> str | None:
+    """ Continue the innermost loop after the flow of it's body ended. """
+    if WATCHDOG is not None:
+        __watch(__LOOPS[-1][0], False)
+
+    next_node = __iterate()
+    __STEP_RETURNS.clear()
+    return next_node
+
 def __reset_state() -> None:
+    __STEP_RETURNS.clear()
+    __LOOPS.clear()
     for key in NODES_REG.keys():
         NODES_REG[key]["__next-flow"] = NODES_REG[key]["__default-next-flow"]
         NODES_REG[key]["__h_return"] = None
+        NODES_REG[key]["__unread"] = 0
+        NODES_REG[key]["__loop_return"] = None
 
-def __execute(node_id: str) -> None:
+def __execute(node_id: str, pulled: bool = False) -> dict | None:
+    """ Returns handler's output values (not kept if node is `pulled`). """
     node_data = NODES_REG.get(node_id)
     handler = FN_REG.get(node_data.get('handler'))
-    inputs = __prep_inputs(node_data.get('inputs'))
+    if WATCHDOG is not None:
+        __watch(node_id, pulled)
+
+    inputs = __prep_inputs(node_data.get('inputs'), node_data['loop'] is not None)
     
     output = handler(inputs)
+
+    if node_data['loop'] is not None:
+        __LOOPS.append((node_id, iter(output)))
+        node_data['__next-flow'] = __iterate()
+        return None
     
-    if isinstance(output, dict):
-        NODES_REG.get(node_id)['__h_return'] = output
+    if isinstance(output, dict) and not pulled:
+        node_data['__h_return'] = output
+        node_data['__unread'] = node_data['readers']
         
     if isinstance(output, str):
         for out_name, out_target, _ in node_data.get('outputs'):
             if output == out_name:
                 NODES_REG.get(node_id)['__next-flow'] = out_target
                 break
+
+    return output if isinstance(output, dict) else None
             
-def __run():
+def __run_once() -> int:
     _curr_node = ENTRY_ID
     
-    while _curr_node is not None:
-        try:
-            __execute(_curr_node)
-            
-        except EOFError as exit_code:
-            exit_code = int(str(exit_code))
-            
-            if exit_code == ExitCode.RESTART:
-                helpers.MemoryJar.new_jar()
-                __reset_state()
-                return __run()
-            
-            if exit_code == ExitCode.RESTART_SAVE_MEMORY:
-                __reset_state()
-                return __run()
-            
-            return exit(exit_code)
-        
-        except RuntimeError as error:
-            print(f"\nERROR: {error}")
-            exit(ExitCode.ERROR)
+    try:
+        while True:
+            while _curr_node is not None:
+                __execute(_curr_node)
+                __STEP_RETURNS.clear()
+                _curr_node = NODES_REG.get(_curr_node)['__next-flow']
+
+            if not __LOOPS:
+                return ExitCode.OK
+            _curr_node = __next_iteration()
+
+    except EOFError as exit_code:
+        return int(str(exit_code))
+    
+    except RecursionError:
+        print("\nERROR: Infinite recurrsion occured.")
+        return ExitCode.INF_RECURSION
+
+    except RuntimeError as error:
+        print(f"\nERROR: {error}")
+        return ExitCode.ERROR
+
+    except __LimitExceeded as limit:
+        print(f"\nERROR: {limit}")
+        __print_hottest()
+        return limit.exit_code
 
-        except RecursionError:
-            print("\nERROR: Infinite recurrsion occured.")
-            exit(ExitCode.INF_RECURSION)
+    except KeyboardInterrupt:
+        print("\nExecution manually terminated.")
+        return ExitCode.MANUAL_TERMINATION
 
-        except KeyboardInterrupt:
-            print("\nExecution manually terminated.")
-            return exit(ExitCode.MANUAL_TERMINATION)
+def __exit(exit_code: int):
+    helpers.MemoryJar.get_current().close()
+    return exit(exit_code)
+
+def __run_program() -> int:
+    """ Execute program until it exits (restarts included). Returns the exit code. """
+    run_count = 0
+    __reset_state()
+    __WATCH.update(executions=0, depth=0, counts={})
+    if WATCHDOG is not None and WATCHDOG[1] is not None:
+        __WATCH["deadline"] = perf_counter() + WATCHDOG[1]
+    
+    while True:
+        run_count += 1
+        exit_code = __run_once()
+        
+        if exit_code not in (ExitCode.RESTART, ExitCode.RESTART_SAVE_MEMORY):
+            return exit_code
+        
+        if MAX_RESTARTS is not None and run_count > MAX_RESTARTS:
+            print(f"\nERROR: Program has been restarted over {MAX_RESTARTS} times.")
+            return ExitCode.INF_RECURSION
         
-        _curr_node = NODES_REG.get(_curr_node)['__next-flow']
+        if exit_code == ExitCode.RESTART:
+            helpers.MemoryJar.get_current().clear()
+            
+        __reset_state()
+
+def __run():
+    for key in MEMORY_KEYS:
+        helpers.MemoryJar.resolve_key(key)
+
+    helpers.MemoryJar.persistent_path = environ.get("LIMBO_MEMORY_FILE", MEMORY_FILE)
+    if any(arg.startswith("--serve") for arg in argv[1:]):  # Server is imported only by it's mode (startup).
+        if not SERVER:
+            print("\nERROR: Program has been compiled without the --serve mode.")
+            return exit(ExitCode.ERROR)
+
+        from modules.execution import server
+        serve, socket_path = server.serve_address(argv[1:])
+        if serve:  # Resident, every request runs the program with a fresh memory jar.
+            program_server = server.ProgramServer(__run_program, server.SHARED_MEMORY_OPTION in argv)
+            return __exit(program_server.serve(socket_path))
+
+    try:
+        helpers.MemoryJar.new_jar()
+    except (OSError, ValueError, ImportError) as error:
+        print(f"\nERROR: Couldn't open the memory file: {error}")
+        return exit(ExitCode.ERROR)
+
+    return __exit(__run_program())
     
-__run()
+def __main():
+    try:
+        __run()
+
+    except BrokenPipeError:  # Output closed by the reader (like `| head`).
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        __exit(ExitCode.MANUAL_TERMINATION)
+
+__main()
@@ -1,39 +1,89 @@
 from modules.execution.exit_codes import ExitCode
+from modules.execution import analysis
+from modules.execution import profiler
+from modules.execution import watchdog
 from modules.execution import runtime
+from modules.execution import plan
+from modules.execution import jit
 from modules.execution import debug
 from modules.nodes import node
-from modules import terminal
 from modules import helpers
 from modules import style
-from modules import ui
 
 import time
+import sys
+import os
 
                 
 class NodeRunner:
-    MAX_RUN_COUNT = 100
-    run_count = 0
+    MAX_RESTARTS: int | None = None  # Opt-in restart budget. None means the program may restart indefinitely.
+    LIMITS: watchdog.WatchdogLimits | None = None  # Opt-in watchdog limits used if the runner has no own limits.
 
-    def __init__(self, start_node: node.Node, raw_nodes: list[node.Node], debug_mode: bool = False) -> None:
+    def __init__(
+        self,
+        start_node: node.Node,
+        raw_nodes: list[node.Node],
+        debug_mode: bool = False,
+        max_restarts: int | None = None,
+        use_jit: bool = True,
+        profile_path: str | None = None,
+        interactive: bool = True,
+        trace_path: str | None = None,
+        limits: watchdog.WatchdogLimits | None = None
+    ) -> None:
+        """
+        If `profile_path` is set, program is run by the RuntimeNode walker with ProfileSession and report is saved there.
+        Debug runs record the execution trace, which is displayed after the program ends.
+        If `trace_path` is set, program is run in debug mode and the whole trace is also saved to this file.
+        Non `interactive` runner doesn't take over the UI and returns right after the program ends (unattended runs).
+        It doesn't import the UI modules, so it can be used without a terminal (errors are written to the stderr).
+        Runs exceeding the watchdog `limits` are terminated with the limit's exit code and the hottest nodes report.
+        """
         self.start_node = start_node
-        self.raw_nodes = raw_nodes
-        self.debug_mode = debug_mode
-        self.dbg_session = debug.DebugSession() if debug_mode else None
+        self.raw_nodes = analysis.reachable_nodes(start_node, raw_nodes)
+        self.debug_mode = debug_mode or profile_path is not None or trace_path is not None
+        self.use_jit = use_jit
+        self.profile_path = profile_path
+        self.interactive = interactive
+        self.dbg_session = debug.DebugSession(spill_path=trace_path) if debug_mode or trace_path is not None else None
+        if profile_path is not None:
+            self.dbg_session = profiler.ProfileSession()
+        self.max_restarts = max_restarts if max_restarts is not None else NodeRunner.MAX_RESTARTS
+
+        limits = limits if limits is not None else NodeRunner.LIMITS
+        self.watchdog = watchdog.Watchdog(limits, len(self.raw_nodes)) if limits is not None and limits.enabled() else None
         
-        self.runtime_nodes: dict[int, runtime.RuntimeNode] = {}
+        self.runtime_nodes: dict[str, runtime.RuntimeNode] = {}
         self.start_time = time.time_ns()
-        self.initialize_nodes(start_node, raw_nodes)
+        self.initialize_nodes(start_node, self.raw_nodes)
+        self.debug_log(f"Pruned {style.highlight(str(len(raw_nodes) - len(self.raw_nodes)))} nodes unreachable from the Start.")
         helpers.MemoryJar.new_jar()
 
-        ui.SCREEN_BUSY = True
+        if interactive:
+            from modules import ui
+            ui.SCREEN_BUSY = True
         
     def debug_log(self, content: str) -> None:
         if self.debug_mode:
             self.dbg_session.write_msg(content)
 
     def initialize_nodes(self, start_node: node.Node, raw_nodes: list[node.Node]) -> None:
-        for raw_node in raw_nodes:
-            rt_node = runtime.RuntimeNode(raw_node, self.dbg_session)
+        """
+        Lower nodes into the flat execution plan and compile it with the JIT (if enabled and supported).
+        Debug runs use the RuntimeNode walker instead, as it reports each step to the debug session.
+        Only nodes reachable from the Start (see `analysis.reachable_nodes()`) are initialized.
+        """
+        if not self.debug_mode:
+            self.plan = plan.ExecutionPlan(start_node, raw_nodes)
+            self.jit_program = jit.compile_plan(self.plan, self.watchdog) if self.use_jit else None
+            if self.watchdog is not None:
+                self.plan.watch(self.watchdog)
+            return
+
+        self.registers = runtime.RuntimeRegisters(len(raw_nodes))
+        self.registers.watchdog = self.watchdog
+        for slot, raw_node in enumerate(raw_nodes):
+            rt_node = runtime.RuntimeNode(raw_node, slot, self.registers, self.dbg_session)
             self.runtime_nodes[raw_node.node_id] = rt_node
 
         for rt_node in self.runtime_nodes.values():
@@ -43,66 +93,229 @@ class NodeRunner:
         self.debug_log(f"Initialized {style.highlight(str(len(self.runtime_nodes)))} nodes.")
 
     def reset_values(self) -> None:
+        if not self.debug_mode:
+            return self.plan.reset()
+
         self.debug_log(f"Reset state for: {style.highlight(str(len(self.runtime_nodes)))} nodes.")
 
-        for rt_node in self.runtime_nodes.values():
-            rt_node.output_values = None
+        self.registers.reset()
             
-    def run(self):
-        NodeRunner.run_count += 1
-        self.debug_log(f"Starting program for the: {style.highlight(f'{NodeRunner.run_count} time.')}")
-        
-        if NodeRunner.run_count > NodeRunner.MAX_RUN_COUNT:
-            self.error_dump(None, f"Program has been restarted over {NodeRunner.MAX_RUN_COUNT} times. Automatically terminated infinite loop.")
-            return self.finish(ExitCode.INF_RECURSION)
+    def run(self) -> int:
+        """
+        Execute program until it exits. Restarts are handled iteratively, 
+        so the stack depth doesn't grow with the number of restarts.
+        """
+        run_count = 0
+        if self.watchdog is not None:
+            self.watchdog.start()
+            if not self.debug_mode and self.jit_program is not None:
+                self.jit_program.reset_counts()
+
+        while True:
+            run_count += 1
+            self.debug_log(f"Starting program for the: {style.highlight(f'{run_count} time.')}")
+
+            exit_code = self.run_once()
+            if exit_code not in (ExitCode.RESTART, ExitCode.RESTART_SAVE_MEMORY):
+                return self.finish(exit_code)
+
+            if self.max_restarts is not None and run_count > self.max_restarts:
+                self.error_dump(None, f"Program has been restarted over {self.max_restarts} times. Automatically terminated infinite loop.")
+                return self.finish(ExitCode.INF_RECURSION)
+
+            if exit_code == ExitCode.RESTART:
+                helpers.MemoryJar.get_current().clear()
+                self.debug_log("Restarting with new memory jar...")
+            else:
+                self.debug_log("Restarting but keeping the memory...")
+
+            self.reset_values()
+
+    def run_once(self) -> int:
+        """ Execute program from the entry node once. Returns exit code (restart codes included). """
+        if self.debug_mode:
+            return self.walk_once()
+
+        if self.jit_program is not None:
+            return self.run_jit_once()
+
+        if self.watchdog is not None:
+            return self.run_watched_once()
+
+        execute = self.plan.execute
+        end_step = self.plan.end_step
+        shared_slots = self.plan.shared_slots
+        loops = self.plan.loops
+        slot = self.plan.entry
+
+        try:
+            while True:
+                while slot != plan.NO_SLOT:
+                    slot = execute(slot)
+                    if shared_slots:
+                        end_step()
+
+                if not loops:
+                    break
+
+                slot = loops[-1][0]  # Flow of the loop's body ended.
+                slot = self.plan.next_iteration()
+
+        except (EOFError, RuntimeError, KeyboardInterrupt) as interruption:
+            return self.interruption_exit_code(interruption, self.plan.nodes[slot])
+
+        return ExitCode.OK
+
+    def run_watched_once(self) -> int:
+        """ Execute plan once counting the flow steps by the watchdog (amortised limits check). """
+        execute = self.plan.execute
+        end_step = self.plan.end_step
+        shared_slots = self.plan.shared_slots
+        program_watchdog = self.watchdog
+        counts = program_watchdog.counts
+        check = program_watchdog.check
+        loops = self.plan.loops
+        slot = self.plan.entry
+
+        try:
+            while True:
+                while slot != plan.NO_SLOT:
+                    program_watchdog.budget -= 1  # Shared with the pulls counted by the `enter()`.
+                    if program_watchdog.budget < 0:
+                        program_watchdog.budget = check(program_watchdog.budget)
+
+                    counts[slot] += 1
+                    slot = execute(slot)
+                    if shared_slots:
+                        end_step()
+
+                if not loops:
+                    break
+
+                program_watchdog.budget -= 1  # Iteration is counted as the loop node's execution.
+                if program_watchdog.budget < 0:
+                    program_watchdog.budget = check(program_watchdog.budget)
 
-        node = self.entry_node
+                slot = loops[-1][0]
+                counts[slot] += 1
+                slot = self.plan.next_iteration()
+
+        except (EOFError, RuntimeError, KeyboardInterrupt, watchdog.LimitExceeded) as interruption:
+            return self.interruption_exit_code(interruption, self.plan.nodes[slot])
+
+        finally:
+            program_watchdog.pause(program_watchdog.budget)
+
+        return ExitCode.OK
+
+    def run_jit_once(self) -> int:
+        """ Execute program once using the JIT-compiled function. """
+        try:
+            self.jit_program.run()
+
+        except (EOFError, RuntimeError, KeyboardInterrupt, watchdog.LimitExceeded) as interruption:
+            if self.watchdog is not None:
+                self.jit_program.collect_counts()
+
+            failed_slot = self.jit_program.failed_slot(interruption)
+            failed_node = self.plan.nodes[failed_slot] if failed_slot is not None else None
+            return self.interruption_exit_code(interruption, failed_node)
+
+        return ExitCode.OK
+
+    def walk_once(self) -> int:
+        """ Execute program once by walking the RuntimeNodes (used in debug mode). """
+        rt_node = self.entry_node
+        loops = self.registers.loops
+        program_watchdog = self.watchdog
+
+        while rt_node is not None or loops:
+            iterating = rt_node is None
+            if iterating:
+                rt_node = loops[-1][0]  # Flow of the loop's body ended.
 
-        while node:
             try:
-                node.execute()
+                if program_watchdog is not None:
+                    program_watchdog.budget -= 1
+                    if program_watchdog.budget < 0:
+                        program_watchdog.budget = program_watchdog.check(program_watchdog.budget)
+                    program_watchdog.counts[rt_node.slot] += 1
 
-            except EOFError as exit_code:
-                exit_code = int(exit_code.args[0])
+                if iterating:
+                    rt_node.continue_loop()
+                else:
+                    rt_node.execute()
 
-                if exit_code == ExitCode.RESTART:
-                    helpers.MemoryJar.new_jar()
-                    self.reset_values()
-                    self.debug_log("Restarting with new memory jar...")
-                    return self.run()
-                
-                if exit_code == ExitCode.RESTART_SAVE_MEMORY:
-                    self.reset_values()
-                    self.debug_log("Restarting but keeping the memory...")
-                    return self.run()
-                
-                return self.finish(exit_code)
+            except (EOFError, RuntimeError, KeyboardInterrupt, watchdog.LimitExceeded) as interruption:
+                self.dbg_session.unwind()
+                if program_watchdog is not None:
+                    program_watchdog.pause(program_watchdog.budget)
+                return self.interruption_exit_code(interruption, rt_node.node_model)
 
-            except RuntimeError as error:
-                self.error_dump(node, error)
-                return self.finish(ExitCode.ERROR)
+            if self.registers.shared_slots:
+                self.registers.end_step()
+            rt_node = rt_node.flow_next
 
-            except RecursionError:
-                self.error_dump(node, "Infinite recurrsion occured.")
-                return self.finish(ExitCode.INF_RECURSION)
+        if program_watchdog is not None:
+            program_watchdog.pause(program_watchdog.budget)
+        return ExitCode.OK
 
-            except KeyboardInterrupt:
-                self.error_dump(node, "Execution manually terminated.")
-                return self.finish(ExitCode.MANUAL_TERMINATION)
+    def interruption_exit_code(self, interruption: BaseException, node_model: node.Node | None) -> int:
+        """ Convert exception raised during node's execution into the exit code. """
+        if isinstance(interruption, EOFError):
+            return int(interruption.args[0])
 
-            node = node.flow_next
-            if node is None:
-                return self.finish(ExitCode.OK)
+        if isinstance(interruption, watchdog.LimitExceeded):
+            self.error_dump(node_model, f"{interruption}{self.hottest_report()}")
+            return interruption.exit_code
+
+        if isinstance(interruption, RecursionError):
+            self.error_dump(node_model, "Infinite recurrsion occured.")
+            return ExitCode.INF_RECURSION
+
+        if isinstance(interruption, RuntimeError):
+            self.error_dump(node_model, interruption)
+            return ExitCode.ERROR
+
+        self.error_dump(node_model, "Execution manually terminated.")
+        return ExitCode.MANUAL_TERMINATION
+
+    def hottest_report(self) -> str:
+        """ Most executed nodes counted by the watchdog. """
+        lines = [f"{executions:>12}  {style.node(self.raw_nodes[slot])}" for slot, executions in self.watchdog.hottest()]
+        return "\n\n    Hottest nodes (executions):\n" + "\n".join("    " + line for line in lines)
 
     def finish(self, exit_code: int) -> int:
-        NodeRunner.run_count = 0
+        if helpers.MemoryJar.current is not None:
+            helpers.MemoryJar.current.close()
         helpers.MemoryJar.current = None
 
+        is_tracing = isinstance(self.dbg_session, debug.DebugSession)
+        if is_tracing:
+            self.dbg_session.close()
+
+        if self.profile_path is not None:
+            self.save_profile()
+
+        if not self.interactive:
+            return exit_code
+
+        from modules import terminal
+        from modules import ui
+
+        if is_tracing:
+            for line in debug.TraceViewer(self.dbg_session.trace).render():
+                print(line)
+
         total_time_s = (time.time_ns() - self.start_time) / 1e9
         time_info = style.tcolor(str(total_time_s) + "s", style.AnsiFGColor.CYAN)
         exit_info = style.tcolor(str(exit_code), style.AnsiFGColor.RED if exit_code < 0 else style.AnsiFGColor.CYAN)
 
         print(f"\n{style.ITALIC}Program finished execution in {style.RESET}{time_info} {style.ITALIC}with exit code {style.RESET}{exit_info}")
+
+        if self.profile_path is not None:
+            self.print_profile()
+
         print(f"{style.key('enter')} to continue...")
         terminal.wait_for_enter()
 
@@ -110,13 +323,23 @@ class NodeRunner:
         ui.render_all()
         return exit_code
 
-    def error_dump(self, node: runtime.RuntimeNode | None, error: RuntimeError | str) -> None:
+    def save_profile(self) -> None:
+        self.dbg_session.export_speedscope(self.profile_path, os.path.basename(self.profile_path))
+
+    def print_profile(self) -> None:
+        print(f"\n{style.ITALIC}Profile saved to: {style.RESET}{style.highlight(self.profile_path)}\n")
+        for line in self.dbg_session.summary():
+            print("  " + line)
+        print()
+
+    def error_dump(self, node_model: node.Node | None, error: RuntimeError | str) -> None:
         content = style.tcolor("\n ERROR ", color=style.AnsiFGColor.WHITE, bg_color=style.AnsiBGColor.RED)
 
-        if node is None:
+        if node_model is None:
             content += f" Execution failed!"
         else:
-            content += f" Execution of node: {style.node(node.node_model)} failed!"
+            content += f" Execution of node: {style.node(node_model)} failed!"
 
-        print(content)
-        print("\n    " + str(error))
+        stream = sys.stdout if self.interactive else sys.stderr
+        print(content, file=stream)
+        print("\n    " + str(error), file=stream)
@@ -0,0 +1,463 @@
+from modules.execution.watchdog import Watchdog
+from modules.execution import plan
+from modules import thunks
+from modules import types
+
+from collections.abc import Callable
+from typing import Any
+import math
+import re
+
+
+JIT_FILENAME = "<limbo-jit>"
+MAX_SOURCE_LINES = 50_000
+STATE_ASSIGNMENT = re.compile(r"\b([vus]\d+) \^?= ")
+HANDLER_CALL = re.compile(r"\bh(\d+)\(")
+
+
+class JitUnsupported(Exception):
+    """ Raised when the graph cannot be lowered into Python code. Plan interpreter should be used instead. """
+
+
+class JitProgram:
+    """
+    Specialised Python function generated from the ExecutionPlan.
+
+    Flow nodes are emitted as straight-line code grouped into basic blocks.
+    Blocks are dispatched by the slot of their first node, only when the flow branches or merges.
+    Data pulls are inlined as handler calls with dict literals and results are kept
+    in local variables instead of the per-node output values.
+    Output of a node with many readers is evaluated once per flow step (`s<slot>` variable)
+    and the value kept from the flow execution tracks it's unread readers (`u<slot>` mask).
+    Lazy inputs are pulled by nested functions (`z<n>`) passed to the handler as thunks.
+
+    Loop node pushes (resumeKey, indexIterator) to the `F` stack and jumps to it's resume block
+    (dispatched by the negative key), which stores the next index in the `x<slot>` variable
+    and continues to the loop's body or, when the iterator is exhausted, after the loop.
+    When the flow ends and a loop is running, the innermost loop is resumed.
+
+    With the `watchdog`, every node execution is charged to the watchdog's countdown (`B`) before it runs, in the plan
+    interpreter's order (flow node before it's pulls), and blocks count their executions for the hottest nodes report.
+    Pull depth is bounded at the generation time.
+
+    Generated function raises the same exceptions as the plan interpreter (EOFError for exit codes),
+    use `failed_slot()` to get the node that raised it.
+    """
+
+    def __init__(self, execution_plan: plan.ExecutionPlan, watchdog: Watchdog | None = None) -> None:
+        self.plan = execution_plan
+        self.watchdog = watchdog
+        self.block_counts = [0] * len(execution_plan.nodes) * 2  # Executions of the blocks by the leader's slot (resume blocks after them).
+        self.block_calls: dict[int, list[int]] = {}  # Slots of the handlers called by the block.
+        self.constants: list[Any] = []
+        self.lines: list[str] = []
+        self.line_slots: list[int] = []
+        self.temp_count = 0
+        self.cache_state: dict[tuple[int, int], bool] = {}  # Statically known state of cached values per (slot, reader) in the current block.
+        self.step_state: dict[int, bool] = {}  # Shared values evaluated in the current step (None if only in some branches).
+
+        self.reachable = self.flow_reachable()
+        self.dynamic = {slot for slot in self.reachable if self.is_dynamic(slot)}
+        self.cached = self.cached_data_nodes()
+        self.leaders = self.block_leaders()
+        self.loop_slots = [slot for slot in sorted(self.reachable) if self.plan.loop_nodes[slot]]
+
+        self.source = self.generate()
+        namespace = {"Thunk": thunks.Thunk, "LoopInput": thunks.LoopInput}
+        exec(compile(self.source, JIT_FILENAME, "exec"), namespace)
+        self.function = namespace["__jit_program"]
+
+    def run(self) -> None:
+        self.function(self.plan.handlers, self.constants, self.watchdog, self.block_counts)
+
+    def reset_counts(self) -> None:
+        self.block_counts = [0] * len(self.plan.nodes) * 2
+
+    def collect_counts(self) -> None:
+        """ Add executions of the blocks' handlers to the watchdog's counts. """
+        for leader, calls in self.block_calls.items():
+            for slot in calls:
+                self.watchdog.counts[slot] += self.block_counts[leader]
+        self.reset_counts()
+
+    def failed_slot(self, error: BaseException) -> int | None:
+        """ Find slot of the node which raised the error based on the generated code's line. """
+        slot = None
+        traceback = error.__traceback__
+
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == JIT_FILENAME:
+                slot = self.line_slots[traceback.tb_lineno - 1]
+            traceback = traceback.tb_next
+
+        return slot
+
+    def is_branching(self, slot: int) -> bool:
+        """ Node may return a flow pointer name (has Flow type outputs like If/Else). """
+        return any(raw_output.data_type == types.FLOW for raw_output in self.plan.nodes[slot].outputs)
+
+    def is_dynamic(self, slot: int) -> bool:
+        """ Next node is known only after the handler's call. """
+        _, _, _, is_flow_node, _, branches = self.plan.records[slot]
+        if is_flow_node:
+            return bool(branches)
+        return self.is_branching(slot)
+
+    def successors(self, slot: int) -> list[int]:
+        _, _, _, _, next_flow, branches = self.plan.records[slot]
+        return [next_flow, *branches.values()] if slot in self.dynamic else [next_flow]
+
+    def flow_reachable(self) -> list[int]:
+        reachable = []
+        to_visit = [self.plan.entry]
+
+        while to_visit:
+            slot = to_visit.pop()
+            if slot == plan.NO_SLOT or slot in reachable:
+                continue
+
+            reachable.append(slot)
+            _, _, _, _, next_flow, branches = self.plan.records[slot]
+            to_visit.extend([next_flow, *branches.values()])
+
+        return reachable
+
+    def cached_data_nodes(self) -> set[int]:
+        """ Data nodes executed in flow whose output value might be pulled later. """
+        pulled = {src_slot for pulls in self.all_pulls() for _, src_slot, _, _ in pulls}
+        return {
+            slot for slot in self.reachable
+            if slot in pulled and not self.plan.flow_nodes[slot] and slot not in self.dynamic
+        }
+
+    def all_pulls(self) -> list[tuple[tuple[str, int, str, int], ...]]:
+        return self.plan.pulls + self.plan.lazy_pulls
+
+    def block_leaders(self) -> set[int]:
+        leaders = {self.plan.entry}
+        predecessors = {slot: 0 for slot in self.reachable}
+
+        for slot in self.reachable:
+            if slot in self.dynamic:
+                leaders.update(target for target in self.successors(slot) if target != plan.NO_SLOT)
+                continue
+
+            next_flow = self.plan.next_flow[slot]
+            if next_flow != plan.NO_SLOT:
+                predecessors[next_flow] += 1
+
+        leaders.update(slot for slot, count in predecessors.items() if count != 1)
+        return leaders
+
+    def is_shared(self, slot: int) -> bool:
+        """ Node's output is read by many inputs. """
+        return self.plan.readers[slot] > 1
+
+    def reader_bits(self, slot: int) -> list[int]:
+        return [1 << index for index in range(self.plan.readers[slot].bit_length())]
+
+    def emit(self, line: str, slot: int, indent: int) -> None:
+        self.lines.append("    " * indent + line)
+        self.line_slots.append(slot)
+
+        if len(self.lines) > MAX_SOURCE_LINES:
+            raise JitUnsupported(f"Generated code exceeds {MAX_SOURCE_LINES} lines.")
+
+    def literal(self, value: Any) -> str:
+        if type(value) in (str, bool, int) or (type(value) is float and math.isfinite(value)):
+            return repr(value)
+
+        self.constants.append(value)
+        return f"K[{len(self.constants) - 1}]"
+
+    def new_temp(self) -> str:
+        self.temp_count += 1
+        return f"t{self.temp_count}"
+
+    def emit_inputs(self, slot: int, indent: int, pull_stack: tuple[int, ...]) -> str:
+        """ Emit statements pulling node's inputs (in the plan's order). Returns handler's input dict literal. """
+        pulls, lazy_pulls = self.plan.pulls[slot], self.plan.lazy_pulls[slot]
+        pulled_names = {name for name, _, _, _ in pulls + lazy_pulls}
+        items = [f"{name!r}: {self.literal(value)}" for name, value in self.plan.inputs[slot].items() if name not in pulled_names]
+
+        for name, src_slot, src_name, reader in pulls:
+            items.append(f"{name!r}: {self.emit_pull(src_slot, src_name, reader, indent, pull_stack)}")
+
+        thunk = "LoopInput" if self.plan.loop_nodes[slot] else "Thunk"
+        for name, src_slot, src_name, reader in lazy_pulls:  # After the eager pulls, thunks are called by the handler.
+            items.append(f"{name!r}: {thunk}({self.emit_lazy_pull(src_slot, src_name, reader, indent, pull_stack, thunk == 'LoopInput')})")
+
+        return "{" + ", ".join(items) + "}"
+
+    def emit_lazy_pull(self, src_slot: int, src_name: str, reader: int, indent: int, pull_stack: tuple[int, ...], repeated: bool = False) -> str:
+        """ Emit nested function pulling the lazy input. Returns it's name. `repeated` function knows nothing about the current step. """
+        self.temp_count += 1
+        thunk = f"z{self.temp_count}"
+        self.emit(f"def {thunk}():", src_slot, indent)
+        body_start = len(self.lines)
+
+        pulled = []
+        if repeated:
+            cache_state, step_state = self.cache_state, self.step_state
+            self.cache_state, self.step_state = {}, {}
+            pulled.append(self.emit_pull(src_slot, src_name, reader, indent + 1, pull_stack))
+            self.cache_state, self.step_state = cache_state, step_state
+        else:
+            self.emit_branch(lambda: pulled.append(self.emit_pull(src_slot, src_name, reader, indent + 1, pull_stack)))
+        self.emit(f"return {pulled[0]}", src_slot, indent + 1)
+
+        assigned = sorted(set(STATE_ASSIGNMENT.findall("\n".join(self.lines[body_start:]))))
+        if self.watchdog is not None:
+            assigned.append("B")
+        if assigned:
+            self.lines.insert(body_start, "    " * (indent + 1) + "nonlocal " + ", ".join(assigned))
+            self.line_slots.insert(body_start, src_slot)
+
+        return thunk
+
+    def emit_pull(self, src_slot: int, src_name: str, reader: int, indent: int, pull_stack: tuple[int, ...]) -> str:
+        """ Emit statements evaluating output of pulled node into a temporary variable. Returns it's name. """
+        if src_slot in pull_stack:
+            raise JitUnsupported(f"Data wires cycle at node: {self.plan.nodes[src_slot].title}")
+
+        if self.plan.loop_nodes[src_slot]:  # Current index.
+            return f"x{src_slot}"
+
+        temp = self.new_temp()
+        is_cached = self.cache_state.get((src_slot, reader)) if src_slot in self.cached else False
+        consume = f"u{src_slot} ^= {reader}" if self.is_shared(src_slot) else f"v{src_slot} = None"
+
+        if is_cached:
+            self.emit(f"{temp} = v{src_slot}.get({src_name!r}); {consume}", src_slot, indent)
+            self.cache_state[(src_slot, reader)] = False
+            return temp
+
+        if is_cached is None:
+            condition = f"u{src_slot} & {reader}" if self.is_shared(src_slot) else f"v{src_slot} is not None"
+            self.emit(f"if {condition}:", src_slot, indent)
+            self.emit(f"{temp} = v{src_slot}.get({src_name!r}); {consume}", src_slot, indent + 1)
+            self.emit("else:", src_slot, indent)
+
+            self.emit_branch(lambda: self.emit_evaluation(src_slot, src_name, temp, indent + 1, pull_stack))
+            self.cache_state[(src_slot, reader)] = False
+            return temp
+
+        self.emit_evaluation(src_slot, src_name, temp, indent, pull_stack)
+        return temp
+
+    def emit_branch(self, emit_statements: Callable[[], None]) -> None:
+        """ Emit conditionally executed statements. Forget the static state they changed (changed only in one of the branches). """
+        cache_before = dict(self.cache_state)
+        step_before = dict(self.step_state)
+        emit_statements()
+
+        for key in set(cache_before) | set(self.cache_state):
+            if cache_before.get(key) != self.cache_state.get(key):
+                self.cache_state.pop(key, None)
+
+        for slot in set(step_before) | set(self.step_state):
+            if step_before.get(slot) != self.step_state.get(slot):
+                self.step_state[slot] = None
+
+    def emit_evaluation(self, src_slot: int, src_name: str, temp: str, indent: int, pull_stack: tuple[int, ...]) -> None:
+        max_pull_depth = self.watchdog.limits.max_pull_depth if self.watchdog is not None else None
+        if max_pull_depth is not None and len(pull_stack) > max_pull_depth:
+            raise JitUnsupported(f"Pull depth exceeds the watchdog limit at node: {self.plan.nodes[src_slot].title}")
+
+        if self.plan.flow_nodes[src_slot]:
+            self.emit_charge(src_slot, indent)
+            args = self.emit_inputs(src_slot, indent, pull_stack + (src_slot,))
+            return self.emit(f"h{src_slot}({args}); {temp} = None", src_slot, indent)
+
+        if not self.is_shared(src_slot):
+            self.emit_charge(src_slot, indent)
+            args = self.emit_inputs(src_slot, indent, pull_stack + (src_slot,))
+            return self.emit(f"{temp} = (h{src_slot}({args}) or EMPTY).get({src_name!r})", src_slot, indent)
+
+        evaluated = self.step_state.get(src_slot, False)
+        if evaluated is None:
+            self.emit(f"if s{src_slot} is None:", src_slot, indent)
+            self.emit_branch(lambda: self.emit_shared_evaluation(src_slot, indent + 1, pull_stack))
+
+        elif not evaluated:
+            self.emit_shared_evaluation(src_slot, indent, pull_stack)
+
+        self.emit(f"{temp} = s{src_slot}.get({src_name!r})", src_slot, indent)
+        if evaluated is None:
+            self.step_state[src_slot] = None
+
+    def emit_shared_evaluation(self, src_slot: int, indent: int, pull_stack: tuple[int, ...]) -> None:
+        """ Evaluate node into the `s<slot>` variable shared by it's readers until the end of the flow step. """
+        self.emit_charge(src_slot, indent)
+        args = self.emit_inputs(src_slot, indent, pull_stack + (src_slot,))
+        self.emit(f"s{src_slot} = h{src_slot}({args}) or EMPTY", src_slot, indent)
+        self.step_state[src_slot] = True
+
+    def emit_charge(self, slot: int, indent: int) -> None:
+        """ Charge node's execution to the watchdog's countdown (limits are checked when it runs out). """
+        if self.watchdog is not None:
+            self.emit("B -= 1", slot, indent)
+            self.emit("if B < 0: B = W.check(B)", slot, indent)
+
+    def emit_step_end(self, slot: int, indent: int) -> None:
+        """ Drop values shared within the flow step. """
+        if self.step_state:
+            self.emit("; ".join(f"s{shared} = None" for shared in sorted(self.step_state)), slot, indent)
+        self.step_state = {}
+
+    def emit_step(self, slot: int, indent: int) -> None:
+        """ Emit flow node's execution. Dynamic nodes also set the next `slot`. """
+        self.step_state = {}
+        self.emit_charge(slot, indent)
+        args = self.emit_inputs(slot, indent, (slot,))
+        next_flow = self.plan.next_flow[slot]
+
+        if self.plan.loop_nodes[slot]:
+            self.emit(f"F.append(({self.resume_key(slot)}, iter(h{slot}({args}))))", slot, indent)
+            self.emit_step_end(slot, indent)
+            return self.emit(f"slot = {self.resume_key(slot)}", slot, indent)
+
+        if slot not in self.dynamic:
+            if slot in self.cached:
+                unread = f"; u{slot} = {self.plan.readers[slot]}" if self.is_shared(slot) else ""
+                self.emit(f"v{slot} = h{slot}({args}) or EMPTY{unread}", slot, indent)
+                self.cache_state.update({(slot, reader): True for reader in self.reader_bits(slot)})
+            else:
+                self.emit(f"h{slot}({args})", slot, indent)
+            return self.emit_step_end(slot, indent)
+
+        self.emit(f"r = h{slot}({args})", slot, indent)
+        self.emit_step_end(slot, indent)
+
+        if self.plan.flow_nodes[slot]:
+            self.emit(f"slot = {next_flow} if r is None else b{slot}.get(r, {next_flow})", slot, indent)
+        else:
+            self.emit(f"slot = b{slot}.get(r, {plan.NO_SLOT}) if r.__class__ is str else {next_flow}", slot, indent)
+
+    def emit_block(self, leader: int, indent: int) -> None:
+        block_start = len(self.lines)
+        self.emit_block_body(leader, indent)
+        if self.watchdog is None:
+            return
+
+        calls = [int(called) for line in self.lines[block_start:] for called in HANDLER_CALL.findall(line)]
+        self.block_calls[leader] = calls
+
+        self.lines.insert(block_start, "    " * indent + f"C[{leader}] += 1")
+        self.line_slots.insert(block_start, leader)
+
+    def emit_block_body(self, leader: int, indent: int) -> None:
+        emitted = set()
+        slot = leader
+        self.cache_state = {}
+
+        while True:
+            emitted.add(slot)
+            self.emit_step(slot, indent)
+
+            if slot in self.dynamic:
+                break
+
+            next_flow = self.plan.next_flow[slot]
+            if next_flow == plan.NO_SLOT:
+                return self.emit("break" if self.loop_slots else "return", slot, indent)
+
+            if next_flow in self.leaders or next_flow in emitted:
+                self.emit(f"slot = {next_flow}", slot, indent)
+                break
+
+            slot = next_flow
+
+        self.emit("continue", leader, indent)
+
+    def resume_key(self, slot: int) -> int:
+        """ Dispatch key of the loop's resume block (negative, can't collide with the slots and NO_SLOT). """
+        return -2 - slot
+
+    def emit_resume_block(self, slot: int, indent: int) -> None:
+        """ Emit block advancing the loop started by the node. """
+        branches = self.plan.branches[slot]
+        body, done = branches.get(plan.LOOP_BODY, plan.NO_SLOT), branches.get(plan.LOOP_DONE, plan.NO_SLOT)
+
+        if self.watchdog is not None:  # Iteration is counted as the loop node's execution.
+            counter = len(self.plan.nodes) + slot
+            self.block_calls[counter] = [slot]
+            self.emit(f"B -= 1; C[{counter}] += 1", slot, indent)
+            self.emit("if B < 0: B = W.check(B)", slot, indent)
+
+        self.emit("n = next(F[-1][1], EMPTY)", slot, indent)
+        self.emit("if n is EMPTY:", slot, indent)
+        self.emit(f"F.pop(); slot = {done}", slot, indent + 1)
+        self.emit("else:", slot, indent)
+        self.emit(f"x{slot} = n; slot = {body}", slot, indent + 1)
+        self.emit("continue", slot, indent)
+
+    def generate(self) -> str:
+        entry = self.plan.entry
+
+        self.emit("def __jit_program(H, K, W, C):", entry, 0)
+        self.emit("EMPTY = {}", entry, 1)
+
+        used_handlers = set(self.reachable)
+        for pulls in self.all_pulls():
+            used_handlers.update(src_slot for _, src_slot, _, _ in pulls)
+
+        for slot in sorted(used_handlers):
+            self.emit(f"h{slot} = H[{slot}]", slot, 1)
+
+        for slot in sorted(self.dynamic):
+            self.emit(f"b{slot} = {self.plan.branches[slot]!r}", slot, 1)
+
+        for slot in sorted(self.cached):
+            self.emit(f"v{slot} = None", slot, 1)
+            if self.is_shared(slot):
+                self.emit(f"u{slot} = 0", slot, 1)
+
+        for slot in sorted(used_handlers):
+            if self.plan.loop_nodes[slot]:
+                self.emit(f"x{slot} = None", slot, 1)
+            elif self.is_shared(slot) and not self.plan.flow_nodes[slot]:
+                self.emit(f"s{slot} = None", slot, 1)
+
+        self.emit(f"slot = {entry}", entry, 1)
+        indent = 1
+        if self.loop_slots:
+            self.emit("F = []", entry, 1)
+        if self.watchdog is not None:
+            self.emit("B = 0", entry, 1)
+            self.emit("try:", entry, 1)
+            indent = 2
+        if self.loop_slots:
+            self.emit("while True:", entry, indent)
+            indent += 1
+
+        self.emit(f"while slot != {plan.NO_SLOT}:", entry, indent)
+
+        for leader in sorted(self.leaders, key=lambda slot: (slot != entry, slot)):
+            self.emit(f"if slot == {leader}:", leader, indent + 1)
+            self.emit_block(leader, indent + 2)
+
+        for slot in self.loop_slots:
+            self.emit(f"if slot == {self.resume_key(slot)}:", slot, indent + 1)
+            self.emit_resume_block(slot, indent + 2)
+
+        self.emit('raise RuntimeError(f"JIT: no code block for slot: {slot}")', entry, indent + 1)
+
+        if self.loop_slots:  # Flow ended, resume the innermost loop.
+            self.emit("if not F:", entry, indent)
+            self.emit("return", entry, indent + 1)
+            self.emit("slot = F[-1][0]", entry, indent)
+
+        if self.watchdog is not None:
+            self.emit("finally:", entry, 1)
+            self.emit("W.pause(B)", entry, 2)
+
+        return "\n".join(self.lines) + "\n"
+
+
+def compile_plan(execution_plan: plan.ExecutionPlan, watchdog: Watchdog | None = None) -> JitProgram | None:
+    """ Generate and compile JitProgram. Returns None if graph is not supported by the JIT. """
+    try:
+        return JitProgram(execution_plan, watchdog)
+    except (JitUnsupported, SyntaxError, RecursionError, MemoryError):
+        return None
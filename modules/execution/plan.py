@@ -0,0 +1,306 @@
+from modules.execution.watchdog import Watchdog
+from modules.execution import analysis
+from modules.nodes import source
+from modules.nodes import node
+from modules import helpers
+from modules import thunks
+from modules import types
+
+from collections.abc import Callable, Iterator
+from functools import partial
+from typing import Any
+
+
+NO_SLOT = -1
+MISSING = object()  # Kept output value which wasn't returned by the handler.
+NO_VALUE = object()  # Empty register (None is a valid output value).
+LOOP_BODY = "body"  # Flow output of the loop node followed for every index value.
+LOOP_DONE = "done"  # Flow output of the loop node followed after the loop.
+
+
+class ExecutionPlan:
+    """
+    Flat, slot-indexed lowering of the nodes graph used by the interpreter's hot loop.
+
+    Every node gets an integer slot. All per-node data (handler, constant inputs,
+    wired inputs and flow successors) is resolved once at load time and stored
+    in lists indexed by the slot, so the execution does no name lookups.
+
+    Tables (indexed by slot):
+        handlers     - node's handler function.
+        inputs       - handler's input dict prefilled with the constant (and folded) inputs,
+                       reused by every execution (wired inputs are overwritten).
+        pulls        - ((inputName, sourceSlot, sourceOutputName, readerBit), ...) wired data inputs.
+        lazy_pulls   - wired lazy inputs (same format), passed to the handler as thunks.
+        flow_nodes   - True if node's handler returns a flow pointer instead of values.
+        next_flow    - default successor slot (NO_SLOT to exit).
+        branches     - {outputName: targetSlot} used when handler returns a flow pointer name.
+        readers      - mask of all reader bits (one bit per target of node's data output).
+        output_names - name of node's data output (nodes have at most one).
+        loop_nodes   - True if node's handler returns an iterator of index values (For range, While).
+
+    Registers (indexed by slot, preallocated, so the execution allocates no per-node containers):
+        values       - output value of the node executed in flow, kept until read by every reader.
+        unread       - mask of readers that haven't read the kept value yet.
+        shared       - output value of the node evaluated on request (pulled) with many readers,
+                       shared by them within the current flow step (NO_VALUE if not evaluated).
+                       Slots listed in `shared_slots` are cleared by `end_step()`, called by the runner.
+
+    Nodes evaluated on request don't replace the kept value.
+
+    Loop node starts the loop (pushed to the `loops` stack) and follows it's body for the first index value.
+    When the flow ends and a loop is running, the runner continues it with `next_iteration()`.
+    Current index is stored as the loop node's shared value (readable by any reader, not cleared by `end_step()`),
+    lazy inputs of the loop node are re-pulled on every read (`thunks.LoopInput`).
+
+    The static tables are also zipped into `records` so the hot loop fetches
+    all of the node's data with a single index. Handlers of the nodes with lazy
+    inputs and loop nodes are wrapped in the records (see `lazy_handler()` and `loop_handler()`).
+
+    Inputs wired to constant-only subgraphs of pure nodes are folded into constants at load time.
+    Constant keys of the memory nodes are resolved to the MemoryJar slots, these nodes use the factory's `slot_handler`.
+    """
+
+    def __init__(self, start_node: node.Node, raw_nodes: list[node.Node]) -> None:
+        self.nodes = raw_nodes
+        self.slots: dict[str, int] = {raw_node.node_id: slot for slot, raw_node in enumerate(raw_nodes)}
+
+        self.handlers: list[Callable[[dict[str, Any]], Any]] = []
+        self.inputs: list[dict[str, Any]] = []
+        self.pulls: list[tuple[tuple[str, int, str, int], ...]] = []
+        self.lazy_pulls: list[tuple[tuple[str, int, str, int], ...]] = []
+        self.flow_nodes: list[bool] = []
+        self.next_flow: list[int] = []
+        self.branches: list[dict[str, int]] = []
+        self.readers: list[int] = []
+        self.output_names: list[str | None] = []
+        self.loop_nodes: list[bool] = []
+        self.folded = analysis.fold_constants(raw_nodes)
+        self.empty: dict = {}  # Shared by the nodes without inputs or branches.
+
+        for raw_node in raw_nodes:
+            self.lower_node(raw_node)
+
+        self.values: list[Any] = [None] * len(raw_nodes)
+        self.unread: list[int] = [0] * len(raw_nodes)
+        self.shared: list[Any] = [NO_VALUE] * len(raw_nodes)
+        self.shared_slots: list[int] = []
+        self.loops: list[tuple[int, Iterator[Any]]] = []  # Running loops (loopSlot, indexIterator), innermost last.
+        self.reset_loops()
+
+        handlers = [self.lazy_handler(slot) if self.lazy_pulls[slot] else handler for slot, handler in enumerate(self.handlers)]
+        handlers = [self.loop_handler(slot, handler) if self.loop_nodes[slot] else handler for slot, handler in enumerate(handlers)]
+        self.records = list(zip(handlers, self.inputs, self.pulls, self.flow_nodes, self.next_flow, self.branches))
+        self.entry = self.slots[start_node.node_id]
+
+    def is_planned(self, raw_source: source.NodeInput | None) -> bool:
+        """ Source is connected to the node of the program (pruned nodes are skipped as if not connected). """
+        return raw_source is not None and raw_source.node.node_id in self.slots
+
+    def slot_of(self, raw_node: node.Node, as_source_of: node.Node) -> int:
+        slot = self.slots.get(raw_node.node_id)
+        if slot is None:
+            raise RuntimeError(f"Expected planned node of hash: {raw_node.node_id} connected with {as_source_of.title}")
+        return slot
+
+    def lower_node(self, raw_node: node.Node) -> None:
+        constants = {}
+        pulls = []
+        lazy_pulls = []
+
+        for raw_input in raw_node.inputs:
+            if raw_input.data_type == types.FLOW:
+                continue
+
+            output_source = raw_input.source
+            if output_source is None:
+                if raw_input.constant_value is not None:
+                    constants[raw_input.name] = raw_input.constant_value
+                continue
+
+            folded_value = analysis.folded_input_value(raw_input, self.folded)
+            if folded_value is not None:
+                constants[raw_input.name] = folded_value
+                continue
+
+            reader = 1 << next(index for index, target in enumerate(output_source.targets) if target is raw_input)
+            pull = (raw_input.name, self.slot_of(output_source.node, raw_node), output_source.name, reader)
+            if raw_input.lazy:
+                lazy_pulls.append(pull)
+            else:
+                pulls.append(pull)
+
+        branches = {}
+        readers_count = 0
+        output_name = None
+        for raw_output in raw_node.outputs:
+            if self.is_planned(raw_output.target):
+                branches[raw_output.name] = self.slot_of(raw_output.target.node, raw_node)
+
+            if raw_output.data_type != types.FLOW:
+                readers_count += len(raw_output.targets)
+                output_name = raw_output.name
+
+        next_flow = NO_SLOT
+        if raw_node.flow.enable_output and self.is_planned(raw_node.flow.output_src.target):
+            next_flow = self.slot_of(raw_node.flow.output_src.target.node, raw_node)
+
+        is_loop = raw_node.factory.loop
+        if next_flow == NO_SLOT and branches and not is_loop:
+            next_flow = next(iter(branches.values()))
+
+        handler = raw_node.handler
+        memory_key = analysis.constant_memory_key(raw_node, self.folded)
+        if memory_key is not None:
+            constants[analysis.MEMORY_SLOT] = helpers.MemoryJar.resolve_key(memory_key)
+            handler = raw_node.factory.slot_handler
+
+        self.handlers.append(handler)
+        self.inputs.append(constants if constants or pulls or lazy_pulls else self.empty)
+        self.pulls.append(tuple(pulls))
+        self.lazy_pulls.append(tuple(lazy_pulls))
+        self.flow_nodes.append(raw_node.factory.flow.enable_output)
+        self.next_flow.append(next_flow)
+        self.branches.append(branches or self.empty)
+        self.readers.append((1 << readers_count) - 1)
+        self.output_names.append(output_name)
+        self.loop_nodes.append(is_loop)
+
+    def watch(self, watchdog: Watchdog) -> None:
+        """ Count pulled evaluations (and their depth) by the watchdog. """
+        evaluate = self.evaluate
+
+        def watched_evaluate(slot: int) -> Any:
+            watchdog.enter(slot)
+            try:
+                return evaluate(slot)
+            finally:
+                watchdog.leave()
+
+        self.evaluate = watched_evaluate
+
+    def lazy_handler(self, slot: int) -> Callable[[dict[str, Any]], Any]:
+        """ Wrap node's handler to pass it's lazy inputs as thunks pulling the source when read. """
+        handler = self.handlers[slot]
+        lazy_pulls = self.lazy_pulls[slot]
+        thunk = thunks.LoopInput if self.loop_nodes[slot] else thunks.Thunk
+        pull = self.pull
+
+        def call_lazy(ins: dict[str, Any]) -> Any:
+            for name, src_slot, src_name, reader in lazy_pulls:
+                ins[name] = thunk(partial(pull, src_slot, src_name, reader))
+            return handler(ins)
+
+        return call_lazy
+
+    def loop_handler(self, slot: int, handler: Callable[[dict[str, Any]], Any]) -> Callable[[dict[str, Any]], str]:
+        """ Wrap loop node's handler to start the loop. Returns name of the flow output to follow. """
+        loops = self.loops
+
+        def start_loop(ins: dict[str, Any]) -> str:
+            loops.append((slot, iter(handler(ins))))
+            return self.iterate()
+
+        return start_loop
+
+    def iterate(self) -> str:
+        """ Advance the innermost loop. Returns name of the loop node's flow output to follow. """
+        slot, iterator = self.loops[-1]
+        index = next(iterator, NO_VALUE)
+        if index is NO_VALUE:
+            self.loops.pop()
+            return LOOP_DONE
+
+        self.shared[slot] = index
+        return LOOP_BODY
+
+    def next_iteration(self) -> int:
+        """ Continue the innermost loop after the flow of it's body ended. Returns slot of the next node. """
+        slot = self.loops[-1][0]
+        next_slot = self.branches[slot].get(self.iterate(), NO_SLOT)
+        if self.shared_slots:
+            self.end_step()
+        return next_slot
+
+    def reset_loops(self) -> None:
+        """ Drop running loops, index of the loop which hasn't run is None. """
+        self.loops.clear()
+        for slot, is_loop in enumerate(self.loop_nodes):
+            if is_loop:
+                self.shared[slot] = None
+
+    def reset(self) -> None:
+        """ Drop all not consumed output values. """
+        self.values = [None] * len(self.nodes)
+        self.unread = [0] * len(self.nodes)
+        self.shared = [NO_VALUE] * len(self.nodes)
+        self.shared_slots.clear()
+        self.reset_loops()
+
+    def end_step(self) -> None:
+        """ Drop values shared within the flow step. """
+        shared = self.shared
+        for slot in self.shared_slots:
+            shared[slot] = NO_VALUE
+        self.shared_slots.clear()
+
+    def pull(self, slot: int, src_name: str, reader: int) -> Any:
+        """ Read output value of the node at given slot by the reader. Evaluates the node if there is no value left for it. """
+        unread = self.unread[slot]
+
+        if unread & reader:
+            value = self.values[slot]
+            if value is MISSING:
+                raise RuntimeError(f"Requested output resource: <{src_name}> from evaluated node: {self.nodes[slot].title} is missing.")
+
+            unread ^= reader
+            self.unread[slot] = unread
+            if not unread:
+                self.values[slot] = None
+            return value
+
+        value = self.shared[slot]
+        if value is not NO_VALUE:
+            return value
+
+        output = self.evaluate(slot)
+        if self.flow_nodes[slot] or isinstance(output, str):
+            return None
+
+        value = output.get(src_name) if output else None
+        if self.readers[slot] > 1:
+            self.shared[slot] = value
+            self.shared_slots.append(slot)
+        return value
+
+    def evaluate(self, slot: int) -> Any:
+        """ Call node's handler with pulled inputs. Returns raw handler's output. """
+        handler, ins, pulls, _, _, _ = self.records[slot]
+
+        for name, src_slot, src_name, reader in pulls:
+            ins[name] = self.pull(src_slot, src_name, reader)
+
+        return handler(ins)
+
+    def execute(self, slot: int) -> int:
+        """ Execute node at given slot. Returns slot of the next node in flow (or NO_SLOT). """
+        handler, ins, pulls, is_flow_node, next_flow, branches = self.records[slot]
+
+        for name, src_slot, src_name, reader in pulls:
+            ins[name] = self.pull(src_slot, src_name, reader)
+
+        output = handler(ins)
+
+        if is_flow_node:
+            if output is None:
+                return next_flow
+            return branches.get(output, next_flow)
+
+        if isinstance(output, str):  # Next flow pointer name.
+            return branches.get(output, NO_SLOT)
+
+        readers = self.readers[slot]
+        if readers:
+            self.values[slot] = output.get(self.output_names[slot], MISSING) if output else MISSING
+            self.unread[slot] = readers
+        return next_flow
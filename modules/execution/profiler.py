@@ -0,0 +1,140 @@
+from modules import style
+
+from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass
+import json
+import time
+
+if TYPE_CHECKING:
+    from modules.execution.runtime import RuntimeNode, RuntimeSourcePtr
+    from modules import types
+
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+@dataclass
+class NodeStats:
+    title: str
+    calls: int = 0
+    flow_calls: int = 0
+    pull_calls: int = 0
+    inclusive_ns: int = 0
+    exclusive_ns: int = 0
+
+
+class ProfileSession:
+    """
+    Records per node execution statistics. Implements the DebugSession's hook points,
+    so it is driven by the RuntimeNode walker in the same way as the debugger.
+
+    Execution is a `pull` if it was requested by other node's input, otherwise it's a `flow` step.
+    Exclusive time is stored per unique stack of nodes and exported as a speedscope (sampled) profile.
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, NodeStats] = {}
+        self.stack: list[list] = []  # [nodeID, startNs, childrenNs]
+        self.stacks_time: dict[tuple[str, ...], int] = {}
+        self.pending_pull = False
+
+    def write_msg(self, msg: str) -> None:
+        return
+
+    def begin_execution(self, rt_node: "RuntimeNode") -> None:
+        node_id = rt_node.node_model.node_id
+
+        stats = self.stats.get(node_id)
+        if stats is None:
+            stats = self.stats[node_id] = NodeStats(rt_node.node_model.title)
+
+        stats.calls += 1
+        if self.pending_pull:
+            stats.pull_calls += 1
+        else:
+            stats.flow_calls += 1
+
+        self.pending_pull = False
+        self.stack.append([node_id, time.perf_counter_ns(), 0])
+
+    def request_value(self, name: str, pointer: "RuntimeSourcePtr") -> None:
+        self.pending_pull = True
+
+    def received_value(self, name: str, value: Any, datatype: "types.DataType") -> None:
+        self.pending_pull = False
+
+    def use_constant(self, name: str, value: Any, datatype: "types.DataType") -> None:
+        return
+
+    def point_next_node(self, next: "RuntimeNode | None") -> None:
+        return
+
+    def node_output(self, values: dict) -> None:
+        return
+
+    def end_execution(self) -> None:
+        node_id, start_ns, children_ns = self.stack.pop()
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        exclusive_ns = elapsed_ns - children_ns
+
+        stats = self.stats[node_id]
+        stats.exclusive_ns += exclusive_ns
+        if not any(frame[0] == node_id for frame in self.stack):  # Don't count recursive calls twice.
+            stats.inclusive_ns += elapsed_ns
+
+        stack_key = tuple(frame[0] for frame in self.stack) + (node_id,)
+        self.stacks_time[stack_key] = self.stacks_time.get(stack_key, 0) + exclusive_ns
+
+        if self.stack:
+            self.stack[-1][2] += elapsed_ns
+
+    def unwind(self) -> None:
+        """ Close all executions interrupted by an exception (exit, restart, error). """
+        while self.stack:
+            self.end_execution()
+
+        self.pending_pull = False
+
+    def frame_name(self, node_id: str) -> str:
+        return f"{self.stats[node_id].title} ({node_id[:8]})"
+
+    def export_speedscope(self, path: str, name: str) -> None:
+        """ Save recorded stacks as a speedscope sampled profile (weights are exclusive times). """
+        frames_index = {node_id: index for index, node_id in enumerate(self.stats)}
+        samples = [[frames_index[node_id] for node_id in stack] for stack in self.stacks_time]
+        weights = list(self.stacks_time.values())
+
+        content = {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {"frames": [{"name": self.frame_name(node_id)} for node_id in self.stats]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "activeProfileIndex": 0,
+            "exporter": "limbo",
+        }
+
+        with open(path, "w") as file:
+            json.dump(content, file)
+
+    def summary(self, limit: int = 10) -> list[str]:
+        """ Returns printable table of the nodes with the highest exclusive time. """
+        lines = [f"{'node':<32} {'calls':>8} {'flow':>8} {'pull':>8} {'incl ms':>10} {'excl ms':>10}"]
+        hottest = sorted(self.stats, key=lambda node_id: self.stats[node_id].exclusive_ns, reverse=True)
+
+        for node_id in hottest[:limit]:
+            stats = self.stats[node_id]
+            lines.append(
+                f"{self.frame_name(node_id):<32} {stats.calls:>8} {stats.flow_calls:>8} {stats.pull_calls:>8} "
+                f"{stats.inclusive_ns / 1e6:>10.3f} {stats.exclusive_ns / 1e6:>10.3f}"
+            )
+
+        lines[0] = style.tcolor(lines[0], styles=[style.AnsiStyle.BOLD])
+        return lines
@@ -1,135 +1,269 @@
+from modules.execution.watchdog import Watchdog
 from modules.execution.debug import DebugSession
+from modules.execution import plan
 from modules.nodes import node
+from modules import thunks
 from modules import types
 from modules import style
 
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class RuntimeSourcePtr:
     src_name: str
     rt_node: "RuntimeNode"
+    reader: int = 0  # Reader's bit in the source node's readers mask.
+    lazy: bool = False  # Pulled when the handler reads the input (passed as a thunk).
+
+
+class RuntimeRegisters:
+    """
+    Output values of all RuntimeNodes of the program, preallocated and indexed by the node's slot.
+
+        values  - output value of the node executed in flow, kept until read by every reader (target input).
+        unread  - mask of readers that haven't read the kept value yet.
+        shared  - output value of the node evaluated on request with many readers, shared by them
+                  within the current flow step (plan.NO_VALUE if not evaluated, cleared by `end_step()`).
+                  Current index of the loop node (None before the loop runs, not cleared by `end_step()`).
+        loops   - running loops (loopNode, indexIterator), innermost last.
+    """
+    __slots__ = ("values", "unread", "shared", "shared_slots", "watchdog", "loops", "loop_slots")
+
+    def __init__(self, size: int) -> None:
+        self.values: list[Any] = [None] * size
+        self.unread: list[int] = [0] * size
+        self.shared: list[Any] = [plan.NO_VALUE] * size
+        self.shared_slots: list[int] = []
+        self.watchdog: Watchdog | None = None  # Counts the pulled evaluations if set.
+        self.loops: list[tuple[RuntimeNode, Iterator[Any]]] = []
+        self.loop_slots: list[int] = []
+
+    def end_step(self) -> None:
+        shared = self.shared
+        for slot in self.shared_slots:
+            shared[slot] = plan.NO_VALUE
+        self.shared_slots.clear()
+
+    def reset(self) -> None:
+        size = len(self.values)
+        self.values = [None] * size
+        self.unread = [0] * size
+        self.shared = [plan.NO_VALUE] * size
+        self.shared_slots.clear()
+        self.loops.clear()
+        for slot in self.loop_slots:
+            self.shared[slot] = None
 
 
 class RuntimeNode:
-    def __init__(self, node_model: node.Node, debug_session: DebugSession | None = None) -> None:
+    """
+    Node of the walker used by the debug and profile runs. Output values are stored in the shared `registers`
+    at the node's `slot`, node's input dict is allocated once and reused by every execution.
+    Loop node's handler starts the loop (see `ExecutionPlan` for the loops semantics).
+    """
+    __slots__ = (
+        "node_model", "name", "handler", "dbg_session", "registers", "slot", "flow_next",
+        "in_sources", "out_sources", "ins", "readers", "output_name", "is_flow_node", "is_loop_node"
+    )
+
+    def __init__(self, node_model: node.Node, slot: int, registers: RuntimeRegisters, debug_session: DebugSession | None = None) -> None:
         self.node_model = node_model
         self.name = node_model.title
         self.handler = node_model.handler
         self.dbg_session = debug_session
+        self.registers = registers
+        self.slot = slot
 
         self.flow_next = None
-        self.in_sources: dict[str, RuntimeSourcePtr] = {}
+        self.in_sources: tuple[tuple[str, RuntimeSourcePtr | Any, types.DataType], ...] = ()
         self.out_sources: dict[str, RuntimeSourcePtr] = {}
-        self.output_values: dict[str, Any] | None = None
+        self.ins: dict[str, Any] = {}
+        self.readers = 0
+        self.output_name: str | None = None
+        self.is_flow_node = node_model.factory.flow.enable_output
+        self.is_loop_node = node_model.factory.loop
+
+        if self.is_loop_node:
+            self.handler = self.start_loop
+            registers.loop_slots.append(slot)
+            registers.shared[slot] = None
 
-    def initialize(self, all_nodes: dict[int, "RuntimeNode"]) -> None:
+    def initialize(self, all_nodes: dict[str, "RuntimeNode"]) -> None:
+        in_sources = []
         for raw_input in self.node_model.inputs:
             if raw_input.data_type == types.FLOW:
                 continue
-            
+
             output_source = raw_input.source
             if output_source is None:
                 if raw_input.constant_value is not None:
-                    self.in_sources[raw_input.name] = raw_input.constant_value
+                    in_sources.append((raw_input.name, raw_input.constant_value, raw_input.data_type))
                 continue
 
             rt_output_node = all_nodes.get(output_source.node.node_id)
             if rt_output_node is None:
                 raise RuntimeError(f"Expected initialized Runtime node of hash: {output_source.node.node_id} as input source for {self.name}")
 
-            self.in_sources[raw_input.name] = RuntimeSourcePtr(output_source.name, rt_output_node)
+            reader = 1 << next(index for index, target in enumerate(output_source.targets) if target is raw_input)
+            pointer = RuntimeSourcePtr(output_source.name, rt_output_node, reader, raw_input.lazy)
+            in_sources.append((raw_input.name, pointer, raw_input.data_type))
 
-        for raw_output in self.node_model.outputs:
-            input_target = raw_output.target
-            if input_target is None:
-                continue
+        self.in_sources = tuple(in_sources)
 
-            rt_input_node = all_nodes.get(input_target.node.node_id)
-            if rt_input_node is None:
-                raise RuntimeError(f"Expected initialized Runtime node of hash: {input_target.node.node_id} as output target for {self.name}")
+        for raw_output in self.node_model.outputs:
+            if raw_output.data_type != types.FLOW:
+                self.readers = (1 << len(raw_output.targets)) - 1
+                self.output_name = raw_output.name
 
-            self.out_sources[raw_output.name] = RuntimeSourcePtr(input_target.name, rt_input_node)
+            # Flow continues to the first target. Targets not initialized (pruned) are not connected.
+            if raw_output.target is not None and raw_output.target.node.node_id in all_nodes:
+                self.out_sources[raw_output.name] = RuntimeSourcePtr(raw_output.target.name, all_nodes[raw_output.target.node.node_id])
 
         if self.node_model.flow.enable_output:
             if self.node_model.flow.output_src.target is not None:
                 self.flow_next = all_nodes.get(self.node_model.flow.output_src.target.node.node_id)
 
         if self.flow_next is None and self.out_sources:
-            self.flow_next = list(self.out_sources.values())[0].rt_node
+            self.flow_next = next(iter(self.out_sources.values())).rt_node
+
+    def request_output_value(self, src_name: str, reader: int) -> Any:
+        """ Read output value by the reader. Evaluates the node if there is no value left for it. """
+        registers = self.registers
+        slot = self.slot
+        unread = registers.unread[slot]
 
-    def request_output_value(self, src_name: str) -> Any:
-        if self.output_values is not None:
-            if src_name not in self.output_values:
+        if unread & reader:
+            value = registers.values[slot]
+            if value is plan.MISSING:
                 raise RuntimeError(f"Requested output resource: <{src_name}> from evaluated node: {style.node(self.node_model)} is missing.")
 
-            output = self.output_values.get(src_name)
-            self.output_values = None
-            return output
+            unread ^= reader
+            registers.unread[slot] = unread
+            if not unread:
+                registers.values[slot] = None
+            return value
 
-        self.execute()
-        
-        if self.output_values is not None:
-            value = self.output_values.get(src_name)
-            self.output_values = None
+        value = registers.shared[slot]
+        if value is not plan.NO_VALUE:
             return value
 
-    def execute(self) -> None:
-        ins = {}
+        watchdog = registers.watchdog
+        if watchdog is None:
+            output = self.execute(pulled=True)
+        else:
+            watchdog.enter(slot)
+            try:
+                output = self.execute(pulled=True)
+            finally:
+                watchdog.leave()
 
-        if self.dbg_session:
-            self.dbg_session.begin_execution(self)
+        if output is None:
+            return None
 
-        for name, pointer in self.in_sources.items():
-            datatype = self.node_model.get_input_src(name).data_type
-            
-            if isinstance(pointer, RuntimeSourcePtr):
-                if self.dbg_session:
-                    self.dbg_session.request_value(name, pointer)
+        value = output.get(src_name)
+        if self.readers > 1:
+            registers.shared[slot] = value
+            registers.shared_slots.append(slot)
+        return value
+
+    def pull_input(self, name: str, pointer: RuntimeSourcePtr, datatype: types.DataType) -> Any:
+        """ Request value of the wired input. """
+        dbg_session = self.dbg_session
+        if dbg_session:
+            dbg_session.request_value(name, pointer)
+
+        value = pointer.rt_node.request_output_value(pointer.src_name, pointer.reader)
+
+        if dbg_session:
+            dbg_session.received_value(name, value, datatype)
+        return value
 
-                ins[name] = pointer.rt_node.request_output_value(pointer.src_name)
-                
-                if self.dbg_session:
-                    self.dbg_session.received_value(name, ins[name], datatype)
+    def execute(self, pulled: bool = False) -> dict[str, Any] | None:
+        """ Execute node's handler. Returns output values (None for flow pointers). Values of `pulled` node are not kept. """
+        ins = self.ins
+        dbg_session = self.dbg_session
+
+        if dbg_session:
+            dbg_session.begin_execution(self)
+
+        for name, pointer, datatype in self.in_sources:
+            if isinstance(pointer, RuntimeSourcePtr):
+                if pointer.lazy:
+                    thunk = thunks.LoopInput if self.is_loop_node else thunks.Thunk
+                    ins[name] = thunk(partial(self.pull_input, name, pointer, datatype))
+                else:
+                    ins[name] = self.pull_input(name, pointer, datatype)
 
             else:
                 ins[name] = pointer  # Constant.
-                
-                if self.dbg_session:
-                    self.dbg_session.use_constant(name, ins[name], datatype)
 
-        if self.node_model.factory.flow.enable_output:
+                if dbg_session:
+                    dbg_session.use_constant(name, ins[name], datatype)
+
+        if self.is_flow_node:
             next_src = self.out_sources.get(self.handler(ins))
             if next_src is not None:
                 self.flow_next = next_src.rt_node
-                
-            if self.dbg_session:
-                self.dbg_session.point_next_node(self.flow_next)
-                self.dbg_session.end_execution()
 
-        else:
-            self.output_values = self.handler(ins) or {}
-
-            if self.dbg_session:
-                self.dbg_session.node_output(self.output_values)
-
-            if isinstance(self.output_values, str):  # Next flow pointer name.
-                next_flow_name = self.output_values
-                
-                if next_flow_name not in self.out_sources:
-                    self.flow_next = None
-                    return
-                
-                self.flow_next = self.out_sources[next_flow_name].rt_node
-                
-                if self.dbg_session:
-                    self.dbg_session.point_next_node(self.flow_next)
-                    
-            elif self.dbg_session:
-                self.dbg_session.point_next_node(self.flow_next)
-                    
-            if self.dbg_session:
-                self.dbg_session.end_execution()
-                
\ No newline at end of file
+            if dbg_session:
+                dbg_session.point_next_node(self.flow_next)
+                dbg_session.end_execution()
+            return None
+
+        output = self.handler(ins) or {}
+
+        if dbg_session:
+            dbg_session.node_output(output)
+
+        if isinstance(output, str):  # Next flow pointer name.
+            next_flow_name = output
+
+            if next_flow_name not in self.out_sources:
+                self.flow_next = None
+
+                if dbg_session:
+                    dbg_session.point_next_node(None)
+                    dbg_session.end_execution()
+                return None
+
+            self.flow_next = self.out_sources[next_flow_name].rt_node
+
+            if dbg_session:
+                dbg_session.point_next_node(self.flow_next)
+                dbg_session.end_execution()
+            return None
+
+        if not pulled and self.readers:
+            self.registers.values[self.slot] = output.get(self.output_name, plan.MISSING)
+            self.registers.unread[self.slot] = self.readers
+
+        if dbg_session:
+            dbg_session.point_next_node(self.flow_next)
+            dbg_session.end_execution()
+
+        return output
+
+    def start_loop(self, ins: dict[str, Any]) -> str:
+        """ Handler of the loop node. Returns name of the flow output to follow. """
+        self.registers.loops.append((self, iter(self.node_model.handler(ins))))
+        return self.iterate()
+
+    def iterate(self) -> str:
+        """ Advance the innermost loop (started by this node). Returns name of the flow output to follow. """
+        registers = self.registers
+        index = next(registers.loops[-1][1], plan.NO_VALUE)
+        if index is plan.NO_VALUE:
+            registers.loops.pop()
+            return plan.LOOP_DONE
+
+        registers.shared[self.slot] = index
+        return plan.LOOP_BODY
+
+    def continue_loop(self) -> None:
+        """ Continue the innermost loop (started by this node) after the flow of it's body ended. """
+        next_src = self.out_sources.get(self.iterate())
+        self.flow_next = next_src.rt_node if next_src is not None else None
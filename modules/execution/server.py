@@ -0,0 +1,143 @@
+"""
+Server mode of the compiled programs: `program --serve` reads requests from the stdin,
+`program --serve=PATH` listens on the Unix socket. The program stays resident, so it's startup
+is paid once for all the requests.
+
+Requests and responses are newline-delimited JSON:
+    {"id": 1, "inputs": ["+", "2", "3"]}       (or just the list of inputs)
+    {"id": 1, "exit_code": 0, "outputs": ["5"], "error": "..."}       (error only if the run reported one)
+
+Inputs are consumed by the Input nodes in order (the run ends with INPUT_CLOSED when they run out),
+Output nodes' lines are collected into the response. Every request runs with a fresh memory jar, the program's
+memory file is used only with `--shared-memory` (requests then resume the state left by the previous ones).
+Requests are served one at a time (connections of the socket too), use the watchdog limits to bound their runs.
+"""
+
+from modules.execution.exit_codes import ExitCode
+from modules import runtime_io
+from modules import helpers
+
+from typing import Callable, TextIO
+import socketserver
+import contextlib
+import json
+import sys
+import io
+import os
+
+
+SERVE_OPTION = "--serve"
+SHARED_MEMORY_OPTION = "--shared-memory"
+
+
+def serve_address(argv: list[str]) -> tuple[bool, str | None]:
+    """ Returns (serve, socketPath) of the program's command line arguments. """
+    for index, arg in enumerate(argv):
+        if arg == SERVE_OPTION:
+            path = argv[index + 1] if index + 1 < len(argv) and not argv[index + 1].startswith("-") else None
+            return True, path
+
+        if arg.startswith(SERVE_OPTION + "="):
+            return True, arg.removeprefix(SERVE_OPTION + "=")
+
+    return False, None
+
+
+class ProgramServer:
+    """ Answers the requests by running the program (`run_program()` executes it once, restarts included, returns the exit code). """
+
+    def __init__(self, run_program: Callable[[], int], shared_memory: bool = False) -> None:
+        """ Server with the `shared_memory` runs the requests with the program's persistent memory jar (if it has one). """
+        self.run_program = run_program
+        self.shared_memory = shared_memory
+
+    def respond(self, line: str) -> str:
+        """ Run the request's line. Returns the response's line (without the newline). """
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            return json.dumps({"exit_code": int(ExitCode.ERROR), "outputs": [], "error": f"Invalid request: {error}"})
+
+        if isinstance(request, list):
+            request = {"inputs": request}
+
+        inputs = request.get("inputs", []) if isinstance(request, dict) else None
+        if not isinstance(inputs, list) or any(isinstance(value, (dict, list)) for value in inputs):
+            return json.dumps({"exit_code": int(ExitCode.ERROR), "outputs": [], "error": "Invalid request: inputs must be a list of values."})
+
+        program_io = runtime_io.ScriptedIO([str(value) for value in inputs])
+        runtime_io.ProgramIO.current = program_io
+        reported = io.StringIO()
+
+        with contextlib.redirect_stdout(reported):  # Errors are reported by the runner's prints.
+            try:
+                self.new_jar()
+                exit_code = self.run_program()
+            except (OSError, ValueError, ImportError) as error:
+                print(f"ERROR: Couldn't open the memory file: {error}")
+                exit_code = ExitCode.ERROR
+
+        response = {"exit_code": int(exit_code), "outputs": program_io.outputs}
+        if "id" in request:
+            response["id"] = request["id"]
+        if reported.getvalue().strip():
+            response["error"] = reported.getvalue().strip()
+
+        return json.dumps(response)
+
+    def new_jar(self) -> None:
+        """ Memory jar of the request's run. """
+        if self.shared_memory:
+            return helpers.MemoryJar.new_jar()
+
+        if helpers.MemoryJar.current is not None:
+            helpers.MemoryJar.current.close()
+        helpers.MemoryJar.current = helpers.MemoryJar()
+
+    def serve_stream(self, reader: TextIO, writer: TextIO) -> None:
+        """ Answer the requests until the reader ends. """
+        for line in reader:
+            if not line.strip():
+                continue
+
+            writer.write(self.respond(line) + "\n")
+            writer.flush()
+
+    def serve_socket(self, path: str) -> None:
+        """ Answer the requests of the Unix socket's connections (until interrupted). """
+        if os.path.exists(path):
+            os.remove(path)  # Stale socket of the previous server.
+
+        server = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+                writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+                server.serve_stream(reader, writer)
+
+        with socketserver.UnixStreamServer(path, RequestHandler) as unix_server:
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.remove(path)
+
+    def serve(self, socket_path: str | None = None) -> int:
+        """ Serve the stdin or the socket. Returns the process exit code. """
+        try:
+            if socket_path is None:
+                self.serve_stream(sys.stdin, sys.stdout)
+            else:
+                self.serve_socket(socket_path)
+
+        except KeyboardInterrupt:
+            return ExitCode.OK
+
+        except BrokenPipeError:  # Handled by the program (like the output of a one-shot run).
+            raise
+
+        except (OSError, AttributeError) as error:  # AttributeError: no Unix sockets on the platform.
+            print(f"\nERROR: Couldn't serve the requests: {error}", file=sys.stderr)
+            return ExitCode.ERROR
+
+        return ExitCode.OK
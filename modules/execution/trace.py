@@ -0,0 +1,191 @@
+from typing import BinaryIO, Generator
+from enum import IntEnum
+import struct
+import time
+
+
+DEFAULT_CAPACITY = 65_536
+NO_REF = 0xFFFFFFFF
+
+FILE_HEADER = b"LIMBTRACE2\0"
+NODE_BLOCK = b"N"
+EVENTS_BLOCK = b"E"
+PAYLOAD_BLOCK = b"V"
+
+# nodeIndex (u32), kind (u8), valueRef (u64), timestamp ns since the start (u64).
+EVENT = struct.Struct("<IBQQ")
+BLOCK_HEADER = struct.Struct("<I")
+# valueRef (u64), number of fields (u32). Each field follows as length (u32) and text.
+PAYLOAD_HEADER = struct.Struct("<QI")
+
+
+class EventKind(IntEnum):
+    MESSAGE = 0
+    BEGIN = 1
+    REQUEST = 2
+    RECEIVED = 3
+    CONSTANT = 4
+    NEXT = 5
+    OUTPUT = 6
+    END = 7
+    UNWIND = 8
+
+
+class TraceBuffer:
+    """
+    Bounded ring of compact binary events. Only the last `capacity` events are kept in memory.
+
+    Event refers to the node by it's index in the `node_labels` table and to the payload
+    (raw values, formatted only when viewed) by the reference number.
+    If `spill_path` is set, events are also appended to the file before being overwritten,
+    so the file contains the whole trace (see `read_trace()`).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spill_path: str | None = None) -> None:
+        self.capacity = capacity
+        self.events = bytearray(capacity * EVENT.size)
+        self.payloads: list[tuple | None] = [None] * capacity
+        self.count = 0
+        self.payloads_count = 0
+        self.node_labels: list[str] = []
+        self.node_indexes: dict[str, int] = {}
+        self.start_ns = time.perf_counter_ns()
+
+        self.spill_file: BinaryIO | None = None
+        self.spilled_events = 0
+        self.spilled_nodes = 0
+        if spill_path is not None:
+            self.spill_file = open(spill_path, "wb")
+            self.spill_file.write(FILE_HEADER)
+
+    @property
+    def dropped(self) -> int:
+        """ Number of the oldest events no longer available in memory. """
+        return max(0, self.count - self.capacity)
+
+    def add_node(self, node_id: str, label: str) -> int:
+        """ Register node in the nodes table. Returns it's index. """
+        index = self.node_indexes[node_id] = len(self.node_labels)
+        self.node_labels.append(label)
+        return index
+
+    def record(self, kind: EventKind, node_index: int = NO_REF, payload: tuple | None = None) -> None:
+        value_ref = NO_REF
+        if payload is not None:
+            value_ref = self.payloads_count
+            self.payloads[value_ref % self.capacity] = payload
+            self.payloads_count += 1
+
+        position = self.count % self.capacity
+        EVENT.pack_into(self.events, position * EVENT.size, node_index, kind, value_ref, time.perf_counter_ns() - self.start_ns)
+        self.count += 1
+
+        if self.spill_file is not None and self.count - self.spilled_events == self.capacity:
+            self.spill()
+
+    def iter_events(self) -> Generator[tuple[int, int, int, int], None, None]:
+        """ Yields (nodeIndex, kind, valueRef, timestamp) of the events kept in memory (oldest first). """
+        for sequence in range(self.dropped, self.count):
+            yield EVENT.unpack_from(self.events, (sequence % self.capacity) * EVENT.size)
+
+    def payload(self, value_ref: int) -> tuple | None:
+        if value_ref == NO_REF or value_ref < self.payloads_count - self.capacity:
+            return None
+        return self.payloads[value_ref % self.capacity]
+
+    def node_label(self, node_index: int) -> str | None:
+        if node_index == NO_REF:
+            return None
+        return self.node_labels[node_index]
+
+    def spill(self) -> None:
+        """ Append events recorded since the last spill (with their nodes and payloads) to the file. """
+        for index in range(self.spilled_nodes, len(self.node_labels)):
+            label = self.node_labels[index].encode()
+            self.spill_file.write(NODE_BLOCK + BLOCK_HEADER.pack(index) + BLOCK_HEADER.pack(len(label)) + label)
+        self.spilled_nodes = len(self.node_labels)
+
+        events = [EVENT.unpack_from(self.events, (sequence % self.capacity) * EVENT.size) for sequence in range(self.spilled_events, self.count)]
+        self.spill_file.write(EVENTS_BLOCK + BLOCK_HEADER.pack(len(events)))
+        for event in events:
+            self.spill_file.write(EVENT.pack(*event))
+
+        for _, _, value_ref, _ in events:
+            if value_ref == NO_REF:
+                continue
+
+            fields = [str(value).encode() for value in self.payload(value_ref)]
+            self.spill_file.write(PAYLOAD_BLOCK + PAYLOAD_HEADER.pack(value_ref, len(fields)))
+            for field in fields:
+                self.spill_file.write(BLOCK_HEADER.pack(len(field)) + field)
+
+        self.spilled_events = self.count
+
+    def close(self) -> None:
+        if self.spill_file is not None:
+            self.spill()
+            self.spill_file.close()
+            self.spill_file = None
+
+
+class TraceFile:
+    """ Trace read from the spill file. Provides the same view interface as the TraceBuffer. """
+
+    def __init__(self, node_labels: list[str], events: list[tuple[int, int, int, int]], payloads: dict[int, tuple]) -> None:
+        self.node_labels = node_labels
+        self.events = events
+        self.payloads = payloads
+        self.dropped = 0
+
+    def iter_events(self) -> Generator[tuple[int, int, int, int], None, None]:
+        yield from self.events
+
+    def payload(self, value_ref: int) -> tuple | None:
+        return self.payloads.get(value_ref)
+
+    def node_label(self, node_index: int) -> str | None:
+        if node_index == NO_REF:
+            return None
+        return self.node_labels[node_index]
+
+
+def read_trace(path: str) -> TraceFile:
+    """ Read trace spilled by the TraceBuffer. Payload values are read as text. Raises ValueError if file is invalid. """
+    node_labels: dict[int, str] = {}
+    events: list[tuple[int, int, int, int]] = []
+    payloads: dict[int, tuple] = {}
+
+    with open(path, "rb") as file:
+        if file.read(len(FILE_HEADER)) != FILE_HEADER:
+            raise ValueError(f"Not a trace file: {path}")
+
+        def read_exact(size: int) -> bytes:
+            data = file.read(size)
+            if len(data) != size:
+                raise ValueError(f"Unexpected end of trace file: {path}")
+            return data
+
+        while block := file.read(1):
+            if block == NODE_BLOCK:
+                index, = BLOCK_HEADER.unpack(read_exact(BLOCK_HEADER.size))
+                length, = BLOCK_HEADER.unpack(read_exact(BLOCK_HEADER.size))
+                node_labels[index] = read_exact(length).decode()
+
+            elif block == EVENTS_BLOCK:
+                count, = BLOCK_HEADER.unpack(read_exact(BLOCK_HEADER.size))
+                data = read_exact(count * EVENT.size)
+                events.extend(EVENT.iter_unpack(data))
+
+            elif block == PAYLOAD_BLOCK:
+                value_ref, count = PAYLOAD_HEADER.unpack(read_exact(PAYLOAD_HEADER.size))
+                fields = []
+                for _ in range(count):
+                    length, = BLOCK_HEADER.unpack(read_exact(BLOCK_HEADER.size))
+                    fields.append(read_exact(length).decode())
+                payloads[value_ref] = tuple(fields)
+
+            else:
+                raise ValueError(f"Invalid trace block: {block!r}")
+
+    labels = [node_labels.get(index, "?") for index in range(max(node_labels, default=-1) + 1)]
+    return TraceFile(labels, events, payloads)
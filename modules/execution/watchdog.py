@@ -0,0 +1,107 @@
+from modules.execution.exit_codes import ExitCode
+
+from dataclasses import dataclass
+import time
+
+
+CHECK_INTERVAL = 4096  # Executions between the limit checks (the clock is read only there).
+HOTTEST_COUNT = 5
+
+
+@dataclass
+class WatchdogLimits:
+    """ Limits of the program's run (None disables the limit). Counted from the start, restarts included. """
+    max_executions: int | None = None  # Node executions (flow steps and pulled evaluations).
+    timeout: float | None = None  # Wall-clock seconds.
+    max_pull_depth: int | None = None  # Nested pulled evaluations.
+
+    def enabled(self) -> bool:
+        return self.max_executions is not None or self.timeout is not None or self.max_pull_depth is not None
+
+    def as_tuple(self) -> tuple[int | None, float | None, int | None]:
+        return (self.max_executions, self.timeout, self.max_pull_depth)
+
+
+class LimitExceeded(Exception):
+    """ Raised by the Watchdog when a limit is exceeded. """
+
+    def __init__(self, exit_code: ExitCode, message: str) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class Watchdog:
+    """
+    Enforces the WatchdogLimits and counts the executions of every node (slot) for the hottest nodes report.
+
+    Executions are counted with a countdown: each execution decrements the budget returned by `check()`
+    and `check(budget)` is called once it drops below zero, before the execution. The runner reports
+    the remaining budget with `pause(budget)` when it stops.
+    Pulled evaluations are wrapped with `enter()` / `leave()`, which also track the pull depth. Runners using
+    them keep the countdown in the `budget` attribute (decremented by both), the JIT's code in a local variable.
+    Executions limit is checked by `check()` only, the budget shrinks when getting close to it,
+    so every runner stops before the execution exceeding the limit.
+    """
+
+    def __init__(self, limits: WatchdogLimits, size: int) -> None:
+        self.limits = limits
+        self.counts = [0] * size
+        self.executions = 0
+        self.depth = 0
+        self.granted = 0
+        self.budget = 0  # Countdown of the runners counting the pulled evaluations by `enter()`.
+        self.deadline_ns: int | None = None
+
+    def start(self) -> None:
+        """ Reset the counters and start the clock. """
+        self.counts = [0] * len(self.counts)
+        self.executions = 0
+        self.depth = 0
+        self.granted = 0
+        self.budget = 0
+
+        if self.limits.timeout is not None:
+            self.deadline_ns = time.perf_counter_ns() + int(self.limits.timeout * 1e9)
+
+    def check(self, budget: int = -1) -> int:
+        """ Account executions since the last check (the current one included). Returns the budget until the next check. """
+        self.executions += self.granted - budget
+        self.granted = 0
+        max_executions = self.limits.max_executions
+
+        if max_executions is not None and self.executions > max_executions:
+            raise LimitExceeded(ExitCode.EXECUTIONS_LIMIT, f"Program exceeded the limit of {max_executions} node executions.")
+
+        if self.deadline_ns is not None and time.perf_counter_ns() > self.deadline_ns:
+            raise LimitExceeded(ExitCode.TIMEOUT, f"Program exceeded the time limit of {self.limits.timeout}s.")
+
+        self.granted = CHECK_INTERVAL
+        if max_executions is not None:  # Half of the rest.
+            self.granted = min(CHECK_INTERVAL, (max_executions - self.executions + 1) // 2)
+        return self.granted
+
+    def pause(self, budget: int) -> None:
+        """ Account executions of the stopped runner. """
+        self.executions += self.granted - max(budget, 0)
+        self.granted = self.budget = 0
+
+    def enter(self, slot: int) -> None:
+        """ Count pulled evaluation of the node in the `budget` countdown, check the pull depth. """
+        self.budget -= 1
+        if self.budget < 0:
+            self.budget = self.check(self.budget)
+
+        self.counts[slot] += 1
+        self.depth += 1
+
+        max_pull_depth = self.limits.max_pull_depth
+        if max_pull_depth is not None and self.depth > max_pull_depth:
+            raise LimitExceeded(ExitCode.PULL_DEPTH_LIMIT, f"Program exceeded the limit of {max_pull_depth} nested data pulls.")
+
+    def leave(self) -> None:
+        self.depth -= 1
+
+    def hottest(self, count: int = HOTTEST_COUNT) -> list[tuple[int, int]]:
+        """ Returns [(slot, executions), ...] of the most executed nodes. """
+        executed = [(slot, executions) for slot, executions in enumerate(self.counts) if executions]
+        return sorted(executed, key=lambda item: item[1], reverse=True)[:count]
@@ -1,10 +1,11 @@
-from modules.status_bar import status_bar
+from modules.messages import messages
 from modules.nodes.node import Node
 from modules.nodes import factory
 from modules.nodes import source
 
 from modules import measure
 from modules import style
+from modules import types
 
 
 def read_until_seq(data: bytes | None, end_seq: bytes) -> tuple[bytes, bytes] | tuple[None, None]:
@@ -27,7 +28,8 @@ class LimbFormat:
     
     LIMB\0  (header)
     \\CAM10,20  (camera position 10,20)
-    \\NIsStandard,NodeID,factory,x,y\0\ONodeID/srcOut\>NodeID/srcIn\0\0\Cconstant  (each node)
+    \\NIsStandard,NodeID,factory,x,y\0\\ONodeID/srcOut\\>NodeID/srcIn\0\0\\Cconstant  (each node)
+    (output wired to many inputs is saved as multiple \\W wires, in the connection order)
     \\EOF
     """
     FILE_HEADER = b"LIMB\0"
@@ -39,7 +41,7 @@ class LimbFormat:
 
     VAL_SEP = b","
     SEP = b"\n"
-    PTR = b"\>"
+    PTR = b"\\>"
     END = b"\0"
     EOF = b"\\EOF"
     FALSE = b"F"
@@ -97,13 +99,13 @@ class _Importer:
                 self.unattached_consts.append(constant_data)
         
         except BufferError:
-            return status_bar.error(f"Parsing {style.highlight(self.path)}: failed to read node (left with: {node_data})")
+            return messages.error(f"Parsing {style.highlight(self.path)}: failed to read node (left with: {node_data})")
 
         if node_data:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed: expected end of line, left with: {node_data}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed: expected end of line, left with: {node_data}")
 
         if is_std not in (LimbFormat.TRUE, LimbFormat.FALSE):
-            return status_bar.error(f"Parsing {style.highlight(self.path)}: invalid node's StdByte.")
+            return messages.error(f"Parsing {style.highlight(self.path)}: invalid node's StdByte.")
 
         is_std = is_std == LimbFormat.TRUE
         node_id = node_id.decode()
@@ -118,12 +120,12 @@ class _Importer:
 
         base_factory: factory.NodeFactory = factory.factories_register.get(factory_id)
         if base_factory is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to invalid FactoryID found: {factory_id} ({factory.factories_register.keys()})")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to invalid FactoryID found: {factory_id} ({factory.factories_register.keys()})")
 
         target_node = base_factory.build_instance(self.workspace_id)
         
         if target_node is None:
-            return status_bar.error(f"Parsing: {style.highlight(self.path)} failed due to invalid factory ({factory_id}) output.")
+            return messages.error(f"Parsing: {style.highlight(self.path)} failed due to invalid factory ({factory_id}) output.")
         
         target_node.node_id = node_id
         target_node.position = measure.Position(x, y)
@@ -137,10 +139,10 @@ class _Importer:
 
     def link_connection(self, wire_data: bytes) -> bool | None:
         if not wire_data.startswith(LimbFormat.WIRE_HEADER):
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to invalid connection header at wire: {wire_data}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to invalid connection header at wire: {wire_data}")
         
         if LimbFormat.PTR not in wire_data:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing connection pointer at: {wire_data}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing connection pointer at: {wire_data}")
         
         wire_data = wire_data.removeprefix(LimbFormat.WIRE_HEADER)
         out_data, in_data = wire_data.split(LimbFormat.PTR)
@@ -151,37 +153,37 @@ class _Importer:
         
         out_node = self.get_node(out_nodeid)
         if out_node is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing output source node: {out_nodeid}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing output source node: {out_nodeid}")
         
         in_node = self.get_node(in_nodeid)
         if in_node is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing input source node: {in_nodeid}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing input source node: {in_nodeid}")
         
         out_src = out_node.get_output_src(out_src)
         if out_src is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing output source: {out_nodeid}/{out_src}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing output source: {out_nodeid}/{out_src}")
 
         in_src = in_node.get_input_src(in_src)
         if in_src is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing input source: {in_nodeid}/{in_src}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing input source: {in_nodeid}/{in_src}")
             
         source.connect_sources(out_src, in_src)
         return True
 
     def set_constant(self, constant_data: bytes) -> None:
         if LimbFormat.PTR not in constant_data:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing pointer at constant: {constant_data}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing pointer at constant: {constant_data}")
             
         src_path, value = constant_data.split(LimbFormat.PTR)
         node_id, input_name = src_path.decode().split("/", 1)
         
         node = self.get_node(node_id)
         if node is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing constant source node: {node_id}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing constant source node: {node_id}")
         
         input_src = node.get_input_src(input_name)
         if input_src is None:
-            return status_bar.error(f"Parsing {style.highlight(self.path)} failed due to missing constant input source: {input_name}")
+            return messages.error(f"Parsing {style.highlight(self.path)} failed due to missing constant input source: {input_name}")
         
         input_src.set_constant(value.decode())
         return True
@@ -190,10 +192,12 @@ class _Importer:
         with open(self.path, "rb") as file:
             header = file.readline().removesuffix(LimbFormat.SEP)
             if header != LimbFormat.FILE_HEADER:
-                return status_bar.error(f"Couldn't import state from file: {style.highlight(self.path)} (invalid file header)")
+                messages.error(f"Couldn't import state from file: {style.highlight(self.path)} (invalid file header)")
+                return None, None
 
             if LimbFormat.EOF not in file.read():
-                return status_bar.error(f"Couldn't import state from file: {style.highlight(self.path)} (no EOF byte found)")
+                messages.error(f"Couldn't import state from file: {style.highlight(self.path)} (no EOF byte found)")
+                return None, None
 
             file.seek(0)
             line = None
@@ -222,7 +226,7 @@ class _Importer:
             if not self.set_constant(constant_data):
                 return None, None
 
-        status_bar.set_message(f"Succesfully imported {style.highlight(f'{len(self.saved_nodes)} nodes')}.")
+        messages.set_message(f"Succesfully imported {style.highlight(f'{len(self.saved_nodes)} nodes')}.")
         return self.saved_nodes, cam
 
 
@@ -232,19 +236,18 @@ class _Exporter:
         self.camera_pos = camera_pos
         self.path = path
         
-    def parse_output_wire(self, output: source.NodeOutput) -> bytes:
-        """ Parse wire connection between output and input. Returns blank bytes if target is None. """
-        input_ = output.target
-        if input_ is None:
-            return b""
+    def parse_output_wires(self, output: source.NodeOutput) -> bytes:
+        """ Parse wire connections between output and it's targets (one wire per target). Returns blank bytes if there are no targets. """
+        content = b""
 
-        content = LimbFormat.WIRE_HEADER
-        content += f"{output.node.node_id}/{output.name}".encode()
+        for input_ in output.targets:
+            content += LimbFormat.WIRE_HEADER
+            content += f"{output.node.node_id}/{output.name}".encode()
 
-        content += LimbFormat.PTR
-        content += f"{input_.node.node_id}/{input_.name}".encode()
+            content += LimbFormat.PTR
+            content += f"{input_.node.node_id}/{input_.name}".encode()
 
-        content += LimbFormat.END
+            content += LimbFormat.END
 
         return content
     
@@ -258,6 +261,8 @@ class _Exporter:
         const_value = input_src.constant_value
         if isinstance(const_value, bool):
             const_value = int(const_value)
+        elif input_src.data_type == types.VECTOR:
+            const_value = types.vector_to_text(const_value)
             
         content += f"{const_value}".encode()
         content += LimbFormat.END
@@ -287,11 +292,10 @@ class _Exporter:
         content += LimbFormat.OUTPUTS_HEADER
 
         if node.flow.output_src is not None:
-            content += self.parse_output_wire(node.flow.output_src)
+            content += self.parse_output_wires(node.flow.output_src)
 
         for output_src in node.outputs:
-            if output_src.target:
-                content += self.parse_output_wire(output_src)
+            content += self.parse_output_wires(output_src)
 
         content += LimbFormat.END
         content += LimbFormat.CONST_HEADER
@@ -319,5 +323,5 @@ class _Exporter:
         with open(self.path, "wb+") as file:
             file.write(content)
 
-        status_bar.set_message(f"Saved into: {style.highlight(self.path)}")
+        messages.set_message(f"Saved into: {style.highlight(self.path)}")
 
@@ -1,29 +1,106 @@
-from modules.measure import VerticalDirection
+from typing import Generator, TYPE_CHECKING, Any
+import sys
 
-from typing import Generator, Any
+if TYPE_CHECKING:
+    from modules.measure import VerticalDirection
 
 
 class MemoryJar:
+    """
+    Key-value memory of the program. Constant keys of the memory nodes are resolved to slots at load time
+    (`resolve_key()`), their values are stored in the `slots` list. Other (dynamic) keys use the `data` dict.
+    Missing value is None in both of them.
+    """
     current: "MemoryJar | None" = None
+    key_slots: dict[str, int] = {}  # Resolved keys, shared by all jars.
+    persistent_path: str | None = None  # Jars of the program's runs are backed by this memory file if set.
 
     @staticmethod
     def get_current() -> "MemoryJar":
         if MemoryJar.current is None:
-            MemoryJar.current = MemoryJar()
+            MemoryJar.current = MemoryJar.open()
         return MemoryJar.current
 
     @staticmethod
     def new_jar() -> None:
-        MemoryJar.current = MemoryJar()
+        """ Jar for the new run of the program. Persistent jar resumes the state saved in it's file. """
+        if MemoryJar.current is not None:
+            MemoryJar.current.close()
+        MemoryJar.current = MemoryJar.open()
+
+    @staticmethod
+    def open() -> "MemoryJar":
+        if MemoryJar.persistent_path is None:
+            return MemoryJar()
+
+        from modules.memory_file import PersistentMemoryJar
+        return PersistentMemoryJar(MemoryJar.persistent_path)
+
+    @staticmethod
+    def resolve_key(key: str) -> int:
+        """ Returns slot of the key, allocated on it's first resolution. """
+        slot = MemoryJar.key_slots.get(key)
+        if slot is None:
+            slot = MemoryJar.key_slots[key] = len(MemoryJar.key_slots)
+            if MemoryJar.current is not None:
+                MemoryJar.current.grow()
+
+        return slot
 
     def __init__(self) -> None:
         self.data: dict[str, Any] = {}
+        self.slots: list[Any] = [None] * len(MemoryJar.key_slots)
+
+    def grow(self) -> None:
+        """ Allocate slots of the keys resolved after the jar has been created. """
+        self.slots.extend([None] * (len(MemoryJar.key_slots) - len(self.slots)))
 
     def set_value(self, key: str, value: str) -> None:
-        self.data[key] = value
+        slot = MemoryJar.key_slots.get(key)
+        if slot is None:
+            self.data[key] = value
+            return
+
+        if slot >= len(self.slots):
+            self.grow()
+        self.slots[slot] = value
 
     def get_value(self, key: str, default: Any = None) -> Any:
-        return self.data.get(key, default)
+        slot = MemoryJar.key_slots.get(key)
+        if slot is None:
+            return self.data.get(key, default)
+
+        value = self.slots[slot] if slot < len(self.slots) else None
+        return default if value is None else value
+
+    def clear(self) -> None:
+        """ Drop all values (program restarted with a new memory). """
+        self.data.clear()
+        self.slots = [None] * len(MemoryJar.key_slots)
+
+    def close(self) -> None:
+        pass
+
+
+def lazy_import(module_name: str) -> Any:
+    """ Module executed on the first access of it's attribute (imports of the compiled programs' header). """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    import importlib.util
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{module_name}'", name=module_name)
+
+    try:
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+    except TypeError:  # Loader which can't be deferred (e.g. builtin modules).
+        return importlib.import_module(module_name)
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
 
 
 def iter_alternately(a: list, b: list) -> Generator:
@@ -38,17 +115,7 @@ def iter_alternately(a: list, b: list) -> Generator:
             yield b.pop(0)
 
 
-def flush_system_keyboard_buffer_win() -> None:
-    try:
-        import msvcrt
-        while msvcrt.kbhit():
-            msvcrt.getch()
-            
-    except:
-        return
-
-
-def wrapping_index_shift(array: list, current_index: int, direction: VerticalDirection) -> int:
+def wrapping_index_shift(array: list, current_index: int, direction: "VerticalDirection") -> int:
     next_index = current_index + direction
     
     if next_index > len(array) - 1:
@@ -0,0 +1,246 @@
+from modules import helpers
+
+from typing import Any
+import struct
+import mmap
+import os
+
+
+MAGIC = b"LIMBJAR\0"
+VERSION = 1
+INITIAL_RECORDS = 64
+INITIAL_HEAP = 4096
+
+HEADER = struct.Struct("<8sIIIIQ")  # magic, version, recordsCount, recordsCapacity, reserved, heapUsed
+RECORD = struct.Struct("<B3xII4x8s")  # valueType, keyOffset, keyLength, value (8 byte aligned)
+NUMBER_VALUE = struct.Struct("<d")
+SPAN_VALUE = struct.Struct("<II")  # offset, length (in the heap)
+
+EMPTY, NUMBER, BOOLEAN, TEXT, VECTOR = range(5)  # Value types of the records.
+
+
+class MemoryFile:
+    """
+    Memory-mapped file storing the memory jar's values, so they survive the process exit (and crash).
+
+    Layout (little-endian):
+        header   - magic, version, recordsCount, recordsCapacity, reserved, heapUsed.
+        records  - recordsCapacity of the fixed 24 byte records: valueType, keyOffset, keyLength, value.
+                   Number / Boolean value is stored in the record, Text / Vector value as (offset, length) in the heap.
+        heap     - append-only region of the keys, texts and vectors (float64 buffers).
+
+    Values are written in place, without a serialization step. New text is appended to the heap before
+    it's record is updated and the new record is counted in the header after it's written,
+    so the interrupted write never leaves a record pointing to incomplete data.
+    Full file is rebuilt (compacted and grown) into a temporary file which replaces it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            self.build({}, INITIAL_RECORDS, INITIAL_HEAP)
+
+        self.file = open(path, "r+b")
+        self.map()
+
+    def map(self) -> None:
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+        if len(self.mm) < HEADER.size:
+            raise ValueError(f"{self.path} is not a memory file (too short).")
+
+        magic, version, self.count, self.capacity, _, self.heap_used = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a memory file.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported memory file version: {version}.")
+
+        self.heap_start = HEADER.size + self.capacity * RECORD.size
+        if self.heap_start + self.heap_used > len(self.mm) or self.count > self.capacity:
+            raise ValueError(f"Memory file {self.path} is corrupted.")
+
+    def close(self) -> None:
+        if self.mm is None:
+            return
+
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+        self.mm = None
+
+    def keys(self) -> dict[str, int]:
+        """ Returns {key: record} of all the records. """
+        keys = {}
+        for record in range(self.count):
+            _, key_offset, key_length, _ = RECORD.unpack_from(self.mm, self.record_offset(record))
+            keys[self.read_heap(key_offset, key_length).decode()] = record
+        return keys
+
+    def record_offset(self, record: int) -> int:
+        return HEADER.size + record * RECORD.size
+
+    def read_heap(self, offset: int, length: int) -> bytes:
+        start = self.heap_start + offset
+        return self.mm[start:start + length]
+
+    def append_heap(self, data: bytes) -> int:
+        """ Append data to the heap (the file is rebuilt if it's full). Returns it's offset in the heap. """
+        if self.heap_start + self.heap_used + len(data) > len(self.mm):
+            self.rebuild(self.capacity, len(data))
+
+        offset = self.heap_used
+        start = self.heap_start + offset
+        self.mm[start:start + len(data)] = data
+        self.heap_used += len(data)
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, self.count, self.capacity, 0, self.heap_used)
+        return offset
+
+    def add_record(self, key: str) -> int:
+        """ Add empty record of the key. Returns the record's index. """
+        if self.count == self.capacity:
+            self.rebuild(self.capacity * 2, 0)
+
+        key_data = key.encode()
+        key_offset = self.append_heap(key_data)
+        record = self.count
+        RECORD.pack_into(self.mm, self.record_offset(record), EMPTY, key_offset, len(key_data), bytes(8))
+
+        self.count += 1
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, self.count, self.capacity, 0, self.heap_used)
+        return record
+
+    def read(self, record: int) -> Any:
+        value_type, _, _, value = RECORD.unpack_from(self.mm, self.record_offset(record))
+        if value_type == NUMBER:
+            return NUMBER_VALUE.unpack(value)[0]
+        if value_type == BOOLEAN:
+            return value[0] != 0
+        if value_type == TEXT:
+            return self.read_heap(*SPAN_VALUE.unpack(value)).decode()
+        if value_type == VECTOR:
+            import numpy
+            return numpy.frombuffer(self.read_heap(*SPAN_VALUE.unpack(value)), dtype="<f8")
+        return None
+
+    def write(self, record: int, value: Any) -> None:
+        offset = self.record_offset(record)
+
+        if isinstance(value, bool):
+            value_type, packed = BOOLEAN, bytes([value]) + bytes(7)
+        elif isinstance(value, (float, int)):
+            value_type, packed = NUMBER, NUMBER_VALUE.pack(value)
+        elif isinstance(value, str):
+            data = value.encode()
+            value_type, packed = TEXT, SPAN_VALUE.pack(self.append_heap(data), len(data))
+        elif type(value).__name__ == "ndarray" and type(value).__module__ == "numpy":  # Vector (numpy isn't imported).
+            data = value.astype("<f8").tobytes()
+            value_type, packed = VECTOR, SPAN_VALUE.pack(self.append_heap(data), len(data))
+        elif value is None:
+            value_type, packed = EMPTY, bytes(8)
+        else:
+            raise RuntimeError(f"Memory error: value of type {type(value).__name__} can't be saved in the memory file.")
+
+        _, key_offset, key_length, _ = RECORD.unpack_from(self.mm, offset)
+        RECORD.pack_into(self.mm, offset, value_type, key_offset, key_length, packed)
+
+    def clear(self) -> None:
+        """ Drop all records. """
+        self.count = self.heap_used = 0
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, self.count, self.capacity, 0, self.heap_used)
+
+    def rebuild(self, capacity: int, extra_heap: int) -> None:
+        """ Rewrite the file with given records capacity and compacted heap (growing it to fit the extra data). """
+        values = {key: self.read(record) for key, record in self.keys().items()}
+        live_heap = sum(len(key.encode()) for key in values)
+        live_heap += sum(len(value.encode()) if isinstance(value, str) else getattr(value, "nbytes", 0) for value in values.values())
+        heap_size = max(INITIAL_HEAP, 2 * (live_heap + extra_heap))
+
+        self.close()
+        self.build(values, capacity, heap_size)
+        self.file = open(self.path, "r+b")
+        self.map()
+
+    def build(self, values: dict[str, Any], capacity: int, heap_size: int) -> None:
+        """ Write new file with the values (in their records order) replacing the current one. """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.truncate(HEADER.size + capacity * RECORD.size + heap_size)
+
+        with open(temp_path, "r+b") as file:
+            self.mm = mmap.mmap(file.fileno(), 0)
+            self.count, self.capacity, self.heap_used = 0, capacity, 0
+            self.heap_start = HEADER.size + capacity * RECORD.size
+            HEADER.pack_into(self.mm, 0, MAGIC, VERSION, 0, capacity, 0, 0)
+
+            for key, value in values.items():
+                self.write(self.add_record(key), value)
+
+            self.mm.flush()
+            self.mm.close()
+            self.mm = None
+
+        os.replace(temp_path, self.path)
+
+
+class MemorySlots:
+    """ `slots` of the PersistentMemoryJar, values of the resolved keys are read from / written to their records. """
+    __slots__ = ("memory_file", "keys", "records")
+
+    def __init__(self, memory_file: MemoryFile, keys: dict[str, int]) -> None:
+        self.memory_file = memory_file
+        self.keys = keys  # Jar's {key: record}, shared.
+        self.records: list[int] = []  # Record of the slot's key, -1 until the first write.
+        self.grow()
+
+    def grow(self) -> None:
+        for key in list(helpers.MemoryJar.key_slots)[len(self.records):]:
+            self.records.append(self.keys.get(key, -1))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, slot: int) -> Any:
+        record = self.records[slot]
+        return self.memory_file.read(record) if record >= 0 else None
+
+    def __setitem__(self, slot: int, value: Any) -> None:
+        record = self.records[slot]
+        if record < 0:
+            key = list(helpers.MemoryJar.key_slots)[slot]
+            record = self.records[slot] = self.keys[key] = self.memory_file.add_record(key)
+        self.memory_file.write(record, value)
+
+
+class PersistentMemoryJar(helpers.MemoryJar):
+    """ Memory jar backed by the MemoryFile, program opening the same file resumes it's state. """
+
+    def __init__(self, path: str) -> None:
+        self.memory_file = MemoryFile(path)
+        self.records = self.memory_file.keys()
+        self.slots = MemorySlots(self.memory_file, self.records)
+
+    def grow(self) -> None:
+        self.slots.grow()
+
+    def set_value(self, key: str, value: Any) -> None:
+        record = self.records.get(key)
+        if record is None:
+            record = self.records[key] = self.memory_file.add_record(key)
+
+            slot = helpers.MemoryJar.key_slots.get(key)
+            if slot is not None and slot < len(self.slots):
+                self.slots.records[slot] = record
+
+        self.memory_file.write(record, value)
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        record = self.records.get(key)
+        value = self.memory_file.read(record) if record is not None else None
+        return default if value is None else value
+
+    def clear(self) -> None:
+        self.memory_file.clear()
+        self.records.clear()
+        self.slots.records = [-1] * len(self.slots.records)
+
+    def close(self) -> None:
+        self.memory_file.close()
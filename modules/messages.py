@@ -0,0 +1,28 @@
+import sys
+
+
+class MessagesSink:
+    """
+    Feedback of the non-UI modules (file format, nodes sources).
+    Messages are forwarded to the status bar once it's attached by the TUI,
+    otherwise (headless runs) only the errors are written to the stderr.
+    """
+
+    def __init__(self) -> None:
+        self.target = None
+
+    def attach(self, target) -> None:
+        self.target = target
+
+    def set_message(self, message: str) -> None:
+        if self.target is not None:
+            self.target.set_message(message)
+
+    def error(self, message: str) -> None:
+        if self.target is not None:
+            return self.target.error(message)
+
+        sys.stderr.write(f"error: {message}\n")
+
+
+messages = MessagesSink()
@@ -1,5 +1,4 @@
 from modules.nodes.factory import NodeFactory
-from modules.side_bar import side_bar
 from modules import style
 
 from dataclasses import dataclass
@@ -35,7 +34,5 @@ class NodesCollections(Enum):
     INTERACTION = Collection("Interaction", style.AnsiFGColor.GREEN)
 
 
-""" Initialize all NodeFactories, feed NodesCollection, set sidebar collection. """
+""" Initialize all NodeFactories, feed NodesCollection. """
 from modules import std_nodes
-
-side_bar.set_collections(NodesCollections)
@@ -1,4 +1,4 @@
-from modules.status_bar import status_bar
+from modules.messages import messages
 from modules.nodes import source
 from modules.nodes import node
 from modules import types
@@ -6,8 +6,8 @@ from modules import style
 from modules import chars
 
 from dataclasses import dataclass, replace as copy_src
-from collections.abc import Callable
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Awaitable
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from modules.nodes.collection import Collection
@@ -25,6 +25,10 @@ class NodeFactory:
     handler: Callable[[dict[str, source.NodeInput], dict[str, source.NodeOutput]], None]
     singleton: bool = False
     factory_id: str = None
+    pure: bool = False  # Handler's output depends only on it's inputs (no I/O, no memory). Allows constant folding.
+    async_handler: Callable[[dict[str, Any]], Awaitable[Any]] | None = None  # Awaitable variant of the handler (I/O nodes) used by the AsyncNodeRunner.
+    loop: bool = False  # Handler returns an iterator of index values, `body` flow output is followed for each of them, then `done`.
+    slot_handler: Callable[[dict[str, Any]], Any] | None = None  # Variant of the memory node's handler used for the constant `key`, reads the resolved MemoryJar `slot` input.
 
     def __post_init__(self) -> None:
         self.instances: dict[str, list[node.Node]] = {}  # List of built instances per workspace
@@ -41,7 +45,7 @@ class NodeFactory:
             self.instances[workspace_id] = []
         
         if self.singleton and self.instances.get(workspace_id):
-            return status_bar.error(f"{style.node(self)} can only be created once!")
+            return messages.error(f"{style.node(self)} can only be created once!")
 
         instanced_inputs = [copy_src(in_src) for in_src in self.inputs]
         instanced_outputs = [copy_src(out_src) for out_src in self.outputs]
@@ -1,10 +1,11 @@
-from modules.status_bar import status_bar
+from modules.messages import messages
 from modules import helpers
+from modules import thunks
 from modules import types
 from modules import style
 from modules import chars
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,11 +14,16 @@ if TYPE_CHECKING:
 
 @dataclass
 class NodeInput:
+    """
+    Lazy input's wired value is passed to the handler as a `thunks.Thunk`, the source node
+    is evaluated only when the handler reads it (use `thunks.force()` to read the input).
+    """
     name: str
     data_type: types.DataType
     required: bool = True
     constant_value: Any = None
     node: "Node | None" = None
+    lazy: bool = False
 
     def __post_init__(self) -> None:
         self.__source: NodeOutput | None = None
@@ -25,7 +31,7 @@ class NodeInput:
     def disconnect(self) -> None:
         """ Disconnect from target output source. """
         if self.__source is not None:
-            self.__source.target = None
+            self.__source.remove_target(self)
 
         self.__source = None
 
@@ -38,7 +44,7 @@ class NodeInput:
 
         if const_value is None:
             self.constant_value = None
-            return status_bar.set_message(f"Constant value for {style.source(self)} has been ereased.")
+            return messages.set_message(f"Constant value for {style.source(self)} has been ereased.")
 
         try:
             self.disconnect()
@@ -46,14 +52,18 @@ class NodeInput:
             if self.data_type.base_t == bool:
                 const_value = types.string_to_boolean(const_value.lower())
                 if const_value is None:
-                    return status_bar.error("Boolean convertion failed. Use (t)rue, (y)es, 1  or  (f)alse, (n)o, 0.")
+                    return messages.error("Boolean convertion failed. Use (t)rue, (y)es, 1  or  (f)alse, (n)o, 0.")
+
+            if self.data_type == types.VECTOR:
+                value = types.text_to_vector(const_value)
+            else:
+                value = self.data_type.base_t(const_value)
 
-            value = self.data_type.base_t(const_value)
             self.constant_value = value
-            status_bar.set_message(f"Constant value for {style.source(self)} has been set to: `{self.constant_value}`")
+            messages.set_message(f"Constant value for {style.source(self)} has been set to: `{self.constant_value}`")
 
         except ValueError:
-            status_bar.error(f"Failed to convert `{const_value}` to: {style.datatype(self.data_type)}")
+            messages.error(f"Failed to convert `{const_value}` to: {style.datatype(self.data_type)}")
 
     @property
     def source(self) -> "NodeOutput | None":
@@ -102,17 +112,28 @@ class NodeInput:
 
 @dataclass
 class NodeOutput:
+    """
+    Data output can be wired to many inputs (the value is computed once and shared by all of them).
+    Flow output has at most one target.
+    """
     name: str
     data_type: types.DataType
     node: "Node | None" = None
-    target: "NodeInput | None" = None
+    targets: list[NodeInput] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    @property
+    def target(self) -> "NodeInput | None":
+        """ First connected target (the one that flow continues to). """
+        if not self.targets:
+            return None
+        return self.targets[0]
 
     @property
     def icon(self) -> str:
         if self.data_type == types.FLOW:
             return chars.DOUBLE_LINE.vr
 
-        if self.target is None:
+        if not self.targets:
             return chars.OUTPUT_FREE
 
         return chars.OUTPUT_FULL
@@ -136,40 +157,39 @@ class NodeOutput:
         y += self.node.position.y
         return (x, y)
 
-    @property
-    def target_rel_pos(self) -> tuple[int, int]:
-        if isinstance(self.target, NodeInput):
-            return self.target.rel_pos
-
-        return self.target.rel_flow_input_pos
-
     def connect(self, target: NodeInput) -> None:
+        """ Add target. Flow output's current target is replaced. """
+        if self.data_type == types.FLOW:
+            self.disconnect()
+
         target.source = self
-        self.target = target
+        self.targets.append(target)
+
+    def remove_target(self, target: NodeInput) -> None:
+        self.targets = [connected for connected in self.targets if connected is not target]
 
     def disconnect(self) -> None:
-        if self.target is None:
-            return
+        """ Disconnect all targets. """
+        for target in list(self.targets):
+            target.disconnect()
 
-        self.target.disconnect()
-        self.target = None
+        self.targets = []
 
 
 def connect_sources(s1: NodeInput | NodeOutput, s2: NodeInput | NodeOutput) -> bool | None:
     """ Connect two node data sources. Perfroms basic validation. Returns True on success or None on fail. """
 
     if s1.node == s2.node:
-        return status_bar.error(f"Cannot connect sources from the same node {style.node(s1.node)}")
+        return messages.error(f"Cannot connect sources from the same node {style.node(s1.node)}")
 
     if type(s1) == type(s2):
         source_type = "input" if isinstance(s1, NodeInput) else "output"
-        return status_bar.error(f"Both {style.source(s1)} and {style.source(s2)} are {source_type}s!")
+        return messages.error(f"Both {style.source(s1)} and {style.source(s2)} are {source_type}s!")
 
     if s1.data_type != s2.data_type:
-        return status_bar.error(f"Data types for {style.source(s1)} and {style.source(s2)} are NOT equal")
-
-    s1.disconnect()
-    s2.disconnect()
+        return messages.error(f"Data types for {style.source(s1)} and {style.source(s2)} are NOT equal")
 
-    s1.connect(s2) if isinstance(s1, NodeOutput) else s2.connect(s1)
+    output_src, input_src = (s1, s2) if isinstance(s1, NodeOutput) else (s2, s1)
+    input_src.disconnect()
+    output_src.connect(input_src)
     return True
@@ -0,0 +1,137 @@
+from modules.execution.exit_codes import ExitCode
+
+from typing import TextIO, TYPE_CHECKING
+import sys
+import os
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class ProgramIO:
+    """
+    Input and output used by the interaction nodes. Default implementation uses standard streams.
+    Without `prompts`, the Input node's prompt is not written (keeps piped output clean).
+    """
+    current: "ProgramIO | None" = None
+
+    def __init__(self, prompts: bool = True) -> None:
+        self.prompts = prompts
+
+    @staticmethod
+    def get_current() -> "ProgramIO":
+        if ProgramIO.current is None:
+            ProgramIO.current = ProgramIO()
+        return ProgramIO.current
+
+    def read_line(self, prompt: str = "") -> str:
+        """ Read single line. Terminates the program with INPUT_CLOSED if the input has ended. """
+        flush_system_keyboard_buffer_win()
+
+        try:
+            return input(prompt if self.prompts else "")
+        except EOFError:
+            raise EOFError(ExitCode.INPUT_CLOSED)
+
+    def write_line(self, text: str) -> None:
+        print(text)
+
+    def wait_for_enter(self) -> None:
+        self.read_line()
+
+    async def read_line_async(self, prompt: str = "") -> str:
+        """ Awaitable `read_line()` used by the AsyncNodeRunner. Blocking read runs in a worker thread. """
+        import asyncio
+        return await asyncio.to_thread(self.read_line, prompt)
+
+    async def wait_for_enter_async(self) -> None:
+        import asyncio
+        await asyncio.to_thread(self.wait_for_enter)
+
+    def clear_screen(self) -> None:
+        if sys.stdout.isatty():
+            os.system("cls || clear")
+
+
+class ScriptedIO(ProgramIO):
+    """
+    Stand-in for unattended runs. Input is read from the `inputs` script and output is collected in `outputs`.
+    After `max_outputs` lines are written, program is terminated (MANUAL_TERMINATION).
+    Written lines are also copied to the `echo` stream if given.
+    """
+
+    def __init__(self, inputs: list[str], max_outputs: int | None = None, echo: TextIO | None = None) -> None:
+        super().__init__(prompts=False)
+        self.inputs = list(reversed(inputs))
+        self.outputs: list[str] = []
+        self.max_outputs = max_outputs
+        self.echo = echo
+
+    def read_line(self, prompt: str = "") -> str:
+        if not self.inputs:
+            raise EOFError(ExitCode.INPUT_CLOSED)
+        return self.inputs.pop()
+
+    def write_line(self, text: str) -> None:
+        self.outputs.append(text)
+        if self.echo is not None:
+            self.echo.write(text + "\n")
+            self.echo.flush()
+
+        if self.max_outputs is not None and len(self.outputs) >= self.max_outputs:
+            raise KeyboardInterrupt
+
+    def wait_for_enter(self) -> None:
+        return
+
+    async def read_line_async(self, prompt: str = "") -> str:
+        return self.read_line(prompt)
+
+    async def wait_for_enter_async(self) -> None:
+        return
+
+    def clear_screen(self) -> None:
+        return
+
+
+class StreamIO(ProgramIO):
+    """
+    Program's I/O over the asyncio streams (utf-8 lines), awaited by the AsyncNodeRunner, so the idle program
+    doesn't hold a thread. Lines are written without waiting for the `writer` to drain. Can't be read synchronously.
+    """
+
+    def __init__(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter", prompts: bool = False) -> None:
+        super().__init__(prompts)
+        self.reader = reader
+        self.writer = writer
+
+    def read_line(self, prompt: str = "") -> str:
+        raise RuntimeError("StreamIO can only be read by the AsyncNodeRunner.")
+
+    async def read_line_async(self, prompt: str = "") -> str:
+        if prompt and self.prompts:
+            self.writer.write(prompt.encode())
+
+        line = await self.reader.readline()
+        if not line:
+            raise EOFError(ExitCode.INPUT_CLOSED)
+        return line.decode().rstrip("\r\n")
+
+    def write_line(self, text: str) -> None:
+        self.writer.write((text + "\n").encode())
+
+    async def wait_for_enter_async(self) -> None:
+        await self.read_line_async()
+
+    def clear_screen(self) -> None:
+        return
+
+
+def flush_system_keyboard_buffer_win() -> None:
+    try:
+        import msvcrt
+        while msvcrt.kbhit():
+            msvcrt.getch()
+            
+    except:
+        return
@@ -1,4 +1,5 @@
 from modules.side_bar import side_bar
+from modules.messages import messages
 from modules import terminal
 from modules import measure
 from modules import chars
@@ -88,6 +89,7 @@ class StatusBarComponent(ui.TextUIComponent):
             "ctrl+w": "close",
             "F1": "run",
             "F2": "compile",
+            "F3": "profile",
             "F12": "debug",
         }
         
@@ -125,3 +127,4 @@ class StatusBarComponent(ui.TextUIComponent):
         
 
 status_bar = StatusBarComponent()
+messages.attach(status_bar)
@@ -5,3 +5,7 @@ from modules.std_nodes.casting import *
 from modules.std_nodes.strings import *
 from modules.std_nodes.memory import *
 from modules.std_nodes.maths import *
+from modules import types
+
+if types.VECTOR is not None:  # NumPy installed.
+    from modules.std_nodes.vectors import *
@@ -20,6 +20,7 @@ NodeFactory(
     inputs=[NodeInput("num", types.NUMBER)],
     outputs=[NodeOutput("text", types.TEXT)],
     handler=cast_number_text,
+    pure=True,
 )
 
 # Boolean to text
@@ -33,6 +34,7 @@ NodeFactory(
     inputs=[NodeInput("bool", types.BOOLEAN)],
     outputs=[NodeOutput("text", types.TEXT)],
     handler=cast_bool_text,
+    pure=True,
 )
 
 # Text to number
@@ -68,6 +70,7 @@ NodeFactory(
     inputs=[NodeInput("text", types.TEXT), NodeInput("default", types.NUMBER, required=False)],
     outputs=[NodeOutput("number", types.NUMBER)],
     handler=cast_text_number,
+    pure=True,
 )
 
 
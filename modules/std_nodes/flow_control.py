@@ -3,8 +3,11 @@ from modules.nodes.collection import NodesCollections
 from modules.execution.exit_codes import ExitCode
 from modules.nodes.factory import NodeFactory
 from modules.nodes.node import FlowControl
+from modules import thunks
 from modules import types
 
+from collections.abc import Iterator
+
 
 # Start.
 START_FACTORY = NodeFactory(
@@ -71,3 +74,49 @@ NodeFactory(
     outputs=[],
     handler=lambda *_: None
 )
+
+
+# For range.
+def for_range(ins: dict[str, float]) -> Iterator[float]:
+    start = ins.get("from") or 0.0
+    stop = ins.get("to")
+    step = ins.get("step")
+    if step is None:
+        step = 1.0
+    if step == 0:
+        raise RuntimeError("For range step can't be zero.")
+
+    if float(start).is_integer() and float(stop).is_integer() and float(step).is_integer():
+        return map(float, range(int(start), int(stop), int(step)))
+
+    count = int(max(0, -((start - stop) // step)))
+    return (start + index * step for index in range(count))
+
+NodeFactory(
+    title="For range",
+    collection=NodesCollections.FLOW_CONTROL,
+    flow=FlowControl(False),
+    inputs=[NodeInput("from", types.NUMBER, False), NodeInput("to", types.NUMBER), NodeInput("step", types.NUMBER, False)],
+    outputs=[NodeOutput("body", types.FLOW), NodeOutput("done", types.FLOW), NodeOutput("index", types.NUMBER)],
+    handler=for_range,
+    loop=True
+)
+
+
+# While.
+def while_loop(ins: dict[str, bool]) -> Iterator[float]:
+    condition = ins.get("condition")
+    index = 0.0
+    while thunks.force(condition):
+        yield index
+        index += 1
+
+NodeFactory(
+    title="While",
+    collection=NodesCollections.FLOW_CONTROL,
+    flow=FlowControl(False),
+    inputs=[NodeInput("condition", types.BOOLEAN, lazy=True)],
+    outputs=[NodeOutput("body", types.FLOW), NodeOutput("done", types.FLOW), NodeOutput("index", types.NUMBER)],
+    handler=while_loop,
+    loop=True
+)
@@ -2,8 +2,7 @@ from modules.nodes.source import NodeInput, NodeOutput
 from modules.nodes.collection import NodesCollections
 from modules.nodes.factory import NodeFactory
 from modules.nodes.node import FlowControl
-from modules import terminal
-from modules import helpers
+from modules import runtime_io
 from modules import style
 from modules import types
 
@@ -11,8 +10,12 @@ from modules import types
 # Input.
 def input_interaction(ins: dict[str, str]) -> dict[str, str]:
     prompt = ins.get("prompt") or ""
-    helpers.flush_system_keyboard_buffer_win()
-    value = input(prompt)
+    value = runtime_io.ProgramIO.get_current().read_line(prompt)
+    return {"value": value}
+
+async def input_interaction_async(ins: dict[str, str]) -> dict[str, str]:
+    prompt = ins.get("prompt") or ""
+    value = await runtime_io.ProgramIO.get_current().read_line_async(prompt)
     return {"value": value}
 
 NodeFactory(
@@ -22,12 +25,13 @@ NodeFactory(
     inputs=[NodeInput("prompt", types.TEXT, False)],
     outputs=[NodeOutput("value", types.TEXT)],
     handler=input_interaction,
+    async_handler=input_interaction_async,
 )
 
 
 # Output.
 def dispaly_text(ins: dict[str, str]) -> None:
-    print(ins.get("text").replace("\\n", "\n"))
+    runtime_io.ProgramIO.get_current().write_line(ins.get("text").replace("\\n", "\n"))
 
 NodeFactory(
     title="Output",
@@ -39,22 +43,32 @@ NodeFactory(
 )
 
 # Clear screen.
+def clear_screen(ins: dict) -> None:
+    runtime_io.ProgramIO.get_current().clear_screen()
+
 NodeFactory(
     title="Clear screen",
     collection=NodesCollections.INTERACTION,
     flow=FlowControl(True),
     inputs=[],
     outputs=[],
-    handler=lambda *_: terminal.clear_screen(),
+    handler=clear_screen,
 )
 
 
 # Wait for enter.
+def await_enter(ins: dict) -> None:
+    runtime_io.ProgramIO.get_current().wait_for_enter()
+
+async def await_enter_async(ins: dict) -> None:
+    await runtime_io.ProgramIO.get_current().wait_for_enter_async()
+
 NodeFactory(
     title="Await Enter",
     collection=NodesCollections.INTERACTION,
     flow=FlowControl(True),
     inputs=[],
     outputs=[],
-    handler=lambda *_: terminal.wait_for_enter(),
+    handler=await_enter,
+    async_handler=await_enter_async,
 )
@@ -2,6 +2,7 @@ from modules.nodes.source import NodeInput, NodeOutput
 from modules.nodes.collection import NodesCollections
 from modules.nodes.factory import NodeFactory
 from modules.nodes.node import FlowControl
+from modules import thunks
 from modules import types
 
 
@@ -17,34 +18,37 @@ NodeFactory(
     inputs=[NodeInput("a", types.BOOLEAN)],
     outputs=[NodeOutput("NOT", types.BOOLEAN)],
     handler=not_bool_handler,
+    pure=True,
 )
 
 # And.
 def and_bool_handler(ins: dict[str, bool]) -> dict[str, bool]:
-    a, b = ins.get("a"), ins.get("b")
-    return {"AND": a and b}
+    a = ins.get("a")
+    return {"AND": a and thunks.force(ins.get("b"))}
 
 NodeFactory(
     title="And",
     collection=NodesCollections.LOGICAL,
     flow=FlowControl(False, False),
-    inputs=[NodeInput("a", types.BOOLEAN), NodeInput("b", types.BOOLEAN)],
+    inputs=[NodeInput("a", types.BOOLEAN), NodeInput("b", types.BOOLEAN, lazy=True)],
     outputs=[NodeOutput("AND", types.BOOLEAN)],
     handler=and_bool_handler,
+    pure=True,
 )
 
 # Or.
 def or_bool_handler(ins: dict[str, bool]) -> dict[str, bool]:
-    a, b = ins.get("a"), ins.get("b")
-    return {"OR": a or b}
+    a = ins.get("a")
+    return {"OR": a or thunks.force(ins.get("b"))}
 
 NodeFactory(
     title="Or",
     collection=NodesCollections.LOGICAL,
     flow=FlowControl(False, False),
-    inputs=[NodeInput("a", types.BOOLEAN), NodeInput("b", types.BOOLEAN)],
+    inputs=[NodeInput("a", types.BOOLEAN), NodeInput("b", types.BOOLEAN, lazy=True)],
     outputs=[NodeOutput("OR", types.BOOLEAN)],
     handler=or_bool_handler,
+    pure=True,
 )
 
 # Equal.
@@ -59,4 +63,5 @@ NodeFactory(
     inputs=[NodeInput("a", types.BOOLEAN), NodeInput("b", types.BOOLEAN)],
     outputs=[NodeOutput("Result", types.BOOLEAN)],
     handler=bool_equal_check,
+    pure=True,
 )
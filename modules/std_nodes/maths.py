@@ -16,6 +16,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("==", types.BOOLEAN)],
     handler=are_equal,
+    pure=True,
 )
 
 # Not equal !=
@@ -30,6 +31,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("!=", types.BOOLEAN)],
     handler=are_not_equal,
+    pure=True,
 )
 
 # Greater than >
@@ -44,6 +46,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput(">", types.BOOLEAN)],
     handler=is_greater_than,
+    pure=True,
 )
 
 # Greater than or equal >=
@@ -58,6 +61,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput(">=", types.BOOLEAN)],
     handler=is_greater_than_equal,
+    pure=True,
 )
 
 # Less than <
@@ -72,6 +76,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("<", types.BOOLEAN)],
     handler=is_less_than,
+    pure=True,
 )
 
 # Less than or equal <=
@@ -86,6 +91,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("<=", types.BOOLEAN)],
     handler=is_less_than_equal,
+    pure=True,
 )
 
 # Add +
@@ -100,6 +106,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("=", types.NUMBER)],
     handler=add,
+    pure=True,
 )
 
 # Sub -
@@ -114,6 +121,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("=", types.NUMBER)],
     handler=sub,
+    pure=True,
 )
 
 # Multiply *
@@ -128,6 +136,7 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("=", types.NUMBER)],
     handler=multiply,
+    pure=True,
 )
 
 # Divide /
@@ -145,5 +154,6 @@ NodeFactory(
     inputs=[NodeInput("x", types.NUMBER), NodeInput("y", types.NUMBER)],
     outputs=[NodeOutput("=", types.NUMBER)],
     handler=divide,
+    pure=True,
 )
 
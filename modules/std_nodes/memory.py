@@ -3,6 +3,7 @@ from modules.nodes.collection import NodesCollections
 from modules.nodes.factory import NodeFactory
 from modules.nodes.node import FlowControl
 from modules import helpers
+from modules import thunks
 from modules import types
 
 from typing import Any
@@ -18,14 +19,29 @@ def set_value(ins: dict[str, Any]) -> None:
 def get_value(ins: dict[str, Any]) -> dict[str, Any]:
     jar = helpers.MemoryJar.get_current()
     key = ins.get("key")
-    default = ins.get("default")
 
-    value = jar.get_value(key, default)
+    value = jar.get_value(key)
+    if value is None:
+        value = thunks.force(ins.get("default"))  # Lazy, evaluated only for missing values.
+
     if value is None:
         raise RuntimeError(f"Memory error: couldn't find value: {key} in the current jar.")
 
     return {"value": value}
 
+def set_slot_value(ins: dict[str, Any]) -> None:
+    helpers.MemoryJar.get_current().slots[ins.get("slot")] = ins.get("value")
+
+def get_slot_value(ins: dict[str, Any]) -> dict[str, Any]:
+    value = helpers.MemoryJar.get_current().slots[ins.get("slot")]
+    if value is None:
+        value = thunks.force(ins.get("default"))  # Lazy, evaluated only for missing values.
+
+    if value is None:
+        raise RuntimeError(f"Memory error: couldn't find value: {ins.get('key')} in the current jar.")
+
+    return {"value": value}
+
 # Save number.
 NodeFactory(
     title="Save Number",
@@ -34,6 +50,7 @@ NodeFactory(
     inputs=[NodeInput("key", types.TEXT), NodeInput("value", types.NUMBER)],
     outputs=[],
     handler=set_value,
+    slot_handler=set_slot_value,
 )
 
 # Save text.
@@ -44,6 +61,7 @@ NodeFactory(
     inputs=[NodeInput("key", types.TEXT), NodeInput("value", types.TEXT)],
     outputs=[],
     handler=set_value,
+    slot_handler=set_slot_value,
 )
 
 # Save bool.
@@ -54,6 +72,7 @@ NodeFactory(
     inputs=[NodeInput("key", types.TEXT), NodeInput("value", types.BOOLEAN)],
     outputs=[],
     handler=set_value,
+    slot_handler=set_slot_value,
 )
 
 # Get number.
@@ -61,9 +80,10 @@ NodeFactory(
     title="Get Number",
     collection=NodesCollections.MEMORY,
     flow=FlowControl(False),
-    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.NUMBER, False)],
+    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.NUMBER, False, lazy=True)],
     outputs=[NodeOutput("value", types.NUMBER)],
     handler=get_value,
+    slot_handler=get_slot_value,
 )
 
 # Get text.
@@ -71,9 +91,10 @@ NodeFactory(
     title="Get Text",
     collection=NodesCollections.MEMORY,
     flow=FlowControl(False),
-    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.TEXT, False)],
+    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.TEXT, False, lazy=True)],
     outputs=[NodeOutput("value", types.TEXT)],
     handler=get_value,
+    slot_handler=get_slot_value,
 )
 
 # Get bool.
@@ -81,8 +102,9 @@ NodeFactory(
     title="Get Boolean",
     collection=NodesCollections.MEMORY,
     flow=FlowControl(False),
-    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.BOOLEAN, False)],
+    inputs=[NodeInput("key", types.TEXT), NodeInput("default", types.BOOLEAN, False, lazy=True)],
     outputs=[NodeOutput("value", types.BOOLEAN)],
     handler=get_value,
+    slot_handler=get_slot_value,
 )
 
@@ -17,6 +17,7 @@ NodeFactory(
     inputs=[NodeInput("a", types.TEXT), NodeInput("b", types.TEXT)],
     outputs=[NodeOutput("equal", types.BOOLEAN)],
     handler=string_eq,
+    pure=True,
 )
 
 # Length.
@@ -31,6 +32,7 @@ NodeFactory(
     inputs=[NodeInput("text", types.TEXT)],
     outputs=[NodeOutput("length", types.NUMBER)],
     handler=length_string,
+    pure=True,
 )
 
 # Uppercase.
@@ -45,6 +47,7 @@ UPPERCASE_FACTORY = NodeFactory(
     inputs=[NodeInput("text", types.TEXT)],
     outputs=[NodeOutput("upper", types.TEXT)],
     handler=uppercase_string,
+    pure=True,
 )
 
 # Lowercase.
@@ -59,6 +62,7 @@ NodeFactory(
     inputs=[NodeInput("text", types.TEXT)],
     outputs=[NodeOutput("lower", types.TEXT)],
     handler=lowercase_string,
+    pure=True,
 )
 
 # Count.
@@ -74,6 +78,7 @@ NodeFactory(
     inputs=[NodeInput("text", types.TEXT), NodeInput("phrase", types.TEXT)],
     outputs=[NodeOutput("lower", types.TEXT)],
     handler=count_string,
+    pure=True,
 )
 
 # Join.
@@ -90,4 +95,5 @@ NodeFactory(
     inputs=[NodeInput("text1", types.TEXT), NodeInput("text2", types.TEXT), NodeInput("sep", types.TEXT, False)],
     outputs=[NodeOutput("joined", types.TEXT)],
     handler=join_strings,
+    pure=True,
 )
@@ -0,0 +1,345 @@
+from modules.nodes.source import NodeInput, NodeOutput
+from modules.nodes.collection import NodesCollections
+from modules.nodes.factory import NodeFactory
+from modules.nodes.node import FlowControl
+from modules.helpers import lazy_import
+from modules import types
+
+numpy = lazy_import("numpy")  # Imported by the first vector operation (programs without vectors start faster).
+
+
+# Vector Add +
+def vector_add(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"=": x + y}
+
+NodeFactory(
+    title="Vector Add",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("=", types.VECTOR)],
+    handler=vector_add,
+    pure=True,
+)
+
+# Vector Sub -
+def vector_sub(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"=": x - y}
+
+NodeFactory(
+    title="Vector Sub",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("=", types.VECTOR)],
+    handler=vector_sub,
+    pure=True,
+)
+
+# Vector Multiply *
+def vector_multiply(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"=": x * y}
+
+NodeFactory(
+    title="Vector Multiply",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("=", types.VECTOR)],
+    handler=vector_multiply,
+    pure=True,
+)
+
+# Vector Divide /
+def vector_divide(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+    if not y.all():
+        raise RuntimeError("Division by 0.")
+
+    return {"=": x / y}
+
+NodeFactory(
+    title="Vector Divide",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("=", types.VECTOR)],
+    handler=vector_divide,
+    pure=True,
+)
+
+# Vector Scale * number
+def vector_scale(ins: "dict[str, numpy.ndarray | float]") -> "dict[str, numpy.ndarray]":
+    x, factor = ins.get("x"), ins.get("factor")
+    return {"=": x * factor}
+
+NodeFactory(
+    title="Vector Scale",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("factor", types.NUMBER)],
+    outputs=[NodeOutput("=", types.VECTOR)],
+    handler=vector_scale,
+    pure=True,
+)
+
+# Vector Equal == (comparisons return the mask vector of 1.0 / 0.0 values)
+def vector_equal(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"==": (x == y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector ==",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("==", types.VECTOR)],
+    handler=vector_equal,
+    pure=True,
+)
+
+# Vector Not equal !=
+def vector_not_equal(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"!=": (x != y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector !=",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("!=", types.VECTOR)],
+    handler=vector_not_equal,
+    pure=True,
+)
+
+# Vector Greater than >
+def vector_greater_than(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {">": (x > y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector >",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput(">", types.VECTOR)],
+    handler=vector_greater_than,
+    pure=True,
+)
+
+# Vector Greater than or equal >=
+def vector_greater_than_equal(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {">=": (x >= y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector >=",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput(">=", types.VECTOR)],
+    handler=vector_greater_than_equal,
+    pure=True,
+)
+
+# Vector Less than <
+def vector_less_than(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"<": (x < y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector <",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("<", types.VECTOR)],
+    handler=vector_less_than,
+    pure=True,
+)
+
+# Vector Less than or equal <=
+def vector_less_than_equal(ins: "dict[str, numpy.ndarray]") -> "dict[str, numpy.ndarray]":
+    x, y = ins.get("x"), ins.get("y")
+    if x.shape != y.shape:
+        raise RuntimeError(f"Vector sizes differ: {x.size} and {y.size}.")
+
+    return {"<=": (x <= y).astype(numpy.float64)}
+
+NodeFactory(
+    title="Vector <=",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR), NodeInput("y", types.VECTOR)],
+    outputs=[NodeOutput("<=", types.VECTOR)],
+    handler=vector_less_than_equal,
+    pure=True,
+)
+
+# Vector Sum
+def vector_sum(ins: "dict[str, numpy.ndarray]") -> dict[str, float]:
+    return {"sum": float(ins.get("x").sum())}
+
+NodeFactory(
+    title="Vector Sum",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("sum", types.NUMBER)],
+    handler=vector_sum,
+    pure=True,
+)
+
+# Vector Mean
+def vector_mean(ins: "dict[str, numpy.ndarray]") -> dict[str, float]:
+    x = ins.get("x")
+    if not x.size:
+        raise RuntimeError("Mean of the empty vector.")
+
+    return {"mean": float(x.mean())}
+
+NodeFactory(
+    title="Vector Mean",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("mean", types.NUMBER)],
+    handler=vector_mean,
+    pure=True,
+)
+
+# Vector Min
+def vector_min(ins: "dict[str, numpy.ndarray]") -> dict[str, float]:
+    x = ins.get("x")
+    if not x.size:
+        raise RuntimeError("Minimum of the empty vector.")
+
+    return {"min": float(x.min())}
+
+NodeFactory(
+    title="Vector Min",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("min", types.NUMBER)],
+    handler=vector_min,
+    pure=True,
+)
+
+# Vector Max
+def vector_max(ins: "dict[str, numpy.ndarray]") -> dict[str, float]:
+    x = ins.get("x")
+    if not x.size:
+        raise RuntimeError("Maximum of the empty vector.")
+
+    return {"max": float(x.max())}
+
+NodeFactory(
+    title="Vector Max",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("max", types.NUMBER)],
+    handler=vector_max,
+    pure=True,
+)
+
+# Vector Size
+def vector_size(ins: "dict[str, numpy.ndarray]") -> dict[str, float]:
+    return {"size": float(ins.get("x").size)}
+
+NodeFactory(
+    title="Vector Size",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("size", types.NUMBER)],
+    handler=vector_size,
+    pure=True,
+)
+
+# Vector Range
+def vector_range(ins: dict[str, float]) -> "dict[str, numpy.ndarray]":
+    start = ins.get("from") or 0.0
+    stop = ins.get("to")
+    step = ins.get("step")
+    if step is None:
+        step = 1.0
+    if step == 0:
+        raise RuntimeError("Vector range step can't be zero.")
+
+    return {"vector": numpy.arange(start, stop, step, dtype=numpy.float64)}
+
+NodeFactory(
+    title="Vector Range",
+    collection=NodesCollections.MATH,
+    flow=FlowControl(False),
+    inputs=[NodeInput("from", types.NUMBER, False), NodeInput("to", types.NUMBER), NodeInput("step", types.NUMBER, False)],
+    outputs=[NodeOutput("vector", types.VECTOR)],
+    handler=vector_range,
+    pure=True,
+)
+
+# Text to vector
+def cast_text_vector(ins: dict[str, str]) -> "dict[str, numpy.ndarray]":
+    text = ins.get("text")
+
+    try:
+        return {"vector": numpy.array(text.replace(",", " ").split(), dtype=numpy.float64)}
+
+    except ValueError:
+        raise RuntimeError(f"Text-Vector conversion failed for string: {text}")
+
+NodeFactory(
+    title="Text-Vector",
+    collection=NodesCollections.CASTING,
+    flow=FlowControl(),
+    inputs=[NodeInput("text", types.TEXT)],
+    outputs=[NodeOutput("vector", types.VECTOR)],
+    handler=cast_text_vector,
+    pure=True,
+)
+
+# Vector to text
+def cast_vector_text(ins: "dict[str, numpy.ndarray]") -> dict[str, str]:
+    values = ins.get("x").tolist()
+    return {"text": " ".join(str(int(value)) if value.is_integer() else str(value) for value in values)}
+
+NodeFactory(
+    title="Vector-Text",
+    collection=NodesCollections.CASTING,
+    flow=FlowControl(),
+    inputs=[NodeInput("x", types.VECTOR)],
+    outputs=[NodeOutput("text", types.TEXT)],
+    handler=cast_vector_text,
+    pure=True,
+)
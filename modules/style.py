@@ -1,21 +1,33 @@
-from modules import terminal
 from modules import measure
 from modules import chars
 
-from tcolorpy import tcolor, AnsiFGColor, AnsiBGColor, AnsiStyle
-from colorama import init, Fore, Back, Style
+from tcolorpy import AnsiFGColor, AnsiBGColor, AnsiStyle
 from dataclasses import dataclass
+import tcolorpy
 import re
 
-init()
-
-RESET = Fore.RESET + Back.RESET + Style.RESET_ALL
+RESET = "\033[39m\033[49m\033[0m"
 DIM = "\033[2m"
 ITALIC = "\033[3m"
 UNDERLINE = "\033[4m"
 
 FLOW_CONTROL_COLOR = (222, 91, 94)
 LOGICAL_COLOR = (85, 136, 230)
+
+COLORS = True  # Disabled for the headless runs writing into a file or a pipe (see `disable_colors()`).
+
+
+def disable_colors() -> None:
+    """ Styled text is written without the ANSI codes. """
+    global COLORS, RESET, DIM, ITALIC, UNDERLINE
+    COLORS = False
+    RESET = DIM = ITALIC = UNDERLINE = ""
+
+
+def tcolor(string: str, color=None, bg_color=None, styles=None) -> str:
+    if not COLORS:
+        return string
+    return tcolorpy.tcolor(string, color, bg_color, styles)
     
     
 def real_length(styled_text: str) -> int:
@@ -39,6 +51,8 @@ class BorderConnection:
     
 
 def outline_rect(rect: measure.Rect, connections: BorderConnection, dimmed: bool = False) -> None:
+    from modules import terminal
+
     if dimmed:
         print(DIM, end="")
         
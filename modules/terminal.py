@@ -1,3 +1,4 @@
+from modules import runtime_io
 from modules import ui
 
 import threading
@@ -114,6 +115,34 @@ def wait_for_enter() -> None:
         time.sleep(0.1)
 
 
+async def wait_for_enter_async() -> None:
+    """ Await until enter is pressed (polled without blocking the event loop). """
+    import asyncio
+
+    while keyboard.is_pressed("enter"):
+        await asyncio.sleep(0.1)
+
+    while True:
+        if keyboard.is_pressed("enter") and is_active_window():
+            hide_cursor()
+            return
+
+        await asyncio.sleep(0.1)
+
+
+class TerminalIO(runtime_io.ProgramIO):
+    """ Program's I/O used inside the TUI (enter is detected by the keyboard hook). """
+
+    def wait_for_enter(self) -> None:
+        wait_for_enter()
+
+    async def wait_for_enter_async(self) -> None:
+        await wait_for_enter_async()
+
+    def clear_screen(self) -> None:
+        clear_screen()
+
+
 def is_active_window() -> bool:
     if CONSOLE_WINDOW is None:
         return True
@@ -159,8 +188,10 @@ def term_size_listener(test_run: bool = False) -> None:
         time.sleep(0.1)
         
         
-if get_w() < MIN_W or get_h() < MIN_H:
-    term_size_listener(test_run=True)
-        
-_listener = threading.Thread(target=term_size_listener, daemon=True)
-_listener.start()
+def start_size_listener() -> None:
+    """ Wait until the terminal is big enough and keep re-rendering the UI on resize. """
+    if get_w() < MIN_W or get_h() < MIN_H:
+        term_size_listener(test_run=True)
+
+    listener = threading.Thread(target=term_size_listener, daemon=True)
+    listener.start()
@@ -0,0 +1,31 @@
+from typing import Callable, Any
+
+
+class Thunk:
+    """ Value of the lazy input. Source is pulled on the first call, the value is reused by the next calls. """
+    __slots__ = ("pull", "value")
+
+    def __init__(self, pull: Callable[[], Any]) -> None:
+        self.pull = pull
+        self.value = None
+
+    def __call__(self) -> Any:
+        if self.pull is not None:
+            self.value = self.pull()
+            self.pull = None
+        return self.value
+
+
+class LoopInput(Thunk):
+    """ Lazy input of the loop node. Source is pulled on every call, so it's value may change between the iterations. """
+    __slots__ = ()
+
+    def __call__(self) -> Any:
+        return self.pull()
+
+
+def force(value: Any) -> Any:
+    """ Read the lazy input's value. Constants and unconnected inputs (not thunks) are returned as they are. """
+    if isinstance(value, Thunk):
+        return value()
+    return value
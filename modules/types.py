@@ -1,6 +1,12 @@
 from modules import style
 
 from dataclasses import dataclass
+from typing import Any
+import importlib.util
+import binascii
+import base64
+
+NUMPY_INSTALLED = importlib.util.find_spec("numpy") is not None  # Optional, Vector datatype and nodes require it.
 
 
 @dataclass
@@ -14,6 +20,10 @@ TEXT = DataType("Text", style.AnsiFGColor.YELLOW, str)
 NUMBER = DataType("Number", style.AnsiFGColor.MAGENTA, float)
 BOOLEAN = DataType("Boolean", style.LOGICAL_COLOR, bool)
 FLOW = DataType("Flow", style.FLOW_CONTROL_COLOR, None)
+VECTOR = DataType("Vector", (199, 146, 234), None) if NUMPY_INSTALLED else None  # Values are numpy arrays.
+
+VECTOR_TEXT_LIMIT = 16  # Longer vectors are saved as base64 of their float64 buffer.
+VECTOR_B64_PREFIX = "b64:"
 
 
 def string_to_boolean(text: str) -> bool | None:
@@ -24,4 +34,38 @@ def string_to_boolean(text: str) -> bool | None:
         return None
     
     return text in trueish
-    
\ No newline at end of file
+
+
+def is_vector(value: Any) -> bool:
+    """ Value of the Vector datatype (checked without importing the numpy). """
+    return type(value).__name__ == "ndarray" and type(value).__module__ == "numpy"
+
+
+def text_to_vector(text: str) -> "numpy.ndarray":
+    """ Parse vector from numbers separated by spaces or commas (or the base64 buffer). Raises ValueError. """
+    if not NUMPY_INSTALLED:
+        raise ValueError("Vector datatype requires the NumPy installed.")
+
+    import numpy
+
+    text = text.strip()
+    if text.startswith(VECTOR_B64_PREFIX):
+        try:
+            buffer = base64.b64decode(text.removeprefix(VECTOR_B64_PREFIX), validate=True)
+        except binascii.Error as error:
+            raise ValueError(f"Invalid vector buffer: {error}")
+
+        if len(buffer) % 8:
+            raise ValueError("Invalid vector buffer size.")
+        return numpy.frombuffer(buffer, dtype="<f8").astype(numpy.float64)
+
+    return numpy.array([float(value) for value in text.replace(",", " ").split()], dtype=numpy.float64)
+
+
+def vector_to_text(vector: "numpy.ndarray") -> str:
+    """ Convert vector into text accepted by the `text_to_vector()`, long vectors are base64 encoded. """
+    if len(vector) > VECTOR_TEXT_LIMIT:
+        buffer = vector.astype("<f8").tobytes()
+        return VECTOR_B64_PREFIX + base64.b64encode(buffer).decode()
+
+    return " ".join(str(int(value)) if value.is_integer() else repr(float(value)) for value in vector.tolist())
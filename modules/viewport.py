@@ -1,6 +1,7 @@
 from modules.status_bar import status_bar
 from modules.execution import interpreter
 from modules.execution import compiler
+from modules.execution import analysis
 from modules.side_bar import side_bar
 from modules.nodes.node import Node
 from modules import wire_builder
@@ -230,18 +231,19 @@ class ViewportComponent(ui.TextUIComponent):
         # Draw data wires.
         for node in self.scope.nodes:
             for output in node.outputs + [node.flow.output_src]:
-                if output is None or output.target is None:
+                if output is None:
                     continue
                 
-                rel_start = output.rel_pos
-                rel_end = output.target_rel_pos
+                for target in output.targets:
+                    rel_start = output.rel_pos
+                    rel_end = target.rel_pos
 
-                dimmed = not (node == self.scope.selection.node or output.target.node == self.scope.selection.node)
-                selected = self.scope.edit_node_mode and self.scope.selection.highlighted_source in (output, output.target)
-                charset = chars.DOUBLE_LINE if output.data_type == types.FLOW else chars.ROUNDED_LINE if not selected else chars.ROUNDED_DOTTED
+                    dimmed = not (node == self.scope.selection.node or target.node == self.scope.selection.node)
+                    selected = self.scope.edit_node_mode and self.scope.selection.highlighted_source in (output, target)
+                    charset = chars.DOUBLE_LINE if output.data_type == types.FLOW else chars.ROUNDED_LINE if not selected else chars.ROUNDED_DOTTED
 
-                wire_chars = self.draw_wire(rel_start, rel_end, charset, [node.rect, output.target.node.rect], output.data_type.color, dimmed, selected)
-                self.optimized_renderer.feed_buffer(wire_chars)
+                    wire_chars = self.draw_wire(rel_start, rel_end, charset, [node.rect, target.node.rect], output.data_type.color, dimmed, selected)
+                    self.optimized_renderer.feed_buffer(wire_chars)
 
         # Draw nodes.
         for node in self.scope.nodes:
@@ -290,21 +292,21 @@ class ViewportComponent(ui.TextUIComponent):
         return True
         
     def prerun_check(self) -> bool:
-        """ Check for missing nodes, undefined values before start. Returns if can start. """
+        """ Check for missing nodes, undefined values (of the nodes reachable from the Start) before start. Returns if can start. """
         if not std_nodes.START_FACTORY.instances[self.scope.id]:
             status_bar.error(f"Missing {style.node(std_nodes.START_FACTORY)} node!")
             return False
 
-        for node in self.scope.nodes:
-            for input_source in node.inputs:
-                if input_source.required and input_source.constant_value is None and input_source.source is None:
-                    self.scope.camera.set_pos(node.position)
-                    self.scope.selection.node = node
-                    self.render()
-                    
-                    status_bar.error(f"Undefined required value: {style.source(input_source)}")
-                    return False
-                
+        start_node = std_nodes.START_FACTORY.instances[self.scope.id][0]
+        input_source = analysis.undefined_required_input(analysis.reachable_nodes(start_node, self.scope.nodes))
+        if input_source is not None:
+            self.scope.camera.set_pos(input_source.node.position)
+            self.scope.selection.node = input_source.node
+            self.render()
+
+            status_bar.error(f"Undefined required value: {style.source(input_source)}")
+            return False
+
         return True
         
     def run_program(self, debug: bool = False) -> None:
@@ -315,6 +317,18 @@ class ViewportComponent(ui.TextUIComponent):
         start_node = std_nodes.START_FACTORY.instances[self.scope.id][0]
         interpreter.NodeRunner(start_node, self.scope.nodes, debug).run()
 
+    def profile_program(self) -> None:
+        """ Run program with the profiler and save the report next to the workspace file. """
+        if not self.prerun_check():
+            return
+
+        name = self.scope.name.removesuffix(".limb") or "limbo"
+        profile_path = f"{name}.speedscope.json"
+
+        terminal.clear_screen()
+        start_node = std_nodes.START_FACTORY.instances[self.scope.id][0]
+        interpreter.NodeRunner(start_node, self.scope.nodes, profile_path=profile_path).run()
+
     def compile_program(self) -> None:
         if not self.prerun_check():
             return
@@ -328,5 +342,5 @@ class ViewportComponent(ui.TextUIComponent):
             return
         
         start_node = std_nodes.START_FACTORY.instances[self.scope.id][0]
-        compiler.Compiler(name, start_node, self.scope.nodes)
+        compiler.Compiler(name, start_node, self.scope.nodes).run()
         ui.render_all()
@@ -210,7 +210,7 @@ class StateBasedNodeCache(TargetViewport):
             if isinstance(src, source.NodeInput):
                 if src.source is not None:
                     state += f"c{index}"
-            elif src.target is not None:
+            elif src.targets:
                 state += f"c{index}"
             
             if self.edit_node_mode and self.selection.highlighted_source == src:
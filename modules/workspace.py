@@ -217,7 +217,10 @@ class Workspace(vp_ext.ShiftableFocus, vp_ext.MovableNodes):
         status_bar.keys_help("Edit constant.", edit_help)
 
         self._is_saved = False
-        current_value = self.selection.highlighted_source.constant_value or ""
+        current_value = self.selection.highlighted_source.constant_value
+        if current_value is not None and self.selection.highlighted_source.data_type == types.VECTOR:
+            current_value = types.vector_to_text(current_value)
+        current_value = current_value or ""
         value = self.viewport.prompt(style.source(self.selection.highlighted_source), current_value)
         self.selection.highlighted_source.set_constant(value)
         
\ No newline at end of file